@@ -27,6 +27,13 @@ int draw_circle(int x, int y, int radius, int segments);      // Pixel coordinat
 int draw_filled_circle(int x, int y, int radius, int segments);
 int draw_line(int x1, int y1, int x2, int y2, int thickness); // Pixel coordinates
 
+// Batch drawing (one call per primitive list, rendering_primitives_int_with_fonts.c)
+// Arrays are packed int32 rows; colors are packed 0xRRGGBBAA, NULL keeps the current color
+int draw_filled_rectangles(const int* xywh, const unsigned int* colors, int count);
+int draw_filled_circles(const int* xyr, const unsigned int* colors, int count, int segments);
+int draw_lines(const int* xyxy, const unsigned int* colors, int count, int thickness);
+int draw_texts(const char* texts, const int* xy, const unsigned int* colors, int count, int size);  // count NUL-terminated strings back to back; 1 = no TTF font loaded, nothing drawn
+
 // Text rendering (integer-only interface)
 int load_default_font(void);
 int draw_text(const char* text, int x, int y, int size);      // Pixel coordinates
@@ -35,6 +42,8 @@ int get_text_height(const char* text, int size);              // Returns pixel h
 
 // Event handling (integer coordinates)
 int poll_events(void);
+int wait_events(int timeout_ms);                               // Blocks; returns events processed (rendering_primitives_int_with_fonts.c)
+int post_empty_event(void);                                    // Wakes wait_events() from any thread
 int get_mouse_x(void);                                         // Returns pixel X
 int get_mouse_y(void);                                         // Returns pixel Y  
 int get_mouse_button_state(int button);                       // 0=not pressed, 1=pressed
@@ -51,6 +60,17 @@ int get_input_length(void);                                 // Returns length of
 int set_window_size(int width, int height);
 int get_window_width(void);
 int get_window_height(void);
+int set_swap_interval(int interval);                          // 1 = vsync, 0 = off
+
+// System theme (rendering_primitives_int_with_fonts.c)
+// Values are detected once and cached; colors are packed 0xRRGGBBAA
+int get_system_dark_mode(void);                               // 1=dark, 0=light, -1=unknown
+int get_system_accent_color(void);                            // -1 = unknown
+int get_system_window_color(void);                            // Always a color
+int get_system_text_color(void);                              // Always a color (white is -1 as an int)
+int system_theme_poll(void);                                  // Stats the settings files; re-detects if changed, returns 1 on change
+int system_theme_refresh(void);                               // Re-detects unconditionally, returns 1 on change
+int system_theme_generation(void);                            // Bumped on every detected change
 
 #ifdef __cplusplus
 }
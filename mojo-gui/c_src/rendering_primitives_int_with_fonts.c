@@ -21,6 +21,7 @@
 #include <string.h>
 #include <math.h>
 #include <unistd.h>
+#include <sys/stat.h>
 
 #ifndef M_PI
 #define M_PI 3.14159265358979323846
@@ -34,6 +35,7 @@ static int g_mouse_x = 0, g_mouse_y = 0;
 static int g_mouse_buttons[8] = {0};
 static int g_keys[512] = {0};
 static int g_should_close = 0;
+static int g_event_count = 0;  // Input/window events seen by the callbacks since the last wait_events()
 
 // Character input support for text fields
 static char g_input_buffer[256] = {0};
@@ -53,6 +55,7 @@ static void error_callback(int error, const char* description) {
 
 static void mouse_button_callback(GLFWwindow* window, int button, int action, int mods) {
     (void)window; (void)mods;
+    g_event_count++;
     if (button >= 0 && button < 8) {
         g_mouse_buttons[button] = (action == GLFW_PRESS) ? 1 : 0;
     }
@@ -60,12 +63,14 @@ static void mouse_button_callback(GLFWwindow* window, int button, int action, in
 
 static void cursor_position_callback(GLFWwindow* window, double xpos, double ypos) {
     (void)window;
+    g_event_count++;
     g_mouse_x = (int)xpos;
     g_mouse_y = (int)ypos;
 }
 
 static void key_callback(GLFWwindow* window, int key, int scancode, int action, int mods) {
     (void)window; (void)scancode; (void)mods;
+    g_event_count++;
     if (key >= 0 && key < 512) {
         g_keys[key] = (action == GLFW_PRESS || action == GLFW_REPEAT) ? 1 : 0;
     }
@@ -82,6 +87,7 @@ static void key_callback(GLFWwindow* window, int key, int scancode, int action,
 
 static void character_callback(GLFWwindow* window, unsigned int codepoint) {
     (void)window;
+    g_event_count++;
     
     // Only accept printable ASCII characters for simplicity
     if (codepoint >= 32 && codepoint < 127 && g_input_buffer_pos < 255) {
@@ -94,11 +100,13 @@ static void character_callback(GLFWwindow* window, unsigned int codepoint) {
 
 static void window_close_callback(GLFWwindow* window) {
     (void)window;
+    g_event_count++;
     g_should_close = 1;
 }
 
 static void window_size_callback(GLFWwindow* window, int width, int height) {
     (void)window;
+    g_event_count++;
     g_window_width = width;
     g_window_height = height;
     glViewport(0, 0, width, height);
@@ -470,12 +478,125 @@ int draw_line(int x1, int y1, int x2, int y2, int thickness) {
     return 0;
 }
 
+// Batch drawing: one glBegin/glEnd per call instead of one FFI call per primitive
+static void set_packed_color(unsigned int rgba) {
+    glColor4ub((GLubyte)(rgba >> 24), (GLubyte)(rgba >> 16), (GLubyte)(rgba >> 8), (GLubyte)rgba);
+}
+
+int draw_filled_rectangles(const int* xywh, const unsigned int* colors, int count) {
+    if (!xywh || count < 0) return -1;
+    
+    glBegin(GL_QUADS);
+    for (int i = 0; i < count; i++) {
+        const int* r = xywh + i * 4;
+        if (colors) set_packed_color(colors[i]);
+        glVertex2i(r[0], r[1]);
+        glVertex2i(r[0] + r[2], r[1]);
+        glVertex2i(r[0] + r[2], r[1] + r[3]);
+        glVertex2i(r[0], r[1] + r[3]);
+    }
+    glEnd();
+    return 0;
+}
+
+int draw_filled_circles(const int* xyr, const unsigned int* colors, int count, int segments) {
+    if (!xyr || count < 0) return -1;
+    if (segments < 3) segments = 16;
+    if (segments > 360) segments = 360;
+    
+    // Unit circle computed once for the whole batch
+    float cos_table[361], sin_table[361];
+    for (int s = 0; s <= segments; s++) {
+        float angle = 2.0f * M_PI * s / segments;
+        cos_table[s] = cosf(angle);
+        sin_table[s] = sinf(angle);
+    }
+    
+    glBegin(GL_TRIANGLES);
+    for (int i = 0; i < count; i++) {
+        const int* c = xyr + i * 3;
+        if (colors) set_packed_color(colors[i]);
+        for (int s = 0; s < segments; s++) {
+            glVertex2i(c[0], c[1]);
+            glVertex2i(c[0] + (int)(c[2] * cos_table[s]), c[1] + (int)(c[2] * sin_table[s]));
+            glVertex2i(c[0] + (int)(c[2] * cos_table[s + 1]), c[1] + (int)(c[2] * sin_table[s + 1]));
+        }
+    }
+    glEnd();
+    return 0;
+}
+
+int draw_lines(const int* xyxy, const unsigned int* colors, int count, int thickness) {
+    if (!xyxy || count < 0) return -1;
+    
+    glLineWidth((float)thickness);
+    glBegin(GL_LINES);
+    for (int i = 0; i < count; i++) {
+        const int* l = xyxy + i * 4;
+        if (colors) set_packed_color(colors[i]);
+        glVertex2i(l[0], l[1]);
+        glVertex2i(l[2], l[3]);
+    }
+    glEnd();
+    glLineWidth(1.0f);
+    return 0;
+}
+
+int draw_texts(const char* texts, const int* xy, const unsigned int* colors, int count, int size) {
+    if (!texts || !xy || count < 0) return -1;
+    // Without our own TTF font the caller draws through its own text path
+    if (!g_font_loaded) return 1;
+    
+    const char* text = texts;
+    for (int i = 0; i < count; i++) {
+        if (colors) set_packed_color(colors[i]);
+        if (*text) draw_text(text, xy[i * 2], xy[i * 2 + 1], size);
+        text += strlen(text) + 1;
+    }
+    return 0;
+}
+
 int poll_events(void) {
     if (!g_window) return -1;
     glfwPollEvents();
     return 0;
 }
 
+// Block until events arrive or timeout_ms passes (negative waits indefinitely);
+// returns the number of input/window events processed, 0 on timeout or wake-up.
+// The window may belong to another library sharing this process's GLFW (the
+// widget library); our callbacks are not installed on it, so an early return
+// is reported as one event.
+int wait_events(int timeout_ms) {
+    GLFWwindow* window = g_window ? g_window : glfwGetCurrentContext();
+    if (!window) return -1;
+    g_event_count = 0;
+    double start = glfwGetTime();
+    if (timeout_ms < 0) {
+        glfwWaitEvents();
+    } else {
+        glfwWaitEventsTimeout(timeout_ms / 1000.0);
+    }
+    if (window != g_window) {
+        return (timeout_ms < 0 || glfwGetTime() - start < timeout_ms / 1000.0) ? 1 : 0;
+    }
+    return g_event_count;
+}
+
+// Wake a thread blocked in wait_events(); safe to call from any thread
+int post_empty_event(void) {
+    glfwPostEmptyEvent();  // Reports GLFW_NOT_INITIALIZED if no library has set GLFW up
+    return 0;
+}
+
+// 1 = vsync (the default after initialize_gl_context), 0 = swap immediately;
+// applies to the context current on the calling thread
+int set_swap_interval(int interval) {
+    if (!g_window && !glfwGetCurrentContext()) return -1;
+    glfwSwapInterval(interval);
+    return 0;
+}
+
 int get_mouse_x(void) {
     return g_mouse_x;
 }
@@ -550,12 +671,49 @@ int get_input_length(void) {
 }
 
 // === SYSTEM COLOR DETECTION FUNCTIONS ===
+//
+// Detection may spawn gsettings/defaults, so it runs once and the results
+// are cached. system_theme_poll() only stats the files desktop settings are
+// stored in and re-detects when one of them changed.
+
+#define THEME_WATCH_FILES 2
+
+static int g_theme_resolved = 0;
+static int g_theme_dark_mode = -1;
+static int g_theme_accent = -1;
+static int g_theme_generation = 0;
+static time_t g_theme_mtimes[THEME_WATCH_FILES];
+static ino_t g_theme_inodes[THEME_WATCH_FILES];
+
+/**
+ * Stat the GTK settings file and the dconf database gsettings writes to;
+ * missing files read as 0
+ */
+static void theme_file_stamps(time_t* mtimes, ino_t* inodes) {
+    static const char* relative[THEME_WATCH_FILES] = {
+        ".config/gtk-3.0/settings.ini",
+        ".config/dconf/user",
+    };
+    char* home = getenv("HOME");
+    for (int i = 0; i < THEME_WATCH_FILES; i++) {
+        struct stat info;
+        char path[512];
+        mtimes[i] = 0;
+        inodes[i] = 0;
+        if (!home) continue;
+        snprintf(path, sizeof(path), "%s/%s", home, relative[i]);
+        if (stat(path, &info) == 0) {
+            mtimes[i] = info.st_mtime;
+            inodes[i] = info.st_ino;  // dconf replaces the file on write
+        }
+    }
+}
 
 /**
- * Detect if system is using dark mode
+ * Detect if system is using dark mode (uncached)
  * Returns: 1 = dark mode, 0 = light mode, -1 = unknown
  */
-int get_system_dark_mode(void) {
+static int detect_system_dark_mode(void) {
 #ifdef __linux__
     // Check GNOME/GTK dark theme preference
     FILE* fp = popen("gsettings get org.gnome.desktop.interface gtk-theme 2>/dev/null", "r");
@@ -625,10 +783,10 @@ int get_system_dark_mode(void) {
 }
 
 /**
- * Get system accent color (returns packed RGBA as single int)
+ * Detect system accent color (uncached)
  * Returns: 0xRRGGBBAA format, or -1 if unknown
  */
-int get_system_accent_color(void) {
+static int detect_system_accent_color(void) {
 #ifdef __linux__
     // Try to get GNOME accent color
     FILE* fp = popen("gsettings get org.gnome.desktop.interface accent-color 2>/dev/null", "r");
@@ -686,9 +844,78 @@ int get_system_accent_color(void) {
 }
 
 /**
- * Get system background color for windows
+ * Re-detect every system theme value
+ * Returns: 1 if a value changed, 0 otherwise
+ */
+int system_theme_refresh(void) {
+    int dark_mode = detect_system_dark_mode();
+    int accent = detect_system_accent_color();
+    int changed = !g_theme_resolved || dark_mode != g_theme_dark_mode || accent != g_theme_accent;
+    
+    g_theme_dark_mode = dark_mode;
+    g_theme_accent = accent;
+    theme_file_stamps(g_theme_mtimes, g_theme_inodes);
+    g_theme_resolved = 1;
+    if (changed) {
+        g_theme_generation++;
+    }
+    return changed;
+}
+
+/**
+ * Check the settings files and re-detect only if one changed on disk;
+ * no subprocess unless it did
+ * Returns: 1 if a value changed, 0 otherwise
+ */
+int system_theme_poll(void) {
+    time_t mtimes[THEME_WATCH_FILES];
+    ino_t inodes[THEME_WATCH_FILES];
+    
+    if (!g_theme_resolved) {
+        system_theme_refresh();
+        return 0;
+    }
+    theme_file_stamps(mtimes, inodes);
+    if (memcmp(mtimes, g_theme_mtimes, sizeof(mtimes)) == 0 &&
+        memcmp(inodes, g_theme_inodes, sizeof(inodes)) == 0) {
+        return 0;
+    }
+    return system_theme_refresh();
+}
+
+/**
+ * Number of times the detected theme has changed (starts at 1 once resolved)
+ */
+int system_theme_generation(void) {
+    return g_theme_generation;
+}
+
+/**
+ * Detect if system is using dark mode (cached, see system_theme_poll())
+ * Returns: 1 = dark mode, 0 = light mode, -1 = unknown
+ */
+int get_system_dark_mode(void) {
+    if (!g_theme_resolved) {
+        system_theme_refresh();
+    }
+    return g_theme_dark_mode;
+}
+
+/**
+ * Get system accent color (cached, see system_theme_poll())
  * Returns: 0xRRGGBBAA format, or -1 if unknown
  */
+int get_system_accent_color(void) {
+    if (!g_theme_resolved) {
+        system_theme_refresh();
+    }
+    return g_theme_accent;
+}
+
+/**
+ * Get system background color for windows
+ * Returns: 0xRRGGBBAA format (a light fallback when the mode is unknown)
+ */
 int get_system_window_color(void) {
     int dark_mode = get_system_dark_mode();
     
@@ -718,7 +945,8 @@ int get_system_window_color(void) {
 
 /**
  * Get system text color
- * Returns: 0xRRGGBBAA format, or -1 if unknown
+ * Returns: 0xRRGGBBAA format (black when the mode is unknown); white
+ * reads as -1 through the signed return type
  */
 int get_system_text_color(void) {
     int dark_mode = get_system_dark_mode();
@@ -10,6 +10,19 @@ from .high_level_api import (
     Application, MojoGUI, Widget, Button, CheckBox, Slider, 
     ProgressBar, Label, Canvas, create_app, quick_demo
 )
+from .display_list import DisplayList
+from .bulk_drawing import pack_color
+from .string_pool import StringPool, get_string_pool
+from .text_metrics import TextMetrics, get_text_metrics
+from .frame_profiler import FrameProfiler
+from .widget_registry import WidgetRegistry, WidgetHandle
+from .widget_pool import WidgetPool, get_widget_pool
+from .change_notifier import ChangeNotifier
+from .progress_feed import ProgressFeed, ProgressTask
+from .state_snapshot import StateSnapshot
+from .styles import Style, StyleSheet, get_style_sheet, LIGHT_THEME, DARK_THEME
+from .system_theme import SystemTheme, get_system_theme
+from .checkbox_group import CheckBoxGroup
 from .menu_widgets import (
     MenuWidget, ContextMenuWidget, MenuBarWidget,
     MenuCreate, ContextMenuCreate, MenuBarCreate,
@@ -137,7 +150,14 @@ __all__ = [
     
     # High-level classes
     'Application', 'MojoGUI', 'Widget', 'Button', 'CheckBox', 
-    'Slider', 'ProgressBar', 'Label', 'Canvas',
+    'Slider', 'ProgressBar', 'Label', 'Canvas', 'DisplayList',
+    
+    # Drawing and string helpers
+    'pack_color', 'StringPool', 'get_string_pool', 'TextMetrics', 'get_text_metrics',
+    'FrameProfiler', 'WidgetRegistry', 'WidgetHandle', 'WidgetPool', 'get_widget_pool',
+    'ChangeNotifier', 'ProgressFeed', 'ProgressTask', 'StateSnapshot',
+    'Style', 'StyleSheet', 'get_style_sheet', 'LIGHT_THEME', 'DARK_THEME',
+    'SystemTheme', 'get_system_theme', 'CheckBoxGroup',
     
     # Application helpers
     'create_app', 'quick_demo',
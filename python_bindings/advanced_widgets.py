@@ -6,8 +6,10 @@ ListView, TabControl, Dialog, Editor, and other advanced controls
 
 try:
     from .mid_level_wrappers import get_wrappers
+    from .async_support import EventWaiters
 except ImportError:
     from mid_level_wrappers import get_wrappers
+    from async_support import EventWaiters
 
 class ListViewWidget:
     """ListView widget implementation"""
@@ -248,6 +250,7 @@ class DialogWidget:
         self.result = None
         self.on_button_click = None
         self.on_close = None
+        self._result_waiters = EventWaiters()
         
         # Create the dialog
         self.create()
@@ -291,9 +294,15 @@ class DialogWidget:
         self.result = result
         self.visible = False
         
+        if self._result_waiters:
+            self._result_waiters.notify(result)
         if self.on_close:
             self.on_close(self, result)
     
+    def wait_result(self):
+        """Awaitable resolved with the result when the dialog closes"""
+        return self._result_waiters.wait()
+    
     def handle_click(self, x, y):
         """Handle dialog click"""
         if not self.visible:
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+asyncio Support for MojoGUI
+Awaitable widget events for Application.run_async()
+
+Widgets keep an EventWaiters per awaitable event; wait() hands out an
+asyncio future on the running loop and notify() resolves every pending
+one. Futures are resolved thread-safely, so events raised on a render
+thread still wake coroutines on the event loop.
+"""
+
+import asyncio
+
+def _running_loop():
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+def _set_result(future, value):
+    if not future.done():
+        future.set_result(value)
+
+class EventWaiters:
+    """Futures waiting for the next occurrence of one widget event"""
+
+    __slots__ = ('_futures',)
+
+    def __init__(self):
+        self._futures = []
+
+    def __bool__(self):
+        return bool(self._futures)
+
+    def wait(self):
+        """Future resolved with the value of the next notify()"""
+        future = asyncio.get_running_loop().create_future()
+        self._futures.append(future)
+        return future
+
+    def notify(self, value):
+        """Resolve all pending futures with value"""
+        futures, self._futures = self._futures, []
+        current = _running_loop()
+        for future in futures:
+            if future.done():
+                continue
+            loop = future.get_loop()
+            if loop is current:
+                future.set_result(value)
+            else:
+                loop.call_soon_threadsafe(_set_result, future, value)
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Bulk Drawing Buffers for MojoGUI Canvas
+Packs primitive batches into the int32 / uint32 arrays the batch entry points take
+
+Canvas.draw_rects(), draw_circles(), draw_lines() and draw_texts() accept
+NumPy arrays, any buffer-protocol object (array.array, memoryview, bytes)
+or plain sequences of rows. Contiguous int32 input is handed to the C
+library without copying; NumPy is optional and only used when installed.
+"""
+
+import ctypes
+from array import array
+from itertools import chain
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Size the fallback text path scales against (TextDraw_impl draws at this size)
+DEFAULT_TEXT_SIZE = 16
+
+_INT_FORMATS = frozenset(['i', '=i', '<i', '@i'])
+_UINT_FORMATS = frozenset(['I', '=I', '<I', '@I'])
+
+def pack_color(r, g, b, a=255):
+    """Pack 0-255 RGBA components into a 0xRRGGBBAA integer"""
+    return ((int(r) & 0xFF) << 24) | ((int(g) & 0xFF) << 16) | ((int(b) & 0xFF) << 8) | (int(a) & 0xFF)
+
+def unpack_color(rgba):
+    """Split a packed 0xRRGGBBAA color into 0.0-1.0 floats for DrawSetColor_impl"""
+    return ((rgba >> 24) & 0xFF) / 255.0, ((rgba >> 16) & 0xFF) / 255.0, \
+           ((rgba >> 8) & 0xFF) / 255.0, (rgba & 0xFF) / 255.0
+
+class PackedArray:
+    """A contiguous int32/uint32 batch and the ctypes pointer to it
+
+    owner keeps the underlying buffer alive for as long as the pointer is used.
+    """
+
+    __slots__ = ('owner', 'pointer', 'count', 'columns')
+
+    def __init__(self, owner, pointer, count, columns):
+        self.owner = owner
+        self.pointer = pointer
+        self.count = count
+        self.columns = columns
+
+    def rows(self):
+        """Iterate the batch as tuples (used by the per-primitive fallback)"""
+        values = self.pointer[:self.count * self.columns]
+        if self.columns == 1:
+            return iter(values)
+        return zip(*[iter(values)] * self.columns)
+
+def _pack(data, columns, typecode, ctype, formats, dtype):
+    """Pack data as count rows of columns values of ctype"""
+    if np is not None and not isinstance(data, (memoryview, bytes, bytearray)):
+        # One conversion in C; a no-op for contiguous arrays of the right dtype
+        packed = np.ascontiguousarray(data, dtype=dtype)
+        if packed.size % columns:
+            raise ValueError(f"expected rows of {columns} values, got {packed.size} values")
+        pointer = packed.ctypes.data_as(ctypes.POINTER(ctype))
+        return PackedArray(packed, pointer, packed.size // columns, columns)
+
+    try:
+        view = memoryview(data)
+    except TypeError:
+        view = None
+
+    if view is not None and view.format in formats and view.c_contiguous:
+        view = view.cast('B').cast(typecode)
+        buffer_type = ctype * len(view)
+        packed = buffer_type.from_buffer_copy(view) if view.readonly else buffer_type.from_buffer(view)
+    else:
+        values = view.tolist() if view is not None else list(data)
+        if values and isinstance(values[0], (list, tuple)):
+            values = chain.from_iterable(values)
+        values = array(typecode, (int(v) for v in values))
+        packed = (ctype * len(values)).from_buffer(values)
+
+    if len(packed) % columns:
+        raise ValueError(f"expected rows of {columns} values, got {len(packed)} values")
+    pointer = ctypes.cast(packed, ctypes.POINTER(ctype))
+    return PackedArray(packed, pointer, len(packed) // columns, columns)
+
+def pack_ints(data, columns):
+    """Pack coordinate rows as int32"""
+    return _pack(data, columns, 'i', ctypes.c_int, _INT_FORMATS, 'int32')
+
+def pack_colors(colors, count):
+    """Pack per-primitive 0xRRGGBBAA colors as uint32; None keeps the current color"""
+    if colors is None:
+        return None
+    packed = _pack(colors, 1, 'I', ctypes.c_uint, _UINT_FORMATS, 'uint32')
+    if packed.count != count:
+        raise ValueError(f"expected {count} colors, got {packed.count}")
+    return packed
+
+def pack_texts(texts):
+    """Join strings into the back-to-back NUL-terminated block draw_texts() takes"""
+    encoded = [t.encode('utf-8') if isinstance(t, str) else bytes(t) for t in texts]
+    return b'\0'.join(encoded) + b'\0', len(encoded)
@@ -48,7 +48,9 @@ class ButtonWidget:
         return False
     
     def set_text(self, text):
-        """Set button text"""
+        """Set button text (no FFI call when the text is unchanged)"""
+        if self.widget_id >= 0 and text == self.text:
+            return True
         self.text = text
         if self.widget_id >= 0:
             return self.wrappers.button_set_text(self.widget_id, text) == 0
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Change Notifiers for MojoGUI Widgets
+Rate limiting for change handlers that are too expensive to run per event
+
+A ChangeNotifier sits between a widget and its on_change handler:
+
+  immediate  every change is delivered at once
+  throttle   at most one delivery per interval; the last value of a burst
+             is delivered when the interval runs out
+  debounce   delivered once the value has not changed for interval
+
+Throttled and debounced values wait with a deadline on the shared
+time.perf_counter() clock; Application polls notifiers with pending
+values every frame and wakes its loops in time for the earliest one.
+"""
+
+import time
+
+IMMEDIATE = 'immediate'
+THROTTLE = 'throttle'
+DEBOUNCE = 'debounce'
+MODES = (IMMEDIATE, THROTTLE, DEBOUNCE)
+
+# Seconds between deliveries (throttle) or of quiet before one (debounce)
+DEFAULT_INTERVAL = 0.1
+
+_NOTHING = object()
+
+class ChangeNotifier:
+    """Delivers values to emit(value) according to a rate-limiting mode"""
+
+    __slots__ = ('emit', 'mode', 'interval', 'deadline', '_pending', '_last')
+
+    def __init__(self, emit, mode=IMMEDIATE, interval=DEFAULT_INTERVAL):
+        self.emit = emit
+        self.deadline = None
+        self._pending = _NOTHING
+        self._last = float('-inf')
+        self.configure(mode, interval)
+
+    def configure(self, mode=IMMEDIATE, interval=DEFAULT_INTERVAL):
+        """Change the mode; a value still pending is delivered first"""
+        if mode not in MODES:
+            raise ValueError(f"Unknown change notification mode: {mode!r}")
+        self.flush()
+        self.mode = mode
+        self.interval = interval
+
+    @property
+    def pending(self):
+        return self._pending is not _NOTHING
+
+    def notify(self, value, now=None):
+        """Report a new value; returns the deadline when delivery was deferred"""
+        if self.mode == IMMEDIATE:
+            self.emit(value)
+            return None
+        if now is None:
+            now = time.perf_counter()
+        if self.mode == THROTTLE:
+            if now - self._last >= self.interval:
+                self.cancel()
+                self._last = now
+                self.emit(value)
+                return None
+            self.deadline = self._last + self.interval
+        else:
+            self.deadline = now + self.interval
+        self._pending = value
+        return self.deadline
+
+    def poll(self, now=None):
+        """Deliver the pending value if its deadline passed; returns the deadline still pending"""
+        if self._pending is _NOTHING:
+            return None
+        if now is None:
+            now = time.perf_counter()
+        if now < self.deadline:
+            return self.deadline
+        self._deliver(now)
+        return None
+
+    def flush(self):
+        """Deliver the pending value now"""
+        if self._pending is not _NOTHING:
+            self._deliver(time.perf_counter())
+
+    def cancel(self):
+        """Drop the pending value"""
+        self._pending = _NOTHING
+        self.deadline = None
+
+    def _deliver(self, now):
+        value, self._pending = self._pending, _NOTHING
+        self.deadline = None
+        if value is not _NOTHING:
+            self._last = now
+            self.emit(value)
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+CheckBox Groups for MojoGUI
+Lazily stamped model for large trees of checkboxes with tri-state parents
+
+A CheckBoxGroup holds the state of thousands of checkbox items without a
+native widget per item. Items form a tree: leaves carry the real state,
+and every item with children derives its state (unchecked, checked or
+indeterminate) from how many of its leaves are checked.
+
+Each item keeps a count of its checked leaves and the clock value at
+which that count was stored. Setting a group item does not visit its
+subtree: it records the value and a new stamp on the item, and any
+descendant whose count is older than the newest assignment above it
+takes its state from that assignment. set_all()/clear_all() are an
+assignment above every item. A change, to a leaf or to a whole subtree,
+restores the counts along its path to the root only, so it costs
+O(depth), and so does reading one item's state.
+
+Only the checkboxes actually on screen are native widgets: bind() maps
+a CheckBox to an item (rebind while scrolling) and sync() pushes the
+item states to the bound widgets whose state differs. Clicks on a bound
+checkbox toggle its item (a whole subtree for a parent). Inside an
+Application, changes are synced once per frame.
+"""
+
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Item states, as taken by CheckBoxSetState
+UNCHECKED = 0
+CHECKED = 1
+INDETERMINATE = 2
+
+class CheckBoxGroup:
+    """Tree of checkbox items with lazily applied subtree assignments"""
+
+    def __init__(self, count=0):
+        self._parent = array('i')
+        self._children = []         # None for leaves
+        self._roots = []            # top-level items
+        self._leaves = array('i')   # leaves in each subtree (1 for a leaf)
+        self._count = array('i')    # checked leaves in each subtree, as of _counted
+        self._counted = array('Q')
+        self._assigned = array('Q') # clock of the last set() on the item (0 = never)
+        self._value = array('B')    # value of that set()
+        self._clock = 0
+        self._all_stamp = 0         # clock and value of the last set_all()
+        self._all_value = 0
+        self._leaf_total = 0
+        self._checked = 0
+        self._bound = {}            # CheckBox -> item
+        self._app = None
+        self._pending = False
+        self.on_change = None
+        for _ in range(count):
+            self.add()
+
+    def __len__(self):
+        return len(self._parent)
+
+    # =================================================================
+    # STRUCTURE
+    # =================================================================
+
+    def add(self, parent=-1, checked=False):
+        """Append an item under parent (-1 = top level); returns its index
+
+        A leaf that gets its first child becomes a group item and its own
+        state is replaced by that of its children.
+        """
+        item = len(self._parent)
+        checked = int(bool(checked))
+        self._clock += 1
+        if parent >= 0:
+            path = self._path(parent)
+            counts = self._counts(path)
+            siblings = self._children[parent]
+            if siblings is None:
+                delta = checked - counts[-1]
+                siblings = self._children[parent] = []
+            else:
+                delta = checked
+                for node in path:
+                    self._leaves[node] += 1
+                self._leaf_total += 1
+            self._restamp(path, counts, delta)
+            siblings.append(item)
+        else:
+            delta = checked
+            self._leaf_total += 1
+            self._roots.append(item)
+        self._checked += delta
+        self._parent.append(parent)
+        self._children.append(None)
+        self._leaves.append(1)
+        self._count.append(checked)
+        self._counted.append(self._clock)
+        self._assigned.append(0)
+        self._value.append(0)
+        self._changed()
+        return item
+
+    def parent(self, item):
+        return self._parent[item]
+
+    def children(self, item):
+        return list(self._children[item] or ())
+
+    def is_leaf(self, item):
+        return self._children[item] is None
+
+    def _path(self, item):
+        """item and its ancestors, top level first"""
+        path = []
+        while item >= 0:
+            path.append(item)
+            item = self._parent[item]
+        path.reverse()
+        return path
+
+    # =================================================================
+    # STATE
+    # =================================================================
+
+    def _counts(self, path):
+        """Checked-leaf count of each item on a top-down path"""
+        stamp, value = self._all_stamp, self._all_value
+        counts = []
+        for node in path:
+            if stamp > self._counted[node]:
+                counts.append(self._leaves[node] if value else 0)
+            else:
+                counts.append(self._count[node])
+            if self._assigned[node] > stamp:
+                stamp, value = self._assigned[node], self._value[node]
+        return counts
+
+    def _count_of(self, item):
+        """Checked leaves under item: its stored count unless an assignment above is newer"""
+        stamp, value = self._all_stamp, self._all_value
+        node = self._parent[item]
+        while node >= 0:
+            if self._assigned[node] > stamp:
+                stamp, value = self._assigned[node], self._value[node]
+            node = self._parent[node]
+        if stamp > self._counted[item]:
+            return self._leaves[item] if value else 0
+        return self._count[item]
+
+    def _restamp(self, path, counts, delta):
+        """Store the path's counts, adjusted by delta, as of the current clock"""
+        clock = self._clock
+        for node, count in zip(path, counts):
+            self._count[node] = count + delta
+            self._counted[node] = clock
+
+    def state(self, item):
+        """UNCHECKED, CHECKED or INDETERMINATE"""
+        checked = self._count_of(item)
+        if checked == 0:
+            return UNCHECKED
+        return CHECKED if checked == self._leaves[item] else INDETERMINATE
+
+    def is_checked(self, item):
+        return self.state(item) == CHECKED
+
+    def set(self, item, checked):
+        """Check or uncheck an item; for a group item, its whole subtree
+
+        Returns False when nothing changed.
+        """
+        path = self._path(item)
+        counts = self._counts(path)
+        after = self._leaves[item] if checked else 0
+        if counts[-1] == after:
+            return False
+        self._clock += 1
+        self._assigned[item] = self._clock
+        self._value[item] = int(bool(checked))
+        delta = after - counts[-1]
+        self._restamp(path, counts, delta)
+        self._checked += delta
+        self._changed()
+        return True
+
+    def toggle(self, item):
+        """Check an unchecked or indeterminate item, uncheck a checked one"""
+        return self.set(item, self.state(item) != CHECKED)
+
+    def set_all(self, checked=True):
+        """Check (or uncheck) every item"""
+        self._clock += 1
+        self._all_stamp = self._clock
+        self._all_value = int(bool(checked))
+        self._checked = self._leaf_total if checked else 0
+        self._changed()
+
+    def clear_all(self):
+        """Uncheck every item"""
+        self.set_all(False)
+
+    # =================================================================
+    # QUERIES
+    # =================================================================
+
+    def count_checked(self):
+        """Number of checked leaves"""
+        return self._checked
+
+    def checked(self):
+        """Indices of the checked leaves, ascending
+
+        Only subtrees with at least one checked leaf are visited.
+        """
+        found = []
+        stack = [(root, self._all_stamp, self._all_value) for root in self._roots]
+        while stack:
+            node, stamp, value = stack.pop()
+            if stamp > self._counted[node]:
+                if not value:
+                    continue
+            elif not self._count[node]:
+                continue
+            children = self._children[node]
+            if children is None:
+                found.append(node)
+                continue
+            if self._assigned[node] > stamp:
+                stamp, value = self._assigned[node], self._value[node]
+            stack.extend((child, stamp, value) for child in children)
+        found.sort()
+        return found
+
+    def checked_mask(self):
+        """Bitset (int) of the checked leaves"""
+        packed = bytearray((len(self._parent) + 7) // 8)
+        for item in self.checked():
+            packed[item >> 3] |= 1 << (item & 7)
+        return int.from_bytes(packed, 'little')
+
+    def states(self, items=None):
+        """State of each item (of every item when items is None)"""
+        if items is None:
+            items = range(len(self._parent))
+        return [self.state(item) for item in items]
+
+    def as_array(self):
+        """One 0/1 per item, 1 for checked leaves: a NumPy bool array if available, else a bytearray"""
+        checked = self.checked()
+        if np is not None:
+            flags = np.zeros(len(self._parent), dtype=bool)
+            flags[checked] = True
+            return flags
+        flags = bytearray(len(self._parent))
+        for item in checked:
+            flags[item] = 1
+        return flags
+
+    # =================================================================
+    # BOUND WIDGETS
+    # =================================================================
+
+    def bind(self, item, checkbox):
+        """Show item in checkbox (a CheckBox on screen); rebinding moves it to another item
+
+        The group takes over the checkbox's change handler; use on_change
+        (called as on_change(group, item, state)) instead.
+        """
+        self._bound[checkbox] = item
+        checkbox.on_change = self._checkbox_changed
+        if checkbox.app is not None:
+            self._app = checkbox.app
+        self._push(checkbox, item)
+
+    def unbind(self, checkbox):
+        """Stop showing an item in checkbox; False if it was not bound"""
+        if self._bound.pop(checkbox, None) is None:
+            return False
+        if checkbox.on_change == self._checkbox_changed:
+            checkbox.on_change = None
+        return True
+
+    def _checkbox_changed(self, checkbox, checked):
+        item = self._bound.get(checkbox)
+        if item is None:
+            return
+        self.toggle(item)
+        self.sync()
+        if self.on_change:
+            self.on_change(self, item, self.state(item))
+
+    def _push(self, checkbox, item):
+        state = self.state(item)
+        current = INDETERMINATE if checkbox.indeterminate else int(bool(checkbox.checked))
+        if state != current:
+            checkbox.set_state(state)
+
+    def _changed(self):
+        """Sync bound checkboxes at the next frame of their Application"""
+        if self._bound and not self._pending and self._app is not None:
+            self._pending = True
+            self._app._schedule_sync(self)
+
+    def sync(self):
+        """Push item states to the bound checkboxes that show something else"""
+        self._pending = False
+        for checkbox, item in list(self._bound.items()):
+            if checkbox.widget_id >= 0:
+                self._push(checkbox, item)
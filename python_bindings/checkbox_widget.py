@@ -85,7 +85,9 @@ class CheckBoxWidget:
         return self.set_checked(not self.is_checked())
     
     def set_label(self, text):
-        """Set checkbox label text"""
+        """Set checkbox label text (no FFI call when the text is unchanged)"""
+        if self.widget_id >= 0 and text == self.label_text:
+            return True
         self.label_text = text
         if self.widget_id >= 0:
             if self.enhanced:
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Display Lists for MojoGUI Canvas
+Retained drawing commands recorded once and replayed every frame
+"""
+
+from array import array
+
+# Opcodes and the mid-level wrapper each one replays through
+OP_SET_COLOR = 0
+OP_SET_POSITION = 1
+OP_RECT = 2
+OP_ROUNDED_RECT = 3
+OP_CIRCLE = 4
+OP_LINE = 5
+OP_GRADIENT_RECT = 6
+
+# opcode: (wrapper method, argument count, integer argument positions)
+OPCODES = {
+    OP_SET_COLOR: ('draw_set_color', 4, ()),
+    OP_SET_POSITION: ('draw_set_pos', 2, ()),
+    OP_RECT: ('draw_rect', 2, ()),
+    OP_ROUNDED_RECT: ('draw_rounded_rect', 3, ()),
+    OP_CIRCLE: ('draw_circle', 2, (1,)),
+    OP_LINE: ('draw_line', 4, ()),
+    OP_GRADIENT_RECT: ('draw_gradient_rect', 10, ()),
+}
+
+class DisplayList:
+    """Packed buffer of recorded Canvas commands
+
+    Opcodes live in a byte array and their arguments in a flat float
+    array, so a list of thousands of primitives stays a few kilobytes.
+    key identifies the inputs the list was built from; a list is rebuilt
+    only when it is invalidated or the key changes.
+    """
+
+    def __init__(self, key=None):
+        self.key = key
+        self.ops = array('B')
+        self.args = array('f')
+        self.valid = True
+        self._plan = None
+        self._plan_wrappers = None
+
+    def __len__(self):
+        return len(self.ops)
+
+    def append(self, op, *args):
+        """Record one command"""
+        self.ops.append(op)
+        self.args.extend(args)
+        self._plan = None
+        return True
+
+    def clear(self):
+        """Remove all recorded commands"""
+        del self.ops[:]
+        del self.args[:]
+        self._plan = None
+
+    def invalidate(self):
+        """Mark the list stale so the next draw_cached() re-records it"""
+        self.valid = False
+
+    def is_valid_for(self, key):
+        """Check whether the list can be replayed for the given inputs"""
+        return self.valid and self.key == key
+
+    def _compile(self, wrappers):
+        """Resolve each command to its wrapper function once"""
+        plan = []
+        pos = 0
+        for op in self.ops:
+            method, count, int_args = OPCODES[op]
+            args = self.args[pos:pos + count].tolist()
+            for index in int_args:
+                args[index] = int(args[index])
+            plan.append((getattr(wrappers, method), tuple(args)))
+            pos += count
+        self._plan = plan
+        self._plan_wrappers = wrappers
+        return plan
+
+    def replay(self, wrappers):
+        """Issue every recorded command through the given wrappers"""
+        plan = self._plan
+        if plan is None or self._plan_wrappers is not wrappers:
+            plan = self._compile(wrappers)
+        for func, args in plan:
+            func(*args)
+        return True
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+FFI Instrumentation for MojoGUI Bindings
+Per-function call counters, latency percentiles and calls-per-frame
+
+Enabled with MojoGUIBindings(instrument=True) or MOJOGUI_INSTRUMENT=1.
+Each bound function is wrapped so that every call across the FFI boundary
+is counted and timed; a call to FrameBegin/FrameBegin_impl closes the
+current frame's per-function call counts.
+"""
+
+import json
+import time
+from collections import deque
+
+# Latency samples and per-frame counts kept per function
+DEFAULT_SAMPLE_SIZE = 2048
+DEFAULT_FRAME_HISTORY = 600
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted sequence"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+class FunctionStats:
+    """Counters for one bound function"""
+
+    __slots__ = ('name', 'count', 'total_time', 'max_time', 'samples',
+                 'frame_calls', 'frame_history')
+
+    def __init__(self, name, sample_size=DEFAULT_SAMPLE_SIZE, frame_history=DEFAULT_FRAME_HISTORY):
+        self.name = name
+        self.count = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.samples = deque(maxlen=sample_size)
+        self.frame_calls = 0
+        self.frame_history = deque(maxlen=frame_history)
+
+    def add(self, elapsed):
+        self.count += 1
+        self.frame_calls += 1
+        self.total_time += elapsed
+        self.samples.append(elapsed)
+        if elapsed > self.max_time:
+            self.max_time = elapsed
+
+    def close_frame(self):
+        self.frame_history.append(self.frame_calls)
+        self.frame_calls = 0
+
+    def summary(self):
+        """Plain-dict view of the counters (times in seconds)"""
+        ordered = sorted(self.samples)
+        frames = len(self.frame_history)
+        return {
+            'name': self.name,
+            'count': self.count,
+            'total_time': self.total_time,
+            'mean_time': self.total_time / self.count if self.count else 0.0,
+            'p50_time': percentile(ordered, 0.50),
+            'p95_time': percentile(ordered, 0.95),
+            'p99_time': percentile(ordered, 0.99),
+            'max_time': self.max_time,
+            'calls_per_frame': sum(self.frame_history) / frames if frames else float(self.frame_calls),
+            'max_calls_per_frame': max(self.frame_history) if frames else self.frame_calls,
+            'last_frame_calls': self.frame_history[-1] if frames else self.frame_calls,
+        }
+
+class InstrumentedFunction:
+    """Timing wrapper around a bound ctypes function"""
+
+    __slots__ = ('func', 'stats', 'profiler', 'starts_frame')
+
+    def __init__(self, func, stats, profiler, starts_frame=False):
+        self.func = func
+        self.stats = stats
+        self.profiler = profiler
+        self.starts_frame = starts_frame
+
+    def __call__(self, *args):
+        if self.starts_frame:
+            self.profiler.begin_frame()
+        start = time.perf_counter()
+        result = self.func(*args)
+        self.stats.add(time.perf_counter() - start)
+        return result
+
+    def __getattr__(self, name):
+        # argtypes, restype and friends come from the wrapped function
+        return getattr(self.func, name)
+
+class FFIProfiler:
+    """Collects FunctionStats for every instrumented function"""
+
+    def __init__(self, sample_size=DEFAULT_SAMPLE_SIZE, frame_history=DEFAULT_FRAME_HISTORY):
+        self.sample_size = sample_size
+        self.frame_history = frame_history
+        self.functions = {}
+        self.frames = 0
+
+    def wrap(self, name, func):
+        """Wrap a bound function so its calls are recorded"""
+        stats = self.functions.get(name)
+        if stats is None:
+            stats = FunctionStats(name, self.sample_size, self.frame_history)
+            self.functions[name] = stats
+        return InstrumentedFunction(func, stats, self, name.startswith('FrameBegin'))
+
+    def begin_frame(self):
+        """Close the per-frame call counts of the previous frame"""
+        if self.frames:
+            for stats in self.functions.values():
+                stats.close_frame()
+        else:
+            for stats in self.functions.values():
+                stats.frame_calls = 0
+        self.frames += 1
+
+    def get_stats(self, name=None):
+        """Summary for one function, or for every function that was called"""
+        if name is not None:
+            stats = self.functions.get(name)
+            return stats.summary() if stats is not None else None
+        return {n: s.summary() for n, s in self.functions.items() if s.count}
+
+    def top(self, n=10, key='total_time'):
+        """The n called functions with the highest value of key"""
+        summaries = self.get_stats().values()
+        return sorted(summaries, key=lambda s: s[key], reverse=True)[:n]
+
+    def reset(self):
+        """Zero all counters"""
+        for name in list(self.functions):
+            self.functions[name].__init__(name, self.sample_size, self.frame_history)
+        self.frames = 0
+
+    def to_dict(self):
+        return {'frames': self.frames, 'functions': self.get_stats()}
+
+    def dump_json(self, path):
+        """Write all summaries to a JSON file"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2, sort_keys=True)
+        return path
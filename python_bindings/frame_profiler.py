@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Frame Profiler for MojoGUI
+Records where each frame's time goes, per phase and per widget
+
+Application.enable_profiler() installs a FrameProfiler; while installed
+the application times event polling, widget update() and draw(), user
+callbacks (on_click, on_change, ...), the end_frame() buffer swap and the
+whole frame. Phase series hold one sample per frame (per callback for
+'callback'); every widget also gets its own draw/update/callback series
+so the slowest ones can be singled out. Each series is a fixed-size ring
+buffer of the most recent samples, so memory stays constant however long
+the app runs and the percentiles always describe recent behaviour.
+"""
+
+from array import array
+
+try:
+    from .bulk_drawing import pack_color
+except ImportError:
+    from bulk_drawing import pack_color
+
+# Samples kept per series; ten seconds at 60 fps
+DEFAULT_CAPACITY = 600
+
+# Frame phases reported by report(), in display order
+PHASES = ('frame', 'poll_events', 'update', 'draw', 'callback', 'end_frame')
+
+# Frame budget the overlay graph is scaled against (60 fps)
+FRAME_BUDGET = 1.0 / 60
+
+class RingBuffer:
+    """The last capacity samples of one timing series, in seconds"""
+
+    __slots__ = ('_data', '_next', 'count', 'total')
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self._data = array('d', bytes(8 * capacity))
+        self._next = 0
+        self.count = 0      # samples currently held
+        self.total = 0      # samples ever added
+
+    def __len__(self):
+        return self.count
+
+    def add(self, seconds):
+        data = self._data
+        data[self._next] = seconds
+        self._next = (self._next + 1) % len(data)
+        if self.count < len(data):
+            self.count += 1
+        self.total += 1
+
+    def values(self):
+        """Held samples, oldest first"""
+        data, count = self._data, self.count
+        if count < len(data):
+            return data[:count].tolist()
+        return data[self._next:].tolist() + data[:self._next].tolist()
+
+    def percentiles(self, *ranks):
+        """Nearest-rank percentiles of the held samples (0.0 when empty)"""
+        values = sorted(self._data[:self.count])
+        if not values:
+            return [0.0] * len(ranks)
+        last = len(values) - 1
+        return [values[min(last, int(rank / 100.0 * len(values)))] for rank in ranks]
+
+    def summary(self):
+        """count/mean/p50/p95/p99/max in milliseconds"""
+        if not self.count:
+            return {'count': 0, 'mean': 0.0, 'p50': 0.0, 'p95': 0.0, 'p99': 0.0, 'max': 0.0}
+        samples = self._data[:self.count]
+        p50, p95, p99 = self.percentiles(50, 95, 99)
+        return {
+            'count': self.count,
+            'mean': sum(samples) / self.count * 1000.0,
+            'p50': p50 * 1000.0,
+            'p95': p95 * 1000.0,
+            'p99': p99 * 1000.0,
+            'max': max(samples) * 1000.0,
+        }
+
+def widget_label(widget):
+    """Short human-readable name for a widget in reports"""
+    text = getattr(widget, 'text', None)
+    name = type(widget).__name__
+    if isinstance(text, str) and text:
+        name += f" '{text[:16]}'"
+    x, y = getattr(widget, 'x', None), getattr(widget, 'y', None)
+    if x is not None and y is not None:
+        name += f" @{x},{y}"
+    return name
+
+class FrameProfiler:
+    """Ring-buffered frame timings by phase and by widget"""
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self.phases = {phase: RingBuffer(capacity) for phase in PHASES}
+        self.widgets = {}   # widget -> {phase: RingBuffer}
+        self.overlay = False
+
+    def record(self, phase, seconds):
+        """Add one sample to a frame phase"""
+        series = self.phases.get(phase)
+        if series is None:
+            series = self.phases[phase] = RingBuffer(self.capacity)
+        series.add(seconds)
+
+    def record_widget(self, widget, phase, seconds):
+        """Add one sample to a widget's own series for phase"""
+        phases = self.widgets.get(widget)
+        if phases is None:
+            phases = self.widgets[widget] = {}
+        series = phases.get(phase)
+        if series is None:
+            series = phases[phase] = RingBuffer(self.capacity)
+        series.add(seconds)
+
+    def forget(self, widget):
+        """Drop a removed widget's samples"""
+        self.widgets.pop(widget, None)
+
+    def reset(self):
+        """Discard every sample"""
+        self.phases = {phase: RingBuffer(self.capacity) for phase in PHASES}
+        self.widgets.clear()
+
+    def report(self):
+        """{phase: count/mean/p50/p95/p99/max in ms} for every recorded phase"""
+        return {phase: series.summary() for phase, series in self.phases.items()}
+
+    def slowest_widgets(self, count=5, phase='draw', rank='p95'):
+        """The count widgets with the highest rank percentile in phase
+
+        Returns (label, summary) pairs, slowest first.
+        """
+        ranked = []
+        for widget, phases in self.widgets.items():
+            series = phases.get(phase)
+            if series is not None and series.count:
+                summary = series.summary()
+                ranked.append((summary[rank], widget_label(widget), summary))
+        ranked.sort(key=lambda entry: entry[0], reverse=True)
+        return [(label, summary) for _, label, summary in ranked[:count]]
+
+    def format_report(self, slowest=5):
+        """Plain-text report for logs and the console"""
+        lines = [f"{'phase':<12} {'count':>6} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}  (ms)"]
+        for phase, summary in self.report().items():
+            if summary['count']:
+                lines.append(f"{phase:<12} {summary['count']:>6} {summary['p50']:>8.3f} "
+                             f"{summary['p95']:>8.3f} {summary['p99']:>8.3f} {summary['max']:>8.3f}")
+        widgets = self.slowest_widgets(slowest)
+        if widgets:
+            lines.append("slowest widgets (draw p95):")
+            for label, summary in widgets:
+                lines.append(f"  {summary['p95']:8.3f} ms  {label}")
+        return "\n".join(lines)
+
+    def draw_overlay(self, canvas, x=8, y=8, width=240, graph_height=40, text_size=12):
+        """Draw frame-time graph and phase percentiles with canvas
+
+        Bars show the most recent frames scaled to FRAME_BUDGET; frames over
+        budget are drawn red. Everything is issued as two bulk calls.
+        """
+        frames = self.phases['frame'].values()[-width // 2:]
+        lines = []
+        for phase in PHASES:
+            summary = self.phases[phase].summary()
+            if summary['count']:
+                lines.append(f"{phase} p50 {summary['p50']:.2f} p95 {summary['p95']:.2f} "
+                             f"p99 {summary['p99']:.2f} ms")
+        for label, summary in self.slowest_widgets(3):
+            lines.append(f"{summary['p95']:.2f} ms {label}")
+
+        line_height = text_size + 4
+        height = graph_height + 8 + line_height * len(lines)
+        rects = [(x, y, width, height)]
+        colors = [pack_color(0, 0, 0, 180)]
+        ok_color, slow_color = pack_color(80, 200, 120), pack_color(230, 70, 60)
+        base = y + 4 + graph_height
+        for i, seconds in enumerate(frames):
+            bar = max(1, min(graph_height, int(seconds / (2 * FRAME_BUDGET) * graph_height)))
+            rects.append((x + 4 + 2 * i, base - bar, 1, bar))
+            colors.append(slow_color if seconds > FRAME_BUDGET else ok_color)
+        ok = canvas.draw_rects(rects, colors)
+
+        if lines:
+            positions = [(x + 4, base + 4 + i * line_height) for i in range(len(lines))]
+            ok = canvas.draw_texts(positions, lines, pack_color(255, 255, 255), text_size) and ok
+        return ok
@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Headless MojoGUI Backend
+Pure-Python stand-in for the MojoGUI C library that records calls instead of drawing
+
+Selected with get_bindings(backend='headless') or MOJOGUI_BACKEND=headless.
+Every name in the binding signature table is available; calls are counted,
+timed and logged, and a small widget model keeps create/set/get/click
+semantics plausible so the upper layers behave as they do on a display.
+"""
+
+import ctypes
+import threading
+import time
+from collections import Counter, deque
+
+# Default number of calls kept in the call log
+DEFAULT_LOG_SIZE = 10000
+
+# Monospace advance, as a fraction of the text size, reported for every glyph
+GLYPH_ADVANCE = 0.6
+
+# Batch entry points and the position of their count argument
+_BATCH_COUNT_ARG = {
+    'draw_filled_rectangles': 2,
+    'draw_filled_circles': 2,
+    'draw_lines': 2,
+    'draw_texts': 3,
+}
+
+# Python types ctypes accepts for each argument type
+_ACCEPTED_TYPES = {
+    ctypes.c_int: (int,),
+    ctypes.c_uint: (int,),
+    ctypes.c_float: (int, float),
+    ctypes.c_double: (int, float),
+    ctypes.c_char_p: (bytes, type(None)),
+}
+
+# Integer return types, wrapped to their width as ctypes would
+_INTEGER_RESTYPES = (ctypes.c_int, ctypes.c_uint, ctypes.c_long, ctypes.c_ulong,
+                     ctypes.c_longlong, ctypes.c_ulonglong)
+
+class HeadlessFunction:
+    """Callable standing in for one C function"""
+
+    def __init__(self, library, name, impl):
+        self.library = library
+        self.name = name
+        self.impl = impl
+        self.argtypes = None
+        self.restype = ctypes.c_int
+
+    def _check_args(self, args):
+        """Reject arguments ctypes would reject, so headless runs catch the same bugs"""
+        if len(args) != len(self.argtypes):
+            raise TypeError(f"{self.name}() takes {len(self.argtypes)} arguments ({len(args)} given)")
+        for index, (value, argtype) in enumerate(zip(args, self.argtypes)):
+            accepted = _ACCEPTED_TYPES.get(argtype)
+            if accepted is not None and not isinstance(value, accepted):
+                raise ctypes.ArgumentError(
+                    f"argument {index + 1}: {type(value).__name__}: wrong type")
+
+    def __call__(self, *args):
+        if self.argtypes is not None:
+            self._check_args(args)
+        start = time.perf_counter()
+        result = self.impl(self.name, args)
+        elapsed = time.perf_counter() - start
+        self.library._record(self.name, args, start, elapsed)
+        if self.restype is ctypes.c_float or self.restype is ctypes.c_double:
+            return float(result or 0)
+        if self.restype in _INTEGER_RESTYPES:
+            return self.restype(result or 0).value
+        return result if result is not None else 0
+
+class HeadlessLibrary:
+    """Recording replacement for ctypes.CDLL("libmojoguiglfw.so")
+
+    Attribute access mirrors a CDLL: known symbols resolve to callables and
+    unknown names raise AttributeError, so hasattr() probing works unchanged.
+    """
+
+    def __init__(self, symbols, log_size=DEFAULT_LOG_SIZE):
+        self._symbols = frozenset(symbols)
+        self._functions = {}
+        self._impls = {}
+        self.call_counts = Counter()
+        self.primitive_counts = Counter()
+        self.call_log = deque(maxlen=log_size)
+        self.frame_times = []
+        self._frame_start = None
+        self._next_ids = Counter()
+        self.widgets = {}
+        self.strings = {}
+        self.font_scales = {}   # font_id -> glyph advance multiplier, 1.0 by default
+        self.system_theme = {'dark_mode': 0, 'accent_color': 0x0078D4FF,
+                             'window_color': 0xF6F6F6FF, 'text_color': 0x000000FF}
+        self._theme_changed = False
+        self._theme_generation = 1
+        self.pending_events = 0
+        self.swap_interval = 1
+        self._wake = threading.Event()
+        self._register_impls()
+
+    def __getattr__(self, name):
+        if name.startswith('_') or name not in self._symbols:
+            raise AttributeError(name)
+        func = self._functions.get(name)
+        if func is None:
+            func = HeadlessFunction(self, name, self._impls.get(name, self._generic))
+            self._functions[name] = func
+        return func
+
+    # =================================================================
+    # RECORDING
+    # =================================================================
+
+    def _record(self, name, args, start, elapsed):
+        """Count and log one call"""
+        self.call_counts[name] += 1
+        self.call_log.append((name, args, start, elapsed))
+
+    def reset(self):
+        """Clear counters, the call log and frame timings"""
+        self.call_counts.clear()
+        self.primitive_counts.clear()
+        self.call_log.clear()
+        self.frame_times = []
+        self._frame_start = None
+
+    def calls(self, name=None):
+        """Logged calls, optionally only those of one function"""
+        if name is None:
+            return list(self.call_log)
+        return [entry for entry in self.call_log if entry[0] == name]
+
+    def stats(self):
+        """Summary of recorded activity"""
+        frames = len(self.frame_times)
+        return {
+            'total_calls': sum(self.call_counts.values()),
+            'frames': frames,
+            'avg_frame_time': sum(self.frame_times) / frames if frames else 0.0,
+            'max_frame_time': max(self.frame_times) if frames else 0.0,
+            'top_functions': self.call_counts.most_common(10),
+        }
+
+    # =================================================================
+    # WIDGET MODEL
+    # =================================================================
+
+    def _register_impls(self):
+        """Bind the functions that need more than the generic behaviour"""
+        for name in self._symbols:
+            if name.startswith('FrameBegin'):
+                self._impls[name] = self._frame_begin
+            elif name.startswith('FrameEnd'):
+                self._impls[name] = self._frame_end
+            elif name.endswith('Create'):
+                self._impls[name] = self._create
+            elif name.endswith('Destroy'):
+                self._impls[name] = self._destroy
+            elif name.endswith('Toggle'):
+                self._impls[name] = self._toggle
+            elif name.endswith('HandleClick') or name.endswith('HandleDrag'):
+                self._impls[name] = self._handle_pointer
+            elif name.endswith('SetPosition') or name.endswith('SetDimensions'):
+                self._impls[name] = self._set_bounds
+        for name in ('StringSet_impl', 'StringSet'):
+            self._impls[name] = self._string_set
+        for name in _BATCH_COUNT_ARG:
+            if name in self._symbols:
+                self._impls[name] = self._draw_batch
+        self._impls['ButtonUpdateAll'] = self._button_update_all
+        for key in self.system_theme:
+            self._impls['get_system_' + key] = self._system_theme_value
+        self._impls['system_theme_poll'] = self._system_theme_poll
+        self._impls['system_theme_refresh'] = self._system_theme_poll
+        self._impls['system_theme_generation'] = lambda name, args: self._theme_generation
+        self._impls['wait_events'] = self._wait_events
+        self._impls['post_empty_event'] = self._post_empty_event
+        self._impls['set_swap_interval'] = self._set_swap_interval
+        self._impls['TextGetWidth_impl'] = self._text_width
+        self._impls['AllocTempString'] = self._alloc_string
+        self._impls['StrClear'] = self._string_clear
+
+    @staticmethod
+    def _kind(name):
+        """Widget kind a function name belongs to, e.g. 'Slider' for SliderSetValue"""
+        positions = [name.find(marker, 1) for marker in
+                     ('Create', 'Destroy', 'Set', 'Get', 'Is', 'Handle', 'Toggle', 'Update')]
+        positions = [index for index in positions if index > 0]
+        return name[:min(positions)] if positions else name
+
+    def _generic(self, name, args):
+        """Store XSetProp(id, ...) values and answer XGetProp(id) / XIsProp(id)"""
+        kind = self._kind(name)
+        rest = name[len(kind):]
+        if rest.startswith('Set') and args:
+            state = self.widgets.get((kind, args[0]))
+            if state is not None:
+                state[rest[3:]] = args[1] if len(args) == 2 else args[1:]
+            return 0
+        for prefix in ('Get', 'Is'):
+            if rest.startswith(prefix) and len(args) == 1:
+                state = self.widgets.get((kind, args[0]), {})
+                prop = rest[len(prefix):]
+                default = 1 if prop in ('Enabled', 'Visible') else 0
+                return state.get(prop, default)
+        return 0
+
+    def _create(self, name, args):
+        """Allocate a widget id and remember its bounds"""
+        kind = self._kind(name)
+        widget_id = self._next_ids[kind]
+        self._next_ids[kind] += 1
+        state = {'Enabled': 1, 'Visible': 1}
+        if len(args) >= 4:
+            state['bounds'] = tuple(args[:4])
+        if kind == 'Slider':
+            state.update(Range=(0, 100), Value=0)
+        self.widgets[(kind, widget_id)] = state
+        return widget_id
+
+    def _destroy(self, name, args):
+        return 0 if self.widgets.pop((self._kind(name), args[0]), None) is not None else -1
+
+    def _toggle(self, name, args):
+        state = self.widgets.get((self._kind(name), args[0]))
+        if state is None:
+            return -1
+        state['State'] = 0 if state.get('State') else 1
+        return 0
+
+    def _set_bounds(self, name, args):
+        """Move or resize the bounds clicks are hit-tested against"""
+        state = self.widgets.get((self._kind(name), args[0]))
+        if state is None:
+            return -1
+        x, y, width, height = state.get('bounds', (0, 0, 0, 0))
+        if name.endswith('SetPosition'):
+            state['bounds'] = (args[1], args[2], width, height)
+        else:
+            state['bounds'] = (x, y, args[1], args[2])
+        return 0
+
+    def _handle_pointer(self, name, args):
+        """Hit-test clicks and drags against the bounds given at creation"""
+        kind = self._kind(name)
+        state = self.widgets.get((kind, args[0]))
+        if state is None or 'bounds' not in state:
+            return 0
+        x, y = args[1], args[2]
+        bx, by, bw, bh = state['bounds']
+        dragging = name.endswith('HandleDrag')
+        if not dragging and not (bx <= x <= bx + bw and by <= y <= by + bh):
+            return 0
+        if kind.endswith('CheckBox'):
+            state['State'] = 0 if state.get('State') else 1
+        elif kind == 'Slider':
+            low, high = state.get('Range', (0, 100))
+            fraction = min(1.0, max(0.0, (x - bx) / bw)) if bw else 0.0
+            state['Value'] = int(low + fraction * (high - low))
+        return 1
+
+    def _button_update_all(self, name, args):
+        """Recompute the hover flag of every button from the pointer position"""
+        x, y = args
+        for (kind, _), state in self.widgets.items():
+            if kind == 'Button' and 'bounds' in state:
+                bx, by, bw, bh = state['bounds']
+                state['Hovered'] = int(bx <= x <= bx + bw and by <= y <= by + bh)
+        return 0
+
+    def set_system_theme(self, **values):
+        """Simulate the desktop theme changing, e.g. set_system_theme(dark_mode=1)"""
+        self.system_theme.update(values)
+        self._theme_changed = True
+
+    def _system_theme_value(self, name, args):
+        return self.system_theme[name[len('get_system_'):]]
+
+    def _system_theme_poll(self, name, args):
+        changed, self._theme_changed = self._theme_changed, False
+        if changed:
+            self._theme_generation += 1
+        return int(changed)
+
+    def _frame_begin(self, name, args):
+        self._frame_start = time.perf_counter()
+        return 0
+
+    def _frame_end(self, name, args):
+        if self._frame_start is not None:
+            self.frame_times.append(time.perf_counter() - self._frame_start)
+            self._frame_start = None
+        return 0
+
+    def _draw_batch(self, name, args):
+        """Count the primitives of a batch call, touching its last row like the C side would"""
+        count = args[_BATCH_COUNT_ARG[name]]
+        if count < 0 or args[0] is None:
+            return -1
+        if count and name != 'draw_texts':
+            args[0][count - 1]
+        self.primitive_counts[name] += count
+        return 0
+
+    def post_input(self, count=1):
+        """Simulate input events arriving, waking a blocked wait_events()"""
+        self.pending_events += count
+        self._wake.set()
+
+    def _wait_events(self, name, args):
+        """Block like glfwWaitEventsTimeout() until input, a wake-up or the timeout"""
+        timeout_ms = args[0]
+        if not self.pending_events:
+            self._wake.wait(None if timeout_ms < 0 else timeout_ms / 1000.0)
+        self._wake.clear()
+        events, self.pending_events = self.pending_events, 0
+        return events
+
+    def _post_empty_event(self, name, args):
+        self._wake.set()
+        return 0
+
+    def _set_swap_interval(self, name, args):
+        self.swap_interval = args[0]
+        return 0
+
+    def _text_width(self, name, args):
+        """Monospace width of a stored string, scaled per font by font_scales"""
+        string_id, font_id, size = args
+        text = self.strings.get(string_id)
+        if text is None:
+            return 0
+        return int(len(text) * size * GLYPH_ADVANCE * self.font_scales.get(font_id, 1.0) + 0.5)
+
+    def _alloc_string(self, name, args):
+        string_id = self._next_ids['String']
+        self._next_ids['String'] += 1
+        self.strings[string_id] = b''
+        return string_id
+
+    def _string_set(self, name, args):
+        self.strings[args[0]] = args[1] or b''
+        return 0
+
+    def _string_clear(self, name, args):
+        self.strings[args[0]] = b''
+        return 0
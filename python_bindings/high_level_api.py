@@ -4,10 +4,71 @@ High-Level MojoGUI API
 Clean object-oriented interface for MojoGUI widgets
 """
 
+import asyncio
+import heapq
+import itertools
+import math
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+
 try:
     from .mid_level_wrappers import get_wrappers
+    from .display_list import (
+        DisplayList, OP_SET_COLOR, OP_SET_POSITION, OP_RECT, OP_ROUNDED_RECT,
+        OP_CIRCLE, OP_LINE, OP_GRADIENT_RECT
+    )
+    from .render_thread import RenderThread
+    from .bulk_drawing import DEFAULT_TEXT_SIZE, pack_ints, pack_colors, pack_texts, unpack_color
+    from .string_pool import get_string_pool
+    from .text_metrics import get_text_metrics
+    from .spatial_index import SpatialIndex
+    from .async_support import EventWaiters
+    from .frame_profiler import DEFAULT_CAPACITY, FrameProfiler
+    from .widget_registry import WidgetRegistry
+    from .widget_pool import get_widget_pool
+    from .property_batch import VOLATILE_PROPS, batch_scope
+    from .change_notifier import IMMEDIATE, DEFAULT_INTERVAL, ChangeNotifier
+    from .progress_feed import ProgressFeed
+    from .state_snapshot import TRACKED_KINDS, HOVERED, PRESSED, STATE, VALUE, StateSnapshot
+    from .styles import LIGHT_THEME, DARK_THEME, get_style_sheet, sent_colors
+    from .system_theme import DEFAULT_POLL_INTERVAL, get_system_theme
 except ImportError:
     from mid_level_wrappers import get_wrappers
+    from display_list import (
+        DisplayList, OP_SET_COLOR, OP_SET_POSITION, OP_RECT, OP_ROUNDED_RECT,
+        OP_CIRCLE, OP_LINE, OP_GRADIENT_RECT
+    )
+    from render_thread import RenderThread
+    from bulk_drawing import DEFAULT_TEXT_SIZE, pack_ints, pack_colors, pack_texts, unpack_color
+    from string_pool import get_string_pool
+    from text_metrics import get_text_metrics
+    from spatial_index import SpatialIndex
+    from async_support import EventWaiters
+    from frame_profiler import DEFAULT_CAPACITY, FrameProfiler
+    from widget_registry import WidgetRegistry
+    from widget_pool import get_widget_pool
+    from property_batch import VOLATILE_PROPS, batch_scope
+    from change_notifier import IMMEDIATE, DEFAULT_INTERVAL, ChangeNotifier
+    from progress_feed import ProgressFeed
+    from state_snapshot import TRACKED_KINDS, HOVERED, PRESSED, STATE, VALUE, StateSnapshot
+    from styles import LIGHT_THEME, DARK_THEME, get_style_sheet, sent_colors
+    from system_theme import DEFAULT_POLL_INTERVAL, get_system_theme
+
+# Event capability: the widget method that provides it
+CAPABILITIES = {
+    'click': 'handle_click',
+    'drag': 'handle_drag',
+    'release': 'handle_release',
+    'hover': 'handle_hover',
+    'key': 'handle_key',
+    'update': 'update',
+}
+
+# Longest sleep per loop iteration when the library cannot block on events
+FALLBACK_WAIT = 0.05
 
 class MojoGUI:
     """Main MojoGUI application class"""
@@ -43,6 +104,31 @@ class MojoGUI:
         """Poll for events"""
         return self.wrappers.event_poll() == 0
     
+    def wait_events(self, timeout=None):
+        """Block until events arrive or timeout seconds pass (None = no limit)
+        
+        Returns the number of input/window events processed. Without a
+        working wait_events() in the library this sleeps (at most
+        FALLBACK_WAIT) and polls; a poll cannot count what it delivered,
+        so it reports 0 like a wait that timed out.
+        """
+        timeout_ms = -1 if timeout is None else max(0, math.ceil(timeout * 1000))
+        if self.wrappers.is_function_available('wait_events'):
+            events = self.wrappers.wait_events(timeout_ms)
+            if events >= 0:
+                return events
+        time.sleep(FALLBACK_WAIT if timeout is None else min(timeout, FALLBACK_WAIT))
+        self.poll_events()
+        return 0
+    
+    def wake(self):
+        """Wake a wait_events() blocked in another thread"""
+        return self.wrappers.post_empty_event() == 0
+    
+    def set_vsync(self, enabled):
+        """Turn vsync on or off"""
+        return self.wrappers.set_swap_interval(1 if enabled else 0) == 0
+    
     def set_draw_color(self, r, g, b, a=1.0):
         """Set drawing color (0.0-1.0)"""
         return self.wrappers.draw_set_color(r, g, b, a) == 0
@@ -53,7 +139,9 @@ class MojoGUI:
     
     def load_default_font(self):
         """Load default system font"""
-        return self.wrappers.load_default_font()
+        result = self.wrappers.load_default_font()
+        get_text_metrics().invalidate()
+        return result
 
 class Widget:
     """Base widget class"""
@@ -63,28 +151,256 @@ class Widget:
         self.y = y
         self.width = width
         self.height = height
-        self.wrappers = get_wrappers()
         self.widget_id = -1
         self.visible = True
         self.enabled = True
+        self.app = None
+        self._pooled_text = None
+        self._text_pool = None
+        self._pool = None
+        self._pool_kind = None
+        self._pool_args = ()
+        self._native_bounds = None
+        self._batch = None
+        self._sent = {}     # property -> arguments of the last native write
+        self._style = None
+        # Last: __del__ relies on the attributes above if this raises
+        self.wrappers = get_wrappers()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def __del__(self):
+        """Report a widget dropped without close(); no FFI calls at GC time"""
+        self._release_text()
+        if self.widget_id >= 0 and self._pool is not None:
+            self._pool.reclaim(self._pool_kind, self.widget_id)
+    
+    def _create_native(self, kind, *extra, text=None):
+        """Take a native ID from the widget pool; True when it was recycled"""
+        pool = get_widget_pool()
+        bounds = (self.x, self.y, self.width, self.height)
+        self.widget_id, reused, colors = pool.acquire(kind, *bounds, *extra, text=text)
+        if self.widget_id >= 0:
+            self._pool = pool
+            self._pool_kind = kind
+            self._pool_args = extra
+            self._native_bounds = bounds
+            if colors:
+                # The recycled ID still shows the base style it was left on
+                self._sent.update(colors)
+                self.set_style()
+        return reused
+    
+    def _reset_native(self):
+        """Undo native state a fresh widget would not have, before pooling the ID"""
+    
+    def close(self):
+        """Release the native widget now, returning its ID to the widget pool
+        
+        Also removes the widget from its application. Returns False if the
+        widget was already closed.
+        """
+        styled = self._style is not None
+        if styled:
+            self._style.sheet.unassign(self)
+        batch = self._active_batch()
+        if batch is not None:
+            batch.flush_widget(self)
+        if self.app is not None:
+            self.app.remove_widget(self)
+        self._release_text()
+        if self.widget_id < 0 or self._pool is None:
+            return False
+        self._reset_native()
+        self._pool.release(self._pool_kind, self.widget_id, self._native_bounds,
+                           *self._pool_args, text=getattr(self, 'text', None),
+                           colors=sent_colors(self) if styled else None)
+        self.widget_id = -1
+        self._pool = None
+        return True
+    
+    # =================================================================
+    # SHARED STYLES
+    # =================================================================
+    
+    @property
+    def style(self):
+        """The Style the widget is drawn with, or None for the library's colors"""
+        return self._style
+    
+    def set_style(self, style=None):
+        """Draw the widget with a shared Style (None = the base style of its kind)"""
+        if style is None:
+            style = get_style_sheet().style(self._pool_kind)
+        self.invalidate()
+        return style.sheet.assign(self, style)
+    
+    def override_style(self, **colors):
+        """Recolor this widget only, e.g. override_style(background=pack_color(200, 0, 0))
+        
+        The shared style is copied on the first override; later ones
+        update the copy, which keeps following the theme for other roles.
+        """
+        style = self._style
+        if style is None:
+            style = get_style_sheet().style(self._pool_kind)
+        if style.owner is self:
+            self.invalidate()
+            return style.update(**colors)
+        return self.set_style(style.derive(owner=self, **colors))
+    
+    # =================================================================
+    # NATIVE PROPERTY WRITES
+    # =================================================================
+    
+    def _active_batch(self):
+        """The property batch writes currently go to, or None"""
+        if self._batch is not None:
+            return self._batch
+        app = self.app
+        return app._batch if app is not None else None
+    
+    def _write(self, prop, setter, *args):
+        """Send setter(*args) as the native value of prop, or queue it in the open batch
+        
+        Called off the render thread of a threaded application, the write
+        is handed to the render thread and True is returned.
+        """
+        app = self.app
+        if app is not None and app._off_render_thread():
+            app.submit(self._write, prop, setter, *args)
+            return True
+        batch = self._active_batch()
+        if batch is not None:
+            batch.write(self, prop, setter, args)
+            return True
+        if prop not in VOLATILE_PROPS:
+            self._sent[prop] = args
+        return setter(*args) == 0
+    
+    def _snapshot(self, column):
+        """This frame's native value of a state column, or None (see state_snapshot)"""
+        app = self.app
+        if app is None:
+            return None
+        return app.snapshot.get(self, column)
+    
+    def _remember(self, column, value):
+        """Keep a value just queried from the library for the rest of the frame"""
+        app = self.app
+        if app is not None:
+            app.snapshot.store(self, column, value)
+        return value
+    
+    def _snapshot_stale(self):
+        """Whether the snapshot tracks this widget but Python's state is newer"""
+        app = self.app
+        return app is not None and app.snapshot.is_stale(self)
+    
+    def _mark_stale(self):
+        """Python changed the native state; stop trusting the frame snapshot"""
+        app = self.app
+        if app is not None:
+            app.snapshot.mark_stale(self)
+    
+    @contextmanager
+    def batch(self):
+        """Queue this widget's native writes until the block exits (see property_batch)
+        
+        Joins the application's batch when the widget belongs to one.
+        """
+        if self.app is not None:
+            with self.app.batch() as batch:
+                yield batch
+        else:
+            with batch_scope(self) as batch:
+                yield batch
+    
+    def _fire(self, handler, *args):
+        """Invoke an event handler, on the logic thread when the app renders threaded"""
+        app = self.app
+        if app is None:
+            handler(*args)
+        elif app.threaded:
+            app.post_callback(handler, *args)
+        elif app.profiler is not None:
+            start = time.perf_counter()
+            handler(*args)
+            elapsed = time.perf_counter() - start
+            app.profiler.record('callback', elapsed)
+            app.profiler.record_widget(self, 'callback', elapsed)
+        else:
+            handler(*args)
+    
+    def _set_text_pooled(self, text, set_text, set_text_string_id, symbol):
+        """Send changed text through the string pool when the library takes string IDs
+        
+        The widget keeps a reference on its pooled text until the text
+        changes again, so the slot is never recycled while in use. Returns
+        the native result (0 on success).
+        """
+        if not self.wrappers.is_function_available(symbol):
+            return set_text(self.widget_id, text)
+        pool = get_string_pool()
+        string_id = pool.acquire(text)
+        if string_id < 0:
+            return set_text(self.widget_id, text)
+        result = set_text_string_id(self.widget_id, string_id)
+        self._release_text()
+        self._pooled_text = text
+        self._text_pool = pool
+        return result
+    
+    def _release_text(self):
+        """Drop the widget's reference on its pooled text
+        
+        The reference goes back to the pool it was taken from, which may
+        belong to bindings that have since been reloaded.
+        """
+        if self._pooled_text is not None:
+            self._text_pool.release(self._pooled_text)
+            self._pooled_text = None
+            self._text_pool = None
+    
+    def invalidate(self):
+        """Mark the widget's screen region as needing a redraw"""
+        app = self.app
+        if app is not None:
+            app.damage(self.x, self.y, self.width, self.height)
     
     def set_position(self, x, y):
         """Set widget position"""
+        self.invalidate()
         self.x = x
         self.y = y
+        self._bounds_changed()
     
     def set_size(self, width, height):
         """Set widget size"""
+        self.invalidate()
         self.width = width
         self.height = height
+        self._bounds_changed()
+    
+    def _bounds_changed(self):
+        """Redraw and re-index the widget at its new bounds"""
+        self.invalidate()
+        if self.app is not None:
+            self.app._widget_moved(self)
     
     def set_visible(self, visible):
         """Set widget visibility"""
         self.visible = visible
+        self.invalidate()
     
     def set_enabled(self, enabled):
         """Set widget enabled state"""
         self.enabled = enabled
+        self.invalidate()
     
     def is_point_inside(self, x, y):
         """Check if point is inside widget bounds"""
@@ -97,14 +413,32 @@ class Button(Widget):
     def __init__(self, x, y, width, height, text="Button"):
         super().__init__(x, y, width, height)
         self.text = text
-        self.widget_id = self.wrappers.button_create(x, y, width, height, text)
+        self._create_native('button', text=text)
         self.clicked = False
         self.on_click = None
+        self._click_waiters = EventWaiters()
     
-    def __del__(self):
-        """Destructor"""
+    def _reset_native(self):
+        if not self.visible:
+            self.wrappers.button_set_visible(self.widget_id, True)
+        if not self.enabled:
+            self.wrappers.button_set_enabled(self.widget_id, True)
+    
+    def set_position(self, x, y):
+        """Set button position"""
+        super().set_position(x, y)
+        if self.widget_id >= 0:
+            self._native_bounds = (x, y, self.width, self.height)
+            return self._write('position', self.wrappers.button_set_position, self.widget_id, x, y)
+        return False
+    
+    def set_size(self, width, height):
+        """Set button size"""
+        super().set_size(width, height)
         if self.widget_id >= 0:
-            self.wrappers.button_destroy(self.widget_id)
+            self._native_bounds = (self.x, self.y, width, height)
+            return self._write('size', self.wrappers.button_set_dimensions, self.widget_id, width, height)
+        return False
     
     def draw(self):
         """Draw the button"""
@@ -113,38 +447,72 @@ class Button(Widget):
         return False
     
     def set_text(self, text):
-        """Set button text"""
+        """Set button text (no FFI call when the text is unchanged)"""
+        if self.widget_id >= 0 and text == self.text:
+            return True
         self.text = text
+        self.invalidate()
         if self.widget_id >= 0:
-            return self.wrappers.button_set_text(self.widget_id, text) == 0
+            return self._write('text', self._set_text_pooled, text, self.wrappers.button_set_text,
+                               self.wrappers.button_set_text_string_id, 'ButtonSetTextStringId')
         return False
     
     def set_enabled(self, enabled):
         """Set button enabled state"""
         super().set_enabled(enabled)
         if self.widget_id >= 0:
-            return self.wrappers.button_set_enabled(self.widget_id, enabled) == 0
+            return self._write('enabled', self.wrappers.button_set_enabled, self.widget_id, enabled)
         return False
     
     def set_visible(self, visible):
         """Set button visibility"""
         super().set_visible(visible)
         if self.widget_id >= 0:
-            return self.wrappers.button_set_visible(self.widget_id, visible) == 0
+            return self._write('visible', self.wrappers.button_set_visible, self.widget_id, visible)
         return False
     
     def handle_click(self, x, y):
         """Handle button click"""
         if self.enabled and self.visible and self.widget_id >= 0:
             clicked = self.wrappers.button_is_clicked(self.widget_id, x, y)
+            if clicked:
+                self.invalidate()
+                self._mark_stale()
+                if self._click_waiters:
+                    self._click_waiters.notify(self)
             if clicked and self.on_click:
-                self.on_click(self)
+                self._fire(self.on_click, self)
             return clicked
         return False
     
+    def is_hovered(self):
+        """Whether the pointer is over the button (read once per frame, see state_snapshot)"""
+        state = self._snapshot(HOVERED)
+        if state is None and self.widget_id >= 0:
+            state = self._remember(HOVERED, self.wrappers.button_is_hovered(self.widget_id))
+        return bool(state)
+    
+    def is_pressed(self):
+        """Whether the button is held down (read once per frame, see state_snapshot)"""
+        state = self._snapshot(PRESSED)
+        if state is None and self.widget_id >= 0:
+            state = self._remember(PRESSED, self.wrappers.button_is_pressed(self.widget_id))
+        return bool(state)
+    
+    def is_toggled(self):
+        """Toggled state of a toggle-mode button (read once per frame, see state_snapshot)"""
+        state = self._snapshot(STATE)
+        if state is None and self.widget_id >= 0:
+            state = self._remember(STATE, self.wrappers.button_get_toggled(self.widget_id))
+        return bool(state)
+    
     def set_click_handler(self, handler):
         """Set click event handler"""
         self.on_click = handler
+    
+    def wait_clicked(self):
+        """Awaitable resolved with the button on its next click"""
+        return self._click_waiters.wait()
 
 class CheckBox(Widget):
     """CheckBox widget class"""
@@ -152,18 +520,25 @@ class CheckBox(Widget):
     def __init__(self, x, y, width, height, enhanced=False):
         super().__init__(x, y, width, height)
         self.checked = False
+        self.indeterminate = False
         self.enhanced = enhanced
         self.on_change = None
+        self._tri_state = False
+        self._change_waiters = EventWaiters()
         
-        if enhanced:
-            self.widget_id = self.wrappers.enhanced_checkbox_create(x, y, width, height)
-        else:
-            self.widget_id = self.wrappers.checkbox_create(x, y, width, height)
+        self._create_native('enhanced_checkbox' if enhanced else 'checkbox')
     
-    def __del__(self):
-        """Destructor"""
-        if self.widget_id >= 0:
-            self.wrappers.checkbox_destroy(self.widget_id)
+    def _reset_native(self):
+        if self.checked or self.indeterminate:
+            self.wrappers.checkbox_set_state(self.widget_id, False)
+        if self._tri_state:
+            self._set_tri_state(False)
+    
+    def _set_tri_state(self, enabled):
+        setter = (self.wrappers.enhanced_checkbox_set_tri_state if self.enhanced
+                  else self.wrappers.checkbox_set_tri_state)
+        self._tri_state = enabled
+        return self._write('tri_state', setter, self.widget_id, enabled)
     
     def draw(self):
         """Draw the checkbox"""
@@ -177,16 +552,38 @@ class CheckBox(Widget):
     def set_checked(self, checked):
         """Set checkbox checked state"""
         self.checked = checked
+        self.indeterminate = False
+        self.invalidate()
+        self._mark_stale()
         if self.widget_id >= 0:
-            return self.wrappers.checkbox_set_state(self.widget_id, checked) == 0
+            return self._write('checked', self.wrappers.checkbox_set_state, self.widget_id, checked)
         return False
     
     def is_checked(self):
-        """Get checkbox checked state"""
-        if self.widget_id >= 0:
-            self.checked = self.wrappers.checkbox_get_state(self.widget_id)
+        """Get checkbox checked state (read once per frame, see state_snapshot)"""
+        state = self._snapshot(STATE)
+        if state is not None:
+            self.checked = bool(state)
+        elif self.widget_id >= 0 and not self._snapshot_stale():
+            self.checked = self._remember(STATE, self.wrappers.checkbox_get_state(self.widget_id))
         return self.checked
     
+    def set_state(self, state):
+        """Set 0=unchecked, 1=checked or 2=indeterminate
+        
+        The native checkbox is switched to tri-state the first time it
+        is made indeterminate.
+        """
+        self.checked = state == 1
+        self.indeterminate = state == 2
+        self.invalidate()
+        self._mark_stale()
+        if self.widget_id < 0:
+            return False
+        if self.indeterminate and not self._tri_state:
+            self._set_tri_state(True)
+        return self._write('checked', self.wrappers.checkbox_set_state_value, self.widget_id, state)
+    
     def toggle(self):
         """Toggle checkbox state"""
         return self.set_checked(not self.is_checked())
@@ -196,19 +593,40 @@ class CheckBox(Widget):
         if self.enabled and self.visible and self.widget_id >= 0:
             result = self.wrappers.checkbox_handle_click(self.widget_id, x, y)
             if result > 0:
+                self.invalidate()
+                self._mark_stale()
                 old_state = self.checked
-                self.checked = self.is_checked()
-                if self.checked != old_state and self.on_change:
-                    self.on_change(self, self.checked)
+                self.checked = self.wrappers.checkbox_get_state(self.widget_id)
+                if self.indeterminate:
+                    self.indeterminate = False
+                    old_state = None
+                if self.checked != old_state:
+                    if self._change_waiters:
+                        self._change_waiters.notify(self.checked)
+                    if self.on_change:
+                        self._fire(self.on_change, self, self.checked)
                 return True
         return False
     
     def set_change_handler(self, handler):
         """Set change event handler"""
         self.on_change = handler
+    
+    def wait_changed(self):
+        """Awaitable resolved with the new state on the next user toggle"""
+        return self._change_waiters.wait()
 
 class Slider(Widget):
-    """Slider widget class"""
+    """Slider widget class
+    
+    In an Application, drag events are coalesced: only the latest pointer
+    position is handled, once per rendered frame. on_change can be
+    throttled or debounced (set_change_handler); on_commit always fires
+    with the final value when a drag is released.
+    """
+    
+    # Application delivers only the latest drag position, once per frame
+    coalesce_drag = True
     
     def __init__(self, x, y, width, height, orientation=0, min_val=0, max_val=100):
         super().__init__(x, y, width, height)
@@ -217,18 +635,17 @@ class Slider(Widget):
         self.max_value = max_val
         self.value = min_val
         self.on_change = None
+        self.on_commit = None
         self.dragging = False
+        self._change_waiters = EventWaiters()
+        self._commit_waiters = EventWaiters()
+        self._change_notifier = ChangeNotifier(self._emit_change)
         
-        self.widget_id = self.wrappers.slider_create(x, y, width, height, orientation)
+        self._create_native('slider', orientation)
         if self.widget_id >= 0:
             self.wrappers.slider_set_range(self.widget_id, min_val, max_val)
             self.wrappers.slider_set_value(self.widget_id, min_val)
     
-    def __del__(self):
-        """Destructor"""
-        if self.widget_id >= 0:
-            self.wrappers.slider_destroy(self.widget_id)
-    
     def draw(self):
         """Draw the slider"""
         if self.visible and self.widget_id >= 0:
@@ -239,22 +656,28 @@ class Slider(Widget):
         """Set slider range"""
         self.min_value = min_val
         self.max_value = max_val
+        self.invalidate()
         if self.widget_id >= 0:
-            return self.wrappers.slider_set_range(self.widget_id, min_val, max_val) == 0
+            return self._write('range', self.wrappers.slider_set_range, self.widget_id, min_val, max_val)
         return False
     
     def set_value(self, value):
         """Set slider value"""
         value = max(self.min_value, min(self.max_value, value))
         self.value = value
+        self.invalidate()
+        self._mark_stale()
         if self.widget_id >= 0:
-            return self.wrappers.slider_set_value(self.widget_id, value) == 0
+            return self._write('value', self.wrappers.slider_set_value, self.widget_id, value)
         return False
     
     def get_value(self):
-        """Get slider value"""
-        if self.widget_id >= 0:
-            self.value = self.wrappers.slider_get_value(self.widget_id)
+        """Get slider value (read once per frame, see state_snapshot)"""
+        value = self._snapshot(VALUE)
+        if value is not None:
+            self.value = value
+        elif self.widget_id >= 0 and not self._snapshot_stale():
+            self.value = self._remember(VALUE, self.wrappers.slider_get_value(self.widget_id))
         return self.value
     
     def handle_click(self, x, y):
@@ -262,11 +685,9 @@ class Slider(Widget):
         if self.enabled and self.visible and self.widget_id >= 0:
             result = self.wrappers.slider_handle_click(self.widget_id, x, y)
             if result > 0:
+                self.invalidate()
                 self.dragging = True
-                old_value = self.value
-                self.value = self.get_value()
-                if self.value != old_value and self.on_change:
-                    self.on_change(self, self.value)
+                self._value_changed(self.wrappers.slider_get_value(self.widget_id))
                 return True
         return False
     
@@ -275,23 +696,66 @@ class Slider(Widget):
         if self.dragging and self.enabled and self.visible and self.widget_id >= 0:
             result = self.wrappers.slider_handle_drag(self.widget_id, x, y)
             if result >= 0:
-                old_value = self.value
-                self.value = self.get_value()
-                if self.value != old_value and self.on_change:
-                    self.on_change(self, self.value)
+                self.invalidate()
+                self._value_changed(self.wrappers.slider_get_value(self.widget_id))
                 return True
         return False
     
     def handle_release(self):
-        """Handle slider release"""
+        """Handle slider release: deliver any held-back change, then commit"""
+        if not self.dragging:
+            return
         self.dragging = False
-    
-    def set_change_handler(self, handler):
-        """Set change event handler"""
+        self._change_notifier.flush()
+        if self._commit_waiters:
+            self._commit_waiters.notify(self.value)
+        if self.on_commit:
+            self._fire(self.on_commit, self, self.value)
+    
+    def _value_changed(self, value):
+        """Record a user change and pass it to the change notifier"""
+        self._mark_stale()
+        if value == self.value:
+            return
+        self.value = value
+        if self._change_waiters:
+            self._change_waiters.notify(value)
+        deadline = self._change_notifier.notify(value)
+        if deadline is not None and self.app is not None:
+            self.app._schedule_notifier(self._change_notifier)
+    
+    def _emit_change(self, value):
+        if self.on_change:
+            self._fire(self.on_change, self, value)
+    
+    def set_change_handler(self, handler, mode=IMMEDIATE, interval=DEFAULT_INTERVAL):
+        """Set change event handler
+        
+        mode is 'immediate' (every change), 'throttle' (at most one call
+        per interval seconds, the last value of a burst delivered late)
+        or 'debounce' (once the value rests for interval seconds).
+        """
         self.on_change = handler
+        self._change_notifier.configure(mode, interval)
+    
+    def set_commit_handler(self, handler):
+        """Set handler(slider, value) called when a drag is released"""
+        self.on_commit = handler
+    
+    def wait_changed(self):
+        """Awaitable resolved with the new value on the next user change"""
+        return self._change_waiters.wait()
+    
+    def wait_committed(self):
+        """Awaitable resolved with the final value when the next drag is released"""
+        return self._commit_waiters.wait()
 
 class ProgressBar(Widget):
-    """ProgressBar widget class"""
+    """ProgressBar widget class
+    
+    Worker threads report through feed() instead of calling set_value();
+    see progress_feed.py.
+    """
     
     def __init__(self, x, y, width, height, style=0):
         super().__init__(x, y, width, height)
@@ -299,13 +763,15 @@ class ProgressBar(Widget):
         self.min_value = 0.0
         self.max_value = 100.0
         self.label_text = ""
+        self._feed = None
         
-        self.widget_id = self.wrappers.progressbar_create(x, y, width, height, style)
+        self._create_native('progressbar', style)
     
-    def __del__(self):
-        """Destructor"""
-        if self.widget_id >= 0:
-            self.wrappers.progressbar_destroy(self.widget_id)
+    def _reset_native(self):
+        if self.value:
+            self.wrappers.progressbar_set_value(self.widget_id, 0)
+        if self.label_text:
+            self.wrappers.progressbar_set_label(self.widget_id, "")
     
     def draw(self):
         """Draw the progress bar"""
@@ -316,8 +782,9 @@ class ProgressBar(Widget):
     def set_value(self, value):
         """Set progress bar value (0-100)"""
         self.value = max(0, min(100, value))
+        self.invalidate()
         if self.widget_id >= 0:
-            return self.wrappers.progressbar_set_value(self.widget_id, self.value) == 0
+            return self._write('progress', self.wrappers.progressbar_set_value, self.widget_id, self.value)
         return False
     
     def get_value(self):
@@ -327,15 +794,50 @@ class ProgressBar(Widget):
         return self.value
     
     def set_label(self, text):
-        """Set progress bar label"""
+        """Set progress bar label (no FFI call when the text is unchanged)"""
+        if self.widget_id >= 0 and text == self.label_text:
+            return True
         self.label_text = text
+        self.invalidate()
         if self.widget_id >= 0:
-            return self.wrappers.progressbar_set_label(self.widget_id, text) == 0
+            return self._write('label', self.wrappers.progressbar_set_label, self.widget_id, text)
         return False
     
     def increment(self, amount=1):
         """Increment progress bar value"""
         return self.set_value(self.value + amount)
+    
+    def feed(self):
+        """Thread-safe ProgressFeed for this bar (created on first use)
+        
+        Any thread may report through it; the latest state is applied on
+        the UI thread once per frame by the Application the bar belongs to.
+        """
+        if self._feed is None:
+            self._feed = ProgressFeed(self._wake_app)
+            if self.app is not None:
+                self.app._fed[self] = None
+        return self._feed
+    
+    def apply_feed(self):
+        """Apply the feed's latest value and label; True if anything changed"""
+        feed = self._feed
+        if feed is None:
+            return False
+        state = feed.take()
+        if state is None:
+            return False
+        value, label = state
+        if value != self.value:
+            self.set_value(value)
+        if label is not None:
+            self.set_label(label)
+        return True
+    
+    def _wake_app(self):
+        app = self.app
+        if app is not None:
+            app.wake()
 
 class Label(Widget):
     """Label widget class"""
@@ -344,12 +846,11 @@ class Label(Widget):
         super().__init__(x, y, width, height)
         self.text = text
         
-        self.widget_id = self.wrappers.label_create(x, y, width, height, text)
+        self._create_native('label', text=text)
     
-    def __del__(self):
-        """Destructor"""
-        if self.widget_id >= 0:
-            self.wrappers.label_destroy(self.widget_id)
+    def _reset_native(self):
+        if not self.visible:
+            self.wrappers.label_set_visible(self.widget_id, True)
     
     def draw(self):
         """Draw the label"""
@@ -358,17 +859,21 @@ class Label(Widget):
         return False
     
     def set_text(self, text):
-        """Set label text"""
+        """Set label text (no FFI call when the text is unchanged)"""
+        if self.widget_id >= 0 and text == self.text:
+            return True
         self.text = text
+        self.invalidate()
         if self.widget_id >= 0:
-            return self.wrappers.label_set_text(self.widget_id, text) == 0
+            return self._write('text', self._set_text_pooled, text, self.wrappers.label_set_text,
+                               self.wrappers.label_set_text_string_id, 'LabelSetTextStringId')
         return False
     
     def set_visible(self, visible):
         """Set label visibility"""
         super().set_visible(visible)
         if self.widget_id >= 0:
-            return self.wrappers.label_set_visible(self.widget_id, visible) == 0
+            return self._write('visible', self.wrappers.label_set_visible, self.widget_id, visible)
         return False
 
 class Canvas:
@@ -377,32 +882,47 @@ class Canvas:
     def __init__(self, gui):
         self.gui = gui
         self.wrappers = gui.wrappers
+        self._recording = None
+        self._display_lists = {}
+        self._native_batches = {}
     
     def set_color(self, r, g, b, a=1.0):
         """Set drawing color"""
+        if self._recording is not None:
+            return self._recording.append(OP_SET_COLOR, r, g, b, a)
         return self.wrappers.draw_set_color(r, g, b, a) == 0
     
     def set_position(self, x, y):
         """Set drawing position"""
+        if self._recording is not None:
+            return self._recording.append(OP_SET_POSITION, x, y)
         return self.wrappers.draw_set_pos(x, y) == 0
     
     def draw_rect(self, x, y, width, height):
         """Draw rectangle"""
         self.set_position(x, y)
+        if self._recording is not None:
+            return self._recording.append(OP_RECT, width, height)
         return self.wrappers.draw_rect(width, height) == 0
     
     def draw_rounded_rect(self, x, y, width, height, radius):
         """Draw rounded rectangle"""
         self.set_position(x, y)
+        if self._recording is not None:
+            return self._recording.append(OP_ROUNDED_RECT, width, height, radius)
         return self.wrappers.draw_rounded_rect(width, height, radius) == 0
     
     def draw_circle(self, x, y, radius, segments=32):
         """Draw circle"""
         self.set_position(x, y)
+        if self._recording is not None:
+            return self._recording.append(OP_CIRCLE, radius, segments)
         return self.wrappers.draw_circle(radius, segments) == 0
     
     def draw_line(self, x1, y1, x2, y2):
         """Draw line"""
+        if self._recording is not None:
+            return self._recording.append(OP_LINE, x1, y1, x2, y2)
         return self.wrappers.draw_line(x1, y1, x2, y2) == 0
     
     def draw_gradient_rect(self, x, y, width, height, color1, color2):
@@ -410,12 +930,171 @@ class Canvas:
         self.set_position(x, y)
         r1, g1, b1, a1 = color1
         r2, g2, b2, a2 = color2
+        if self._recording is not None:
+            return self._recording.append(OP_GRADIENT_RECT, width, height,
+                                          r1, g1, b1, a1, r2, g2, b2, a2)
         return self.wrappers.draw_gradient_rect(width, height, r1, g1, b1, a1, r2, g2, b2, a2) == 0
+    
+    # =================================================================
+    # BULK DRAWING
+    # =================================================================
+    
+    def draw_rects(self, xywh, colors=None):
+        """Draw many filled rectangles in one call
+        
+        xywh is an (n, 4) int32 array of x, y, width, height rows: a NumPy
+        array, any buffer-protocol object or a sequence of rows. colors is
+        None (current color), one packed 0xRRGGBBAA value, or n of them.
+        """
+        rows = pack_ints(xywh, 4)
+        return self._draw_batch('draw_filled_rectangles', rows, colors, (),
+                                lambda x, y, w, h: self.draw_rect(x, y, w, h))
+    
+    def draw_circles(self, xyr, colors=None, segments=16):
+        """Draw many filled circles from (n, 3) x, y, radius rows in one call"""
+        rows = pack_ints(xyr, 3)
+        return self._draw_batch('draw_filled_circles', rows, colors, (segments,),
+                                lambda x, y, r: self.draw_circle(x, y, r, segments))
+    
+    def draw_lines(self, xyxy, colors=None, thickness=1):
+        """Draw many lines from (n, 4) x1, y1, x2, y2 rows in one call"""
+        rows = pack_ints(xyxy, 4)
+        return self._draw_batch('draw_lines', rows, colors, (thickness,), self.draw_line)
+    
+    def draw_texts(self, xy, texts, colors=None, size=DEFAULT_TEXT_SIZE):
+        """Draw one string at each (n, 2) x, y row in one call"""
+        rows = pack_ints(xy, 2)
+        block, count = pack_texts(texts)
+        if count != rows.count:
+            raise ValueError(f"expected {rows.count} texts, got {count}")
+        if self._use_native_batch('draw_texts'):
+            packed_colors = self._batch_colors(colors, count)
+            result = self.wrappers.draw_texts(block, rows.pointer, packed_colors, count, size)
+            if result <= 0:
+                return result == 0
+            # 1: the rendering library has no font of its own; draw one string at a time
+        
+        strings = iter(block.split(b'\0'))
+        return self._draw_batch_fallback(rows, colors, lambda x, y: self._draw_text_fallback(x, y, next(strings), size))
+    
+    def measure_text(self, text, size=DEFAULT_TEXT_SIZE, font_id=0):
+        """Width of text in pixels (cached; see text_metrics.TextMetrics)"""
+        return get_text_metrics().measure(text, size, font_id)
+    
+    def measure_texts(self, texts, size=DEFAULT_TEXT_SIZE, font_id=0):
+        """Widths of many strings without an FFI call per string"""
+        return get_text_metrics().measure_many(texts, size, font_id)
+    
+    def _use_native_batch(self, symbol):
+        """True when the library has the batch entry point and nothing is recording"""
+        if self._recording is not None:
+            return False
+        available = self._native_batches.get(symbol)
+        if available is None:
+            available = self.wrappers.is_function_available(symbol)
+            self._native_batches[symbol] = available
+        return available
+    
+    def _batch_colors(self, colors, count):
+        """Pointer to packed per-primitive colors, or None to keep the current color"""
+        if isinstance(colors, int):
+            self.set_color(*unpack_color(colors))
+            return None
+        packed = pack_colors(colors, count)
+        return packed.pointer if packed is not None else None
+    
+    def _draw_batch(self, symbol, rows, colors, extra_args, draw_one):
+        """Issue a batch through its native entry point, or one primitive at a time"""
+        if self._use_native_batch(symbol):
+            packed_colors = self._batch_colors(colors, rows.count)
+            return getattr(self.wrappers, symbol)(rows.pointer, packed_colors, rows.count, *extra_args) == 0
+        return self._draw_batch_fallback(rows, colors, draw_one)
+    
+    def _draw_batch_fallback(self, rows, colors, draw_one):
+        """Per-primitive path for libraries without batch entry points (and recording)"""
+        if isinstance(colors, int):
+            self.set_color(*unpack_color(colors))
+            colors = None
+        ok = True
+        if colors is None:
+            for row in rows.rows():
+                ok = draw_one(*row) and ok
+        else:
+            for row, rgba in zip(rows.rows(), pack_colors(colors, rows.count).rows()):
+                self.set_color(*unpack_color(rgba))
+                ok = draw_one(*row) and ok
+        return ok
+    
+    def _draw_text_fallback(self, x, y, text, size):
+        """Draw one string through the string pool and TextDraw_impl"""
+        string_id = get_string_pool().intern(text)
+        self.set_position(x, y)
+        if size == DEFAULT_TEXT_SIZE:
+            return self.wrappers.text_draw(string_id) == 0
+        return self.wrappers.text_draw_scaled(string_id, size / DEFAULT_TEXT_SIZE) == 0
+    
+    # =================================================================
+    # DISPLAY LISTS
+    # =================================================================
+    
+    @contextmanager
+    def record(self, display_list=None, key=None):
+        """Capture draw calls into a display list instead of drawing them
+        
+        with canvas.record(key=(width, height)) as background:
+            canvas.draw_rect(...)
+        canvas.replay(background)
+        """
+        if self._recording is not None:
+            raise RuntimeError("Canvas is already recording a display list")
+        if display_list is None:
+            display_list = DisplayList(key)
+        else:
+            display_list.clear()
+            display_list.key = key
+        # Only a recording that completes makes the list valid for key
+        display_list.valid = False
+        self._recording = display_list
+        try:
+            yield display_list
+        finally:
+            self._recording = None
+        display_list.valid = True
+    
+    def replay(self, display_list):
+        """Replay a recorded display list"""
+        if self._recording is not None:
+            # Nested recording: inline the commands
+            self._recording.ops.extend(display_list.ops)
+            self._recording.args.extend(display_list.args)
+            return True
+        return display_list.replay(self.wrappers)
+    
+    def draw_cached(self, name, key, draw_func):
+        """Draw through a named display list, re-recording only when key changes
+        
+        draw_func(canvas) issues the drawing commands; it only runs when the
+        list named name is missing, invalidated, or was built for another key.
+        """
+        display_list = self._display_lists.get(name)
+        if display_list is None or not display_list.is_valid_for(key):
+            with self.record(display_list, key) as display_list:
+                draw_func(self)
+            self._display_lists[name] = display_list
+        return self.replay(display_list)
+    
+    def invalidate(self, name=None):
+        """Invalidate one named display list, or all of them"""
+        if name is None:
+            for display_list in self._display_lists.values():
+                display_list.invalidate()
+        elif name in self._display_lists:
+            self._display_lists[name].invalidate()
 
 class Application:
     """Main application class - the highest level interface"""
     
-    def __init__(self, title="MojoGUI App", width=800, height=600):
+    def __init__(self, title="MojoGUI App", width=800, height=600, damage_tracking=False):
         self.title = title
         self.width = width
         self.height = height
@@ -426,6 +1105,65 @@ class Application:
         self.mouse_x = 0
         self.mouse_y = 0
         self.mouse_pressed = False
+        self.threaded = False
+        self._render_thread = None
+        self._callbacks = queue.SimpleQueue()
+        self._draw_queue = queue.SimpleQueue()
+        
+        # Damage tracking: with it on, render() skips frames nothing changed in
+        self.damage_tracking = damage_tracking
+        self.damaged_region = None   # (x0, y0, x1, y1) union of damage since the last frame
+        self._full_damage = True
+        self.frames_rendered = 0
+        self.frames_skipped = 0
+        
+        # Hit testing: widget bounds in a grid, z-order = order added
+        self._index = SpatialIndex()
+        self._next_z = 0
+        
+        # Packed storage for large numbers of simple widgets, drawn beneath
+        # self.widgets (see widget_registry.WidgetRegistry)
+        self.registry = WidgetRegistry(self.gui.wrappers)
+        self.registry.app = self
+        
+        # Native state of buttons, checkboxes and sliders, read once and kept
+        # until a setter, a click or the pointer can change it
+        self.snapshot = StateSnapshot(self.gui.wrappers, self._index)
+        
+        # Event dispatch: capability -> interested widgets (in z-order),
+        # the widget holding the pointer since the press, and keyboard focus
+        self._handlers = {capability: {} for capability in CAPABILITIES}
+        self.captured = None
+        self.focus = None
+        self._hovered = None
+        
+        # Timers for run(): heap of (deadline, sequence, timer_id)
+        self._timers = {}
+        self._timer_heap = []
+        self._timer_ids = itertools.count(1)
+        self._in_run = False
+        self._async_wake = None
+        self._async_loop = None
+        
+        # Frame profiler, installed by enable_profiler()
+        self.profiler = None
+        
+        # Open property batch (see batch())
+        self._batch = None
+        
+        # Latest (widget, x, y) of a coalesced drag, delivered once per frame,
+        # and change notifiers holding a throttled/debounced value
+        self._pending_drag = None
+        self._notifiers = {}
+        
+        # Progress bars with a feed, applied once per frame
+        self._fed = {}
+        
+        # Models (checkbox groups) to sync() to their widgets at the next frame
+        self._pending_syncs = {}
+        
+        # (service, subscription token, poll timer) while following the system theme
+        self._theme_follow = None
     
     def init(self):
         """Initialize the application"""
@@ -446,9 +1184,92 @@ class Application:
     
     def add_widget(self, widget):
         """Add a widget to the application"""
+        if isinstance(widget, Widget):
+            widget.app = self
+            widget.invalidate()
+        else:
+            self.invalidate()
         self.widgets.append(widget)
+        # Only Widget subclasses report moves, so other widgets are hit-tested everywhere
+        self._index.insert(widget, self._next_z, bounded=isinstance(widget, Widget))
+        self._next_z += 1
+        for capability, method in CAPABILITIES.items():
+            if callable(getattr(widget, method, None)):
+                self._handlers[capability][widget] = None
+        if getattr(widget, '_feed', None) is not None:
+            self._fed[widget] = None
+        if getattr(widget, '_pool_kind', None) in TRACKED_KINDS and widget.widget_id >= 0:
+            self.snapshot.add(widget, widget._pool_kind)
         return widget
     
+    def remove_widget(self, widget):
+        """Remove a widget from the application"""
+        if widget not in self._index:
+            return False
+        self._index.remove(widget)
+        self.widgets.remove(widget)
+        for handlers in self._handlers.values():
+            handlers.pop(widget, None)
+        self._fed.pop(widget, None)
+        self.snapshot.remove(widget)
+        if self.captured is widget:
+            self.captured = None
+        if self._pending_drag is not None and self._pending_drag[0] is widget:
+            self._pending_drag = None
+        if self.focus is widget:
+            self.focus = None
+        if self._hovered is widget:
+            self._hovered = None
+        if self.profiler is not None:
+            self.profiler.forget(widget)
+        if isinstance(widget, Widget):
+            widget.invalidate()
+            widget.app = None
+        else:
+            self.invalidate()
+        return True
+    
+    def widget_at(self, x, y):
+        """Topmost widget (or registry handle) whose bounds contain (x, y), or None"""
+        widget = self._index.top(x, y)
+        if widget is None and self.registry:
+            widget = self.registry.hit_test(x, y)
+        return widget
+    
+    def _widget_moved(self, widget):
+        """Keep the hit-test index in step with Widget.set_position()/set_size()"""
+        if self._off_render_thread():
+            self.submit(self._widget_moved, widget)
+            return
+        self.snapshot.moved(widget)
+        if self._batch is not None:
+            self._batch.moved[widget] = None
+        else:
+            self._index.update(widget)
+    
+    @contextmanager
+    def batch(self):
+        """Queue native property writes of every widget until the block exits
+        
+        with app.batch():
+            for widget in app.widgets:
+                widget.set_position(...)
+        
+        Repeated writes to one property are coalesced and unchanged ones
+        dropped (see property_batch); hit-test index updates are deferred
+        to the end of the block too. Blocks nest; the outermost one flushes.
+        """
+        outermost = self._batch is None
+        try:
+            with batch_scope(self) as batch:
+                yield batch
+        finally:
+            if outermost:
+                for widget in batch.moved:
+                    if widget in self._index:
+                        self._index.update(widget)
+                batch.moved.clear()
+    
     def create_button(self, x, y, width, height, text="Button"):
         """Create and add a button"""
         button = Button(x, y, width, height, text)
@@ -476,73 +1297,692 @@ class Application:
     
     def handle_mouse_click(self, x, y):
         """Handle mouse click events"""
+        if self._off_render_thread():
+            return self.submit(self.handle_mouse_click, x, y)
         self.mouse_x = x
         self.mouse_y = y
         self.mouse_pressed = True
+        self.invalidate()
+        self.snapshot.forget_at(x, y)
         
-        # Process widgets in reverse order (top to bottom)
-        for widget in reversed(self.widgets):
-            if hasattr(widget, 'handle_click'):
-                if widget.handle_click(x, y):
-                    break  # Stop after first widget handles the click
+        # Process clickable widgets under the pointer, top to bottom; the
+        # one that accepts captures the pointer and takes keyboard focus
+        clickable = self._handlers['click']
+        self.captured = None
+        for widget in self._index.query(x, y):
+            if widget in clickable and widget.handle_click(x, y):
+                self.captured = widget
+                break  # Stop after first widget handles the click
+        if self.captured is None and self.registry:
+            self._click_registry(x, y)
+        if self.captured is not None and self.captured in self._handlers['key']:
+            self.focus = self.captured
+        else:
+            self.focus = None
+    
+    def _click_registry(self, x, y):
+        """Offer a click no Widget accepted to the registry's widgets"""
+        handle, handler = self.registry.click(x, y)
+        if handler is None:
+            return
+        if self.threaded:
+            self.post_callback(handler, handle)
+        elif self.profiler is not None:
+            start = time.perf_counter()
+            handler(handle)
+            self.profiler.record('callback', time.perf_counter() - start)
+        else:
+            handler(handle)
     
     def handle_mouse_drag(self, x, y):
-        """Handle mouse drag events"""
+        """Handle mouse drag events (delivered to the widget that captured the press)"""
+        if self._off_render_thread():
+            return self.submit(self.handle_mouse_drag, x, y)
         self.mouse_x = x
         self.mouse_y = y
         
-        if self.mouse_pressed:
-            for widget in self.widgets:
-                if hasattr(widget, 'handle_drag'):
-                    widget.handle_drag(x, y)
+        widget = self.captured
+        if self.mouse_pressed and widget in self._handlers['drag']:
+            if getattr(widget, 'coalesce_drag', False):
+                self._pending_drag = (widget, x, y)
+                self.invalidate()
+            else:
+                widget.handle_drag(x, y)
+    
+    def _deliver_drag(self):
+        """Hand the latest coalesced drag position to its widget"""
+        pending, self._pending_drag = self._pending_drag, None
+        if pending is not None:
+            widget, x, y = pending
+            widget.handle_drag(x, y)
+    
+    def _schedule_notifier(self, notifier):
+        """Poll a notifier with a deferred value every frame until it delivers"""
+        self._notifiers[notifier] = None
+        self.wake()
+    
+    def _schedule_sync(self, model):
+        """Call model.sync() once at the next frame"""
+        self._pending_syncs[model] = None
+        self.wake()
+    
+    def _poll_notifiers(self):
+        now = time.perf_counter()
+        for notifier in list(self._notifiers):
+            if notifier.poll(now) is None:
+                del self._notifiers[notifier]
     
     def handle_mouse_release(self, x, y):
-        """Handle mouse release events"""
+        """Handle mouse release events (delivered to the widget that captured the press)"""
+        if self._off_render_thread():
+            return self.submit(self.handle_mouse_release, x, y)
         self.mouse_x = x
         self.mouse_y = y
         self.mouse_pressed = False
+        self.invalidate()
+        self.snapshot.forget_at(x, y)
         
-        for widget in self.widgets:
-            if hasattr(widget, 'handle_release'):
-                widget.handle_release()
+        if self._pending_drag is not None:
+            self._deliver_drag()
+        widget = self.captured
+        self.captured = None
+        if widget in self._handlers['release']:
+            widget.handle_release()
+    
+    def handle_mouse_move(self, x, y):
+        """Handle pointer movement: hover goes to the topmost hoverable widget"""
+        if self._off_render_thread():
+            return self.submit(self.handle_mouse_move, x, y)
+        if self.mouse_pressed:
+            return self.handle_mouse_drag(x, y)
+        self.mouse_x = x
+        self.mouse_y = y
+        
+        hoverable = self._handlers['hover']
+        if not hoverable:
+            return
+        hovered = None
+        for widget in self._index.query(x, y):
+            if widget in hoverable:
+                hovered = widget
+                break
+        if hovered is not self._hovered:
+            self.invalidate()
+            self._hovered = hovered
+        if hovered is not None:
+            hovered.handle_hover(x, y)
+    
+    def handle_key(self, key, char=None):
+        """Handle a key press (delivered to the focused widget)"""
+        if self._off_render_thread():
+            return self.submit(self.handle_key, key, char)
+        widget = self.focus
+        if widget is None:
+            return False
+        self.invalidate()
+        if char is None:
+            return widget.handle_key(key)
+        return widget.handle_key(key, char)
+    
+    def set_focus(self, widget):
+        """Give a widget keyboard focus (None clears it)"""
+        if widget is not None and widget not in self._handlers['key']:
+            return False
+        self.focus = widget
+        return True
     
     def update(self):
         """Update application state"""
         # Poll events
-        self.gui.poll_events()
+        profiler = self.profiler
+        if profiler is None:
+            self.gui.poll_events()
+        else:
+            start = time.perf_counter()
+            self.gui.poll_events()
+            profiler.record('poll_events', time.perf_counter() - start)
         
-        # Update widgets
-        for widget in self.widgets:
-            if hasattr(widget, 'update'):
+        self._update_widgets()
+    
+    def _update_widgets(self, refresh_state=True):
+        """Run update() on every widget that has per-frame work
+        
+        refresh_state refreshes the state snapshot first; the event loops
+        only ask for it when the frame is going to render.
+        """
+        if refresh_state and self.snapshot.widgets:
+            self.snapshot.refresh(self.mouse_x, self.mouse_y)
+        if self._notifiers:
+            self._poll_notifiers()
+        if self._fed:
+            for bar in tuple(self._fed):
+                bar.apply_feed()
+        if self._pending_syncs:
+            pending, self._pending_syncs = self._pending_syncs, {}
+            for model in pending:
+                model.sync()
+        profiler = self.profiler
+        if profiler is None:
+            for widget in tuple(self._handlers['update']):
                 widget.update()
+            return
+        clock = time.perf_counter
+        total = 0.0
+        for widget in tuple(self._handlers['update']):
+            start = clock()
+            widget.update()
+            elapsed = clock() - start
+            profiler.record_widget(widget, 'update', elapsed)
+            total += elapsed
+        profiler.record('update', total)
     
     def render(self):
-        """Render the application"""
+        """Render the application
+        
+        With damage tracking on, a frame in which nothing was damaged is
+        skipped entirely and the previous frame stays on screen.
+        """
+        if self._pending_drag is not None:
+            self._deliver_drag()
+        if self.damage_tracking and not self.needs_redraw():
+            self.frames_skipped += 1
+            return True
+        
+        profiler = self.profiler
+        if profiler is not None:
+            return self._render_profiled(profiler)
+        
         if not self.gui.begin_frame():
             return False
         
         # Draw all widgets
+        if self.registry:
+            self.registry.draw()
         for widget in self.widgets:
             widget.draw()
         
+        self._drain_draw_queue()
+        self._full_damage = False
+        self.damaged_region = None
+        self.frames_rendered += 1
+        
         if not self.gui.end_frame():
             return False
         
         return True
     
+    def _render_profiled(self, profiler):
+        """render() with every widget draw, end_frame and the frame timed"""
+        clock = time.perf_counter
+        frame_start = clock()
+        if not self.gui.begin_frame():
+            return False
+        
+        draw_start = clock()
+        if self.registry:
+            self.registry.draw()
+        for widget in self.widgets:
+            start = clock()
+            widget.draw()
+            profiler.record_widget(widget, 'draw', clock() - start)
+        
+        self._drain_draw_queue()
+        profiler.record('draw', clock() - draw_start)
+        if profiler.overlay:
+            profiler.draw_overlay(self.canvas)
+        self._full_damage = False
+        self.damaged_region = None
+        self.frames_rendered += 1
+        
+        start = clock()
+        ok = self.gui.end_frame()
+        end = clock()
+        profiler.record('end_frame', end - start)
+        profiler.record('frame', end - frame_start)
+        return ok
+    
+    # =================================================================
+    # PROFILING
+    # =================================================================
+    
+    def enable_profiler(self, capacity=DEFAULT_CAPACITY, overlay=False):
+        """Start timing frames; returns the FrameProfiler
+        
+        overlay=True draws the frame-time graph and percentiles on top of
+        every rendered frame. With damage tracking on, the overlay only
+        refreshes when something else triggers a frame.
+        """
+        if self.profiler is None:
+            self.profiler = FrameProfiler(capacity)
+        self.profiler.overlay = overlay
+        self.invalidate()
+        return self.profiler
+    
+    def disable_profiler(self):
+        """Stop timing; returns the profiler with the samples collected so far"""
+        profiler, self.profiler = self.profiler, None
+        if profiler is not None and profiler.overlay:
+            self.invalidate()
+        return profiler
+    
+    # =================================================================
+    # DAMAGE TRACKING
+    # =================================================================
+    
+    def damage(self, x, y, width, height):
+        """Add a screen region to the area that must be redrawn"""
+        region = self.damaged_region
+        if region is None:
+            self.damaged_region = (x, y, x + width, y + height)
+        else:
+            self.damaged_region = (min(region[0], x), min(region[1], y),
+                                   max(region[2], x + width), max(region[3], y + height))
+        if self._async_wake is not None:
+            self._wake_async()
+    
+    def invalidate(self):
+        """Force a full redraw on the next frame
+        
+        Call this after drawing-relevant changes the app cannot see, such as
+        custom Canvas content or widgets that are not Widget subclasses.
+        """
+        self._full_damage = True
+        if self._async_wake is not None:
+            self._wake_async()
+    
+    def needs_redraw(self):
+        """True when something was damaged since the last rendered frame"""
+        return (self._full_damage or self.damaged_region is not None
+                or not self._draw_queue.empty())
+    
     def run_frame(self):
-        """Run a single frame"""
+        """Run a single frame
+        
+        With a render thread running this only dispatches pending widget
+        callbacks; the render thread draws on its own schedule.
+        """
+        if self.threaded:
+            self.process_callbacks()
+            return self.running
         self.update()
         return self.render()
     
+    def close(self):
+        """Close every widget, clear the registry and destroy pooled native IDs
+        
+        With a render thread running, call this through submit().
+        """
+        self.running = False
+        for widget in list(self.widgets):
+            if isinstance(widget, Widget):
+                widget.close()
+            else:
+                self.remove_widget(widget)
+        self.registry.clear()
+        self.unfollow_system_theme()
+        get_widget_pool().drain()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def apply_theme(self, theme):
+        """Switch every styled widget to theme (e.g. styles.DARK_THEME)"""
+        with self.batch():
+            ok = get_style_sheet().apply_theme(theme)
+        self.invalidate()
+        return ok
+    
+    def follow_system_theme(self, light=None, dark=None, interval=DEFAULT_POLL_INTERVAL):
+        """Apply dark or light (default DARK_THEME / LIGHT_THEME) to match the desktop
+        
+        While run() loops, the system theme is polled every interval
+        seconds (a stat of its settings files) and the matching theme is
+        applied when it changes.
+        """
+        self.unfollow_system_theme()
+        system = get_system_theme()
+        light = light or LIGHT_THEME
+        dark = dark or DARK_THEME
+        
+        def on_change(theme):
+            self.apply_theme(dark if theme.is_dark else light)
+        
+        on_change(system)
+        token = system.subscribe(on_change)
+        timer_id = self.add_timer(interval, lambda app: system.poll())
+        self._theme_follow = (system, token, timer_id)
+        return system
+    
+    def unfollow_system_theme(self):
+        """Stop following the system theme; False if it was not followed"""
+        if self._theme_follow is None:
+            return False
+        system, token, timer_id = self._theme_follow
+        self._theme_follow = None
+        system.unsubscribe(token)
+        self.cancel_timer(timer_id)
+        return True
+    
+    def widget_report(self):
+        """In-use / pooled / leaked native widget counts per kind"""
+        return get_widget_pool().report()
+    
     def quit(self):
         """Quit the application"""
         self.running = False
+        self.wake()
+    
+    def wake(self):
+        """Wake run() or run_async() from any thread to process a frame"""
+        if self._in_run:
+            self.gui.wake()
+        self._wake_async()
+    
+    # =================================================================
+    # EVENT-DRIVEN MAIN LOOP
+    # =================================================================
+    
+    def add_timer(self, interval, callback, repeat=True):
+        """Call callback(app) every interval seconds while run() is looping
+        
+        Returns a timer id for cancel_timer().
+        """
+        timer_id = next(self._timer_ids)
+        deadline = time.perf_counter() + interval
+        self._timers[timer_id] = (interval, callback, repeat)
+        heapq.heappush(self._timer_heap, (deadline, timer_id))
+        return timer_id
+    
+    def cancel_timer(self, timer_id):
+        """Stop a timer; returns False if it was not active"""
+        return self._timers.pop(timer_id, None) is not None
+    
+    def _next_timer_deadline(self):
+        """Earliest timer or change-notifier deadline, or None"""
+        heap = self._timer_heap
+        while heap and heap[0][1] not in self._timers:
+            heapq.heappop(heap)
+        deadline = heap[0][0] if heap else None
+        for notifier in self._notifiers:
+            if notifier.deadline is not None and (deadline is None or notifier.deadline < deadline):
+                deadline = notifier.deadline
+        return deadline
+    
+    def _run_timers(self, now):
+        """Fire every timer that is due"""
+        heap = self._timer_heap
+        while heap and heap[0][0] <= now:
+            deadline, timer_id = heapq.heappop(heap)
+            timer = self._timers.get(timer_id)
+            if timer is None:
+                continue
+            interval, callback, repeat = timer
+            if repeat:
+                # Skip missed ticks instead of firing a burst after a stall
+                next_deadline = deadline + interval
+                if next_deadline <= now:
+                    next_deadline = now + interval
+                heapq.heappush(heap, (next_deadline, timer_id))
+            else:
+                del self._timers[timer_id]
+            callback(self)
+    
+    def run(self, max_fps=60, idle_timeout=None, vsync=None):
+        """Run the event-driven main loop until quit()
+        
+        The loop blocks in the library's event wait instead of spinning:
+        frames are rendered only when input changes a widget, a timer
+        fires, a widget is damaged or a widget has per-frame update()
+        work, and at most max_fps times a second. idle_timeout caps how long one idle
+        wait may block (None = until the next event or timer). vsync
+        turns the buffer swap interval on or off (None leaves it as is).
+        Damage tracking is switched on for the duration of the loop.
+        """
+        if self.threaded:
+            raise RuntimeError("run() renders on the calling thread; stop the render thread first")
+        if not self.running and not self.init():
+            return False
+        if vsync is not None:
+            self.gui.set_vsync(vsync)
+        
+        frame_interval = 1.0 / max_fps if max_fps else 0.0
+        previous_tracking = self.damage_tracking
+        self.damage_tracking = True
+        self._in_run = True
+        self.invalidate()
+        last_frame = 0.0
+        ok = True
+        try:
+            while self.running:
+                now = time.perf_counter()
+                if self.needs_redraw() or self._handlers['update']:
+                    timeout = max(0.0, frame_interval - (now - last_frame))
+                else:
+                    timeout = idle_timeout
+                    deadline = self._next_timer_deadline()
+                    if deadline is not None:
+                        until_timer = max(0.0, deadline - now)
+                        timeout = until_timer if timeout is None else min(timeout, until_timer)
+                
+                # Events that reach widgets go through handle_*(), which
+                # damage what they change; the wait itself redraws nothing
+                wait_start = time.perf_counter()
+                self.gui.wait_events(timeout)
+                now = time.perf_counter()
+                if self.profiler is not None:
+                    self.profiler.record('poll_events', now - wait_start)
+                self._run_timers(now)
+                
+                frame_due = now - last_frame >= frame_interval
+                self._update_widgets(frame_due and self.needs_redraw())
+                
+                if self.needs_redraw() and frame_due:
+                    last_frame = now
+                    if not self.render():
+                        ok = False
+                        break
+        finally:
+            self._in_run = False
+            self.damage_tracking = previous_tracking
+        return ok
+    
+    async def run_async(self, max_fps=60, poll_interval=None):
+        """Run the frame loop as a coroutine on the running asyncio loop
+        
+        Frames are rendered when something changed, paced to max_fps,
+        and the coroutine sleeps on the event loop in between, so socket
+        callbacks and other tasks run without added latency. Changes made
+        from tasks (widget setters, invalidate(), queue_draw(), timers)
+        wake it immediately. The library's input queue cannot be awaited,
+        so it is polled without blocking every poll_interval seconds
+        (default one frame interval) while idle.
+        """
+        if self.threaded:
+            raise RuntimeError("run_async() renders on the event loop thread; stop the render thread first")
+        if not self.running and not self.init():
+            return False
+        
+        frame_interval = 1.0 / max_fps if max_fps else 0.0
+        if poll_interval is None:
+            poll_interval = frame_interval or FALLBACK_WAIT
+        previous_tracking = self.damage_tracking
+        self.damage_tracking = True
+        self._async_loop = asyncio.get_running_loop()
+        self._async_wake = wake = asyncio.Event()
+        self.invalidate()
+        last_frame = 0.0
+        ok = True
+        try:
+            while self.running:
+                poll_start = time.perf_counter()
+                self.gui.wait_events(0)
+                now = time.perf_counter()
+                if self.profiler is not None:
+                    self.profiler.record('poll_events', now - poll_start)
+                self._run_timers(now)
+                frame_due = now - last_frame >= frame_interval
+                self._update_widgets(frame_due and self.needs_redraw())
+                
+                if self.needs_redraw() and frame_due:
+                    last_frame = now
+                    if not self.render():
+                        ok = False
+                        break
+                
+                now = time.perf_counter()
+                if self.needs_redraw() or self._handlers['update']:
+                    timeout = max(0.0, frame_interval - (now - last_frame))
+                else:
+                    timeout = poll_interval
+                    deadline = self._next_timer_deadline()
+                    if deadline is not None:
+                        timeout = min(timeout, max(0.0, deadline - now))
+                
+                wake.clear()
+                if timeout > 0 and self.running:
+                    try:
+                        await asyncio.wait_for(wake.wait(), timeout)
+                    except asyncio.TimeoutError:
+                        pass
+                else:
+                    await asyncio.sleep(0)
+        finally:
+            self._async_wake = None
+            self._async_loop = None
+            self.damage_tracking = previous_tracking
+        return ok
+    
+    def _wake_async(self):
+        """Wake run_async() from a task or from another thread"""
+        wake, loop = self._async_wake, self._async_loop
+        if wake is None:
+            return
+        try:
+            current = asyncio.get_running_loop()
+        except RuntimeError:
+            current = None
+        if current is loop:
+            wake.set()
+        else:
+            loop.call_soon_threadsafe(wake.set)
+    
+    def set_damage_tracking(self, enabled):
+        """Turn idle-frame skipping on or off"""
+        self.damage_tracking = enabled
+        self.invalidate()
+    
+    # =================================================================
+    # THREADED RENDERING
+    # =================================================================
+    
+    def start_render_thread(self, max_fps=60, timeout=None):
+        """Move window initialization and rendering to a dedicated thread
+        
+        Returns True once the render thread has initialized the window.
+        From then on, create widgets with submit() and queue custom drawing
+        with queue_draw(); widget setters called from other threads hand
+        their native writes to the render thread themselves. Widget event
+        handlers are delivered to the calling thread through
+        process_callbacks() / run_frame().
+        """
+        if self._render_thread is not None:
+            return self._render_thread.init_ok
+        thread = RenderThread(self, max_fps)
+        self._render_thread = thread
+        self.threaded = True
+        thread.start()
+        thread.ready.wait(timeout)
+        if not thread.init_ok:
+            self.stop_render_thread()
+            if thread.error is not None:
+                raise thread.error
+            return False
+        return True
+    
+    def stop_render_thread(self, timeout=None):
+        """Stop the render thread and return to single-threaded mode"""
+        thread = self._render_thread
+        if thread is None:
+            return
+        thread.stop()
+        if thread is not threading.current_thread():
+            thread.join(timeout)
+        self._render_thread = None
+        self.threaded = False
+        self.process_callbacks()
+    
+    def _off_render_thread(self):
+        """True when called from a thread other than the running render thread"""
+        thread = self._render_thread
+        return thread is not None and thread is not threading.current_thread()
+    
+    def submit(self, func, *args, **kwargs):
+        """Run func where FFI calls are allowed and return a Future
+        
+        With a render thread the call is queued for it; otherwise it runs
+        immediately.
+        """
+        if self._off_render_thread():
+            return self._render_thread.submit(func, *args, **kwargs)
+        future = Future()
+        try:
+            future.set_result(func(*args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+    
+    def queue_draw(self, func, *args, **kwargs):
+        """Queue a one-shot draw command for the next rendered frame
+        
+        e.g. app.queue_draw(app.canvas.draw_rect, 10, 10, 50, 20)
+        """
+        self._draw_queue.put((func, args, kwargs))
+        if self._in_run:
+            self.gui.wake()
+        self._wake_async()
+    
+    def _drain_draw_queue(self):
+        """Issue queued draw commands inside the current frame"""
+        while True:
+            try:
+                func, args, kwargs = self._draw_queue.get_nowait()
+            except queue.Empty:
+                return
+            func(*args, **kwargs)
+    
+    def post_callback(self, handler, *args):
+        """Hand a widget event handler to the logic thread"""
+        self._callbacks.put((handler, args))
+    
+    def process_callbacks(self, timeout=0):
+        """Run pending widget event handlers on the calling thread
+        
+        Waits up to timeout seconds for the first one (None waits forever)
+        and returns the number of handlers run.
+        """
+        count = 0
+        block = timeout is None or timeout > 0
+        while True:
+            try:
+                handler, args = self._callbacks.get(block and count == 0, timeout)
+            except queue.Empty:
+                return count
+            profiler = self.profiler
+            if profiler is None:
+                handler(*args)
+            else:
+                start = time.perf_counter()
+                handler(*args)
+                profiler.record('callback', time.perf_counter() - start)
+            count += 1
 
 # Convenience functions for quick setup
-def create_app(title="MojoGUI App", width=800, height=600):
+def create_app(title="MojoGUI App", width=800, height=600, damage_tracking=False):
     """Create and initialize a new application"""
-    app = Application(title, width, height)
+    app = Application(title, width, height, damage_tracking)
     if app.init():
         return app
     return None
@@ -5,20 +5,387 @@ Direct ctypes bindings to C library functions
 """
 
 import ctypes
+import hashlib
+import json
 import os
 import sys
 
+try:
+    from .headless_backend import HeadlessLibrary
+    from .ffi_instrumentation import FFIProfiler
+except ImportError:
+    from headless_backend import HeadlessLibrary
+    from ffi_instrumentation import FFIProfiler
+
+# =================================================================
+# CORE WINDOW SYSTEM
+# =================================================================
+CORE_FUNCTIONS = {
+    'WinInit_impl': ([], ctypes.c_int),
+    'WinInit': ([], ctypes.c_int),
+    'WinSetSize_impl': ([ctypes.c_int, ctypes.c_int], ctypes.c_int),
+    'WinSetSize': ([ctypes.c_int, ctypes.c_int], ctypes.c_int),
+    'WinCreate_impl': ([], ctypes.c_int),
+    'WinCreate': ([], ctypes.c_int),
+    'WinDestroy_impl': ([ctypes.c_int], ctypes.c_int),
+    'WinDestroy': ([ctypes.c_int], ctypes.c_int),
+    'WinSetTitle_impl': ([ctypes.c_int], ctypes.c_int),
+    'WinSetTitle': ([ctypes.c_int], ctypes.c_int),
+    'FrameBegin_impl': ([], ctypes.c_int),
+    'FrameBegin': ([], ctypes.c_int),
+    'FrameEnd_impl': ([], ctypes.c_int),
+    'FrameEnd': ([], ctypes.c_int),
+    'EventPoll_impl': ([], ctypes.c_int),
+    'EventPoll': ([], ctypes.c_int),
+    'wait_events': ([ctypes.c_int], ctypes.c_int),
+    'post_empty_event': ([], ctypes.c_int),
+    'set_swap_interval': ([ctypes.c_int], ctypes.c_int),
+}
+
+# =================================================================
+# STRING SYSTEM
+# =================================================================
+STRING_FUNCTIONS = {
+    'StringSet_impl': ([ctypes.c_int, ctypes.c_char_p], ctypes.c_int),
+    'StringSet': ([ctypes.c_int, ctypes.c_char_p], ctypes.c_int),
+    'AllocTempString': ([], ctypes.c_int),
+    'StrClear': ([ctypes.c_int], ctypes.c_int),
+    'StrRegister': ([ctypes.c_int, ctypes.c_int, ctypes.c_int], ctypes.c_int),
+    'StrFromInt': ([ctypes.c_int, ctypes.c_int], ctypes.c_int),
+    'StrFromFloat': ([ctypes.c_float, ctypes.c_int, ctypes.c_int], ctypes.c_int),
+    'StrConcat': ([ctypes.c_int, ctypes.c_int], ctypes.c_int),
+}
+
+# =================================================================
+# DRAWING SYSTEM
+# =================================================================
+DRAWING_FUNCTIONS = {
+    'DrawSetColor_impl': ([ctypes.c_float, ctypes.c_float, ctypes.c_float, ctypes.c_float], ctypes.c_int),
+    'DrawSetColor': ([ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int], ctypes.c_int),
+    'DrawSetPos_impl': ([ctypes.c_float, ctypes.c_float], ctypes.c_int),
+    'DrawSetPos': ([ctypes.c_int, ctypes.c_int], ctypes.c_int),
+    'DrawRect_impl': ([ctypes.c_float, ctypes.c_float], ctypes.c_int),
+    'DrawRect': ([ctypes.c_int, ctypes.c_int], ctypes.c_int),
+    'DrawRoundedRect_impl': ([ctypes.c_float, ctypes.c_float, ctypes.c_float], ctypes.c_int),
+    'DrawRoundedRect': ([ctypes.c_int, ctypes.c_int, ctypes.c_int], ctypes.c_int),
+    'DrawCircle_impl': ([ctypes.c_float, ctypes.c_int], ctypes.c_int),
+    'DrawCircle': ([ctypes.c_int, ctypes.c_int], ctypes.c_int),
+    'DrawGradientRect_impl': ([
+        ctypes.c_float, ctypes.c_float,  # width, height
+        ctypes.c_float, ctypes.c_float, ctypes.c_float, ctypes.c_float,  # color1
+        ctypes.c_float, ctypes.c_float, ctypes.c_float, ctypes.c_float   # color2
+    ], ctypes.c_int),
+    'DrawGradientRect': ([
+        ctypes.c_int, ctypes.c_int,  # width, height
+        ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int,  # color1
+        ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int   # color2
+    ], ctypes.c_int),
+    'DrawLine_impl': ([ctypes.c_float, ctypes.c_float, ctypes.c_float, ctypes.c_float], ctypes.c_int),
+    'DrawLine': ([ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int], ctypes.c_int),
+    'DrawShadow_impl': ([ctypes.c_float, ctypes.c_float, ctypes.c_float, ctypes.c_float, ctypes.c_float], ctypes.c_int),
+    'DrawTriangle_impl': ([ctypes.c_float, ctypes.c_float, ctypes.c_float, ctypes.c_float, ctypes.c_float, ctypes.c_float], ctypes.c_int),
+    'DrawRectOutline_impl': ([ctypes.c_float, ctypes.c_float, ctypes.c_float], ctypes.c_int),
+}
+
+# =================================================================
+# BATCH DRAWING SYSTEM
+# Packed int32 rows plus optional 0xRRGGBBAA colors, one call per batch
+# =================================================================
+_INT_ARRAY = ctypes.POINTER(ctypes.c_int)
+_COLOR_ARRAY = ctypes.POINTER(ctypes.c_uint)
+
+BATCH_FUNCTIONS = {
+    'draw_filled_rectangles': ([_INT_ARRAY, _COLOR_ARRAY, ctypes.c_int], ctypes.c_int),
+    'draw_filled_circles': ([_INT_ARRAY, _COLOR_ARRAY, ctypes.c_int, ctypes.c_int], ctypes.c_int),
+    'draw_lines': ([_INT_ARRAY, _COLOR_ARRAY, ctypes.c_int, ctypes.c_int], ctypes.c_int),
+    'draw_texts': ([ctypes.c_char_p, _INT_ARRAY, _COLOR_ARRAY, ctypes.c_int, ctypes.c_int], ctypes.c_int),
+}
+
+# =================================================================
+# SYSTEM THEME
+# Detected once and cached by the library; colors are packed 0xRRGGBBAA
+# =================================================================
+SYSTEM_THEME_FUNCTIONS = {
+    'get_system_dark_mode': ([], ctypes.c_int),
+    'get_system_accent_color': ([], ctypes.c_int),
+    'get_system_window_color': ([], ctypes.c_int),
+    'get_system_text_color': ([], ctypes.c_int),
+    'system_theme_poll': ([], ctypes.c_int),
+    'system_theme_refresh': ([], ctypes.c_int),
+    'system_theme_generation': ([], ctypes.c_int),
+}
+
+# =================================================================
+# TEXT AND FONT SYSTEM
+# =================================================================
+TEXT_FUNCTIONS = {
+    'FontLoadTTF_impl': ([ctypes.c_int, ctypes.c_int, ctypes.c_float], ctypes.c_int),
+    'FontLoadTTF': ([ctypes.c_int, ctypes.c_int, ctypes.c_float], ctypes.c_int),
+    'FontSetActive_impl': ([ctypes.c_int], ctypes.c_int),
+    'FontSetActive': ([ctypes.c_int], ctypes.c_int),
+    'FontSetColors_impl': ([ctypes.c_float, ctypes.c_float, ctypes.c_float, ctypes.c_float,
+                           ctypes.c_float, ctypes.c_float, ctypes.c_float, ctypes.c_float], ctypes.c_int),
+    'TextDraw_impl': ([ctypes.c_int], ctypes.c_int),
+    'TextDraw': ([ctypes.c_int, ctypes.c_int], ctypes.c_int),
+    'TextDrawScaled_impl': ([ctypes.c_int, ctypes.c_float], ctypes.c_int),
+    'TextGetWidth_impl': ([ctypes.c_int, ctypes.c_int, ctypes.c_int], ctypes.c_int),
+    'TextGetHeight_impl': ([ctypes.c_int], ctypes.c_int),
+    'GetTextWidth_impl': ([ctypes.c_int, ctypes.c_int], ctypes.c_int),
+    'LoadDefaultFont': ([], ctypes.c_int),
+    'LoadTrueTypeFont': ([ctypes.c_char_p, ctypes.c_float], ctypes.c_int),
+    'TextGetLineHeight': ([], ctypes.c_int),
+    'TextGetCharWidth': ([ctypes.c_int], ctypes.c_int),
+}
+
+# =================================================================
+# BUTTON WIDGET SYSTEM
+# =================================================================
+BUTTON_FUNCTIONS = {
+    'ButtonCreate': ([ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_char_p], ctypes.c_int),
+    'ButtonDestroy': ([ctypes.c_int], ctypes.c_int),
+    'DrawButton': ([ctypes.c_int], ctypes.c_int),
+    'ButtonSetText': ([ctypes.c_int, ctypes.c_char_p], ctypes.c_int),
+    'ButtonSetTextStringId': ([ctypes.c_int, ctypes.c_int], ctypes.c_int),
+    'ButtonSetIcon': ([ctypes.c_int, ctypes.c_char_p, ctypes.c_int], ctypes.c_int),
+    'ButtonSetStyle': ([ctypes.c_int, ctypes.c_int], ctypes.c_int),
+    'ButtonSetSize': ([ctypes.c_int, ctypes.c_int], ctypes.c_int),
+    'ButtonSetEnabled': ([ctypes.c_int, ctypes.c_int], ctypes.c_int),
+    'ButtonSetVisible': ([ctypes.c_int, ctypes.c_int], ctypes.c_int),
+    'ButtonSetToggleMode': ([ctypes.c_int, ctypes.c_int], ctypes.c_int),
+    'ButtonSetToggled': ([ctypes.c_int, ctypes.c_int], ctypes.c_int),
+    'ButtonGetToggled': ([ctypes.c_int], ctypes.c_int),
+    'ButtonSetCornerRadius': ([ctypes.c_int, ctypes.c_float], ctypes.c_int),
+    'ButtonSetColors': ([ctypes.c_int] + [ctypes.c_int] * 8, ctypes.c_int),
+    'ButtonSetHoverColors': ([ctypes.c_int] + [ctypes.c_int] * 8, ctypes.c_int),
+    'ButtonSetPressedColors': ([ctypes.c_int] + [ctypes.c_int] * 8, ctypes.c_int),
+    'ButtonSetBorderColors': ([ctypes.c_int] + [ctypes.c_int] * 8, ctypes.c_int),
+    'ButtonSetPosition': ([ctypes.c_int, ctypes.c_int, ctypes.c_int], ctypes.c_int),
+    'ButtonSetDimensions': ([ctypes.c_int, ctypes.c_int, ctypes.c_int], ctypes.c_int),
+    'ButtonHandleClick': ([ctypes.c_int, ctypes.c_int, ctypes.c_int], ctypes.c_int),
+    'ButtonHandleHover': ([ctypes.c_int, ctypes.c_int, ctypes.c_int], ctypes.c_int),
+    'ButtonHandleMouseDown': ([ctypes.c_int, ctypes.c_int, ctypes.c_int], ctypes.c_int),
+    'ButtonHandleMouseUp': ([ctypes.c_int, ctypes.c_int, ctypes.c_int], ctypes.c_int),
+    'ButtonHandleKey': ([ctypes.c_int, ctypes.c_int], ctypes.c_int),
+    'ButtonSetFocus': ([ctypes.c_int, ctypes.c_int], ctypes.c_int),
+    'ButtonGetFocused': ([], ctypes.c_int),
+    'ButtonIsEnabled': ([ctypes.c_int], ctypes.c_int),
+    'ButtonIsVisible': ([ctypes.c_int], ctypes.c_int),
+    'ButtonIsHovered': ([ctypes.c_int], ctypes.c_int),
+    'ButtonIsPressed': ([ctypes.c_int], ctypes.c_int),
+    'ButtonUpdateAll': ([ctypes.c_int, ctypes.c_int], ctypes.c_int),
+}
+
+# =================================================================
+# CHECKBOX WIDGET SYSTEM
+# =================================================================
+CHECKBOX_FUNCTIONS = {
+    'CheckBoxCreate': ([ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int], ctypes.c_int),
+    'EnhancedCheckBoxCreate': ([ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int], ctypes.c_int),
+    'DrawCheckBox': ([ctypes.c_int], ctypes.c_int),
+    'DrawEnhancedCheckBox': ([ctypes.c_int], ctypes.c_int),
+    'CheckBoxDestroy': ([ctypes.c_int], ctypes.c_int),
+    'CheckBoxSetState': ([ctypes.c_int, ctypes.c_int], ctypes.c_int),
+    'CheckBoxGetState': ([ctypes.c_int], ctypes.c_int),
+    'EnhancedCheckBoxSetState': ([ctypes.c_int, ctypes.c_int], ctypes.c_int),
+    'EnhancedCheckBoxGetState': ([ctypes.c_int], ctypes.c_int),
+    'CheckBoxSetLabel': ([ctypes.c_int, ctypes.c_char_p, ctypes.c_int], ctypes.c_int),
+    'EnhancedCheckBoxSetLabel': ([ctypes.c_int, ctypes.c_char_p, ctypes.c_int], ctypes.c_int),
+    'CheckBoxHandleClick': ([ctypes.c_int, ctypes.c_int, ctypes.c_int], ctypes.c_int),
+    'EnhancedCheckBoxHandleClick': ([ctypes.c_int, ctypes.c_int, ctypes.c_int], ctypes.c_int),
+    'CheckBoxHandleKey': ([ctypes.c_int, ctypes.c_int], ctypes.c_int),
+    'EnhancedCheckBoxHandleKey': ([ctypes.c_int, ctypes.c_int], ctypes.c_int),
+    'CheckBoxSetColors': ([ctypes.c_int] + [ctypes.c_int] * 9, ctypes.c_int),
+    'EnhancedCheckBoxSetColors': ([ctypes.c_int] + [ctypes.c_int] * 9, ctypes.c_int),
+    'CheckBoxSetSwitchColors': ([ctypes.c_int] + [ctypes.c_int] * 9, ctypes.c_int),
+    'EnhancedCheckBoxSetSwitchColors': ([ctypes.c_int] + [ctypes.c_int] * 9, ctypes.c_int),
+    'CheckBoxSetTriState': ([ctypes.c_int, ctypes.c_int], ctypes.c_int),
+    'EnhancedCheckBoxSetTriState': ([ctypes.c_int, ctypes.c_int], ctypes.c_int),
+    'CheckBoxToggle': ([ctypes.c_int], ctypes.c_int),
+    'EnhancedCheckBoxToggle': ([ctypes.c_int], ctypes.c_int),
+}
+
+# =================================================================
+# SLIDER WIDGET SYSTEM
+# =================================================================
+SLIDER_FUNCTIONS = {
+    'SliderCreate': ([ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int], ctypes.c_int),
+    'DrawSlider': ([ctypes.c_int], ctypes.c_int),
+    'SliderDestroy': ([ctypes.c_int], ctypes.c_int),
+    'SliderSetRange': ([ctypes.c_int, ctypes.c_int, ctypes.c_int], ctypes.c_int),
+    'SliderSetValue': ([ctypes.c_int, ctypes.c_int], ctypes.c_int),
+    'SliderGetValue': ([ctypes.c_int], ctypes.c_int),
+    'SliderSetStep': ([ctypes.c_int, ctypes.c_int], ctypes.c_int),
+    'SliderSetColors': ([ctypes.c_int] + [ctypes.c_int] * 9, ctypes.c_int),
+    'SliderSetProperties': ([ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int], ctypes.c_int),
+    'SliderHandleClick': ([ctypes.c_int, ctypes.c_int, ctypes.c_int], ctypes.c_int),
+    'SliderHandleHover': ([ctypes.c_int, ctypes.c_int, ctypes.c_int], ctypes.c_int),
+    'SliderHandleDrag': ([ctypes.c_int, ctypes.c_int, ctypes.c_int], ctypes.c_int),
+    'SliderHandleRelease': ([ctypes.c_int], ctypes.c_int),
+    'SliderSetFocus': ([ctypes.c_int, ctypes.c_int], ctypes.c_int),
+    'SliderGetFocused': ([], ctypes.c_int),
+    'SliderHandleKey': ([ctypes.c_int, ctypes.c_int], ctypes.c_int),
+}
+
+# =================================================================
+# PROGRESS BAR SYSTEM
+# =================================================================
+PROGRESSBAR_FUNCTIONS = {
+    'ProgressBarCreate': ([ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int], ctypes.c_int),
+    'DrawProgressBar': ([ctypes.c_int], ctypes.c_int),
+    'ProgressBarDestroy': ([ctypes.c_int], ctypes.c_int),
+    'ProgressBarSetValue': ([ctypes.c_int, ctypes.c_int], ctypes.c_int),
+    'ProgressBarGetValue': ([ctypes.c_int], ctypes.c_float),
+    'ProgressBarSetStyle': ([ctypes.c_int, ctypes.c_int], ctypes.c_int),
+    'ProgressBarSetLabel': ([ctypes.c_int, ctypes.c_char_p], ctypes.c_int),
+    'ProgressBarSetColors': ([ctypes.c_int] + [ctypes.c_int] * 8, ctypes.c_int),
+}
+
+# =================================================================
+# LABEL WIDGET SYSTEM
+# =================================================================
+LABEL_FUNCTIONS = {
+    'LabelCreate': ([ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_char_p], ctypes.c_int),
+    'DrawLabel': ([ctypes.c_int], ctypes.c_int),
+    'LabelDestroy': ([ctypes.c_int], ctypes.c_int),
+    'LabelSetText': ([ctypes.c_int, ctypes.c_char_p], ctypes.c_int),
+    'LabelSetTextStringId': ([ctypes.c_int, ctypes.c_int], ctypes.c_int),
+    'LabelSetStyle': ([ctypes.c_int, ctypes.c_int], ctypes.c_int),
+    'LabelSetVisible': ([ctypes.c_int, ctypes.c_int], ctypes.c_int),
+    'LabelIsVisible': ([ctypes.c_int], ctypes.c_int),
+}
+
+# =================================================================
+# ADDITIONAL WIDGET SYSTEMS
+# =================================================================
+ADDITIONAL_FUNCTIONS = {
+    # StatusBar
+    'StatusBarCreate': ([ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int], ctypes.c_int),
+    'StatusBarAddPanel': ([ctypes.c_int, ctypes.c_int, ctypes.c_char_p, ctypes.c_int, ctypes.c_int], ctypes.c_int),
+    'StatusBarSetPanelText': ([ctypes.c_int, ctypes.c_int, ctypes.c_char_p], ctypes.c_int),
+    'DrawStatusBar': ([ctypes.c_int], ctypes.c_int),
+    
+    # ListView
+    'ListViewCreate': ([ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int], ctypes.c_int),
+    'ListViewAddItem': ([ctypes.c_int, ctypes.c_char_p, ctypes.c_int], ctypes.c_int),
+    'ListViewClear': ([ctypes.c_int], ctypes.c_int),
+    'DrawListView': ([ctypes.c_int], ctypes.c_int),
+    
+    # ContextMenu
+    'ContextMenuCreate': ([], ctypes.c_int),
+    'ContextMenuAddItem': ([ctypes.c_int, ctypes.c_char_p, ctypes.c_char_p, ctypes.c_char_p], ctypes.c_int),
+    'ContextMenuShow': ([ctypes.c_int, ctypes.c_int, ctypes.c_int], ctypes.c_int),
+    'DrawContextMenu': ([ctypes.c_int], ctypes.c_int),
+    
+    # Editor
+    'EditorCreate': ([ctypes.c_float, ctypes.c_float, ctypes.c_float, ctypes.c_float], ctypes.c_int),
+    'EditorLoadText': ([ctypes.c_int, ctypes.c_char_p], ctypes.c_int),
+    'EditorSetLanguage': ([ctypes.c_int, ctypes.c_int], ctypes.c_int),
+    'DrawEditor': ([ctypes.c_int], ctypes.c_int),
+    
+    # TabControl
+    'TabControlCreate': ([ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int], ctypes.c_int),
+    'TabControlAddTab': ([ctypes.c_int, ctypes.c_char_p], ctypes.c_int),
+    'DrawTabControl': ([ctypes.c_int], ctypes.c_int),
+}
+
+# Combined static signature table: name -> (argtypes, restype)
+FUNCTION_SIGNATURES = {}
+for _table in (CORE_FUNCTIONS, STRING_FUNCTIONS, DRAWING_FUNCTIONS, BATCH_FUNCTIONS, TEXT_FUNCTIONS,
+               BUTTON_FUNCTIONS, CHECKBOX_FUNCTIONS, SLIDER_FUNCTIONS,
+               PROGRESSBAR_FUNCTIONS, LABEL_FUNCTIONS,
+               SYSTEM_THEME_FUNCTIONS, ADDITIONAL_FUNCTIONS):
+    FUNCTION_SIGNATURES.update(_table)
+del _table
+
+
+# =================================================================
+# RENDERING EXTENSIONS
+# Built into librendering_primitives_int_with_fonts.so (mojo-gui/c_src,
+# `make int_fonts`) rather than the widget library; each group is bound
+# from the widget library when it exports all of it, else from there
+# =================================================================
+EXTENSION_GROUPS = (
+    tuple(BATCH_FUNCTIONS),
+    ('wait_events', 'post_empty_event', 'set_swap_interval'),
+    tuple(SYSTEM_THEME_FUNCTIONS),
+)
+
+EXTENSION_LIBRARIES = (
+    'librendering_primitives_int_with_fonts.so',
+    'librendering_primitives_int_with_fonts.dylib',
+)
+
+# Directories searched for the extension library, after the working directory
+EXTENSION_DIRS = (
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'mojo-gui', 'c_src'),
+)
+
+# Set MOJOGUI_EXTENSION_LIB to the extension library's path to skip the search
+EXTENSION_ENV_VAR = 'MOJOGUI_EXTENSION_LIB'
+
+# Set MOJOGUI_LAZY_BINDINGS=1 to resolve symbols on first use instead of at startup
+LAZY_ENV_VAR = 'MOJOGUI_LAZY_BINDINGS'
+
+# Set MOJOGUI_BACKEND=headless to record calls instead of loading the C library
+BACKEND_ENV_VAR = 'MOJOGUI_BACKEND'
+BACKENDS = ('native', 'headless')
+
+# Set MOJOGUI_INSTRUMENT=1 to count and time every call across the FFI boundary
+INSTRUMENT_ENV_VAR = 'MOJOGUI_INSTRUMENT'
+
+# Symbol manifest written next to the library, e.g. libmojoguiglfw.so.manifest.json
+MANIFEST_SUFFIX = '.manifest.json'
+MANIFEST_VERSION = 1
+
+def signature_hash():
+    """Hash of the signature table, so manifests are invalidated when it changes"""
+    digest = hashlib.sha1()
+    for name in sorted(FUNCTION_SIGNATURES):
+        argtypes, restype = FUNCTION_SIGNATURES[name]
+        arg_names = ','.join(t.__name__ for t in argtypes)
+        res_name = restype.__name__ if restype is not None else 'None'
+        digest.update(f"{name}({arg_names})->{res_name};".encode('utf-8'))
+    return digest.hexdigest()
+
+def _env_flag(name):
+    """Read a boolean flag from the environment"""
+    return os.environ.get(name, '').strip().lower() in ('1', 'true', 'yes', 'on')
+
 class MojoGUIBindings:
     """Low-level ctypes bindings to MojoGUI C library"""
     
-    def __init__(self):
+    def __init__(self, lazy=False, use_manifest=True, backend='native', instrument=False):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown MojoGUI backend: {backend!r}")
+        self.profiler = FFIProfiler() if instrument else None
         self.lib = None
+        self.lib_path = None
+        self.extension_lib = None
+        self.extension_path = None
+        self._routes = {}   # name -> library other than self.lib that provides it
+        self.backend = backend
+        self.lazy = lazy
+        self.use_manifest = use_manifest
         self.functions = {}
+        self._missing = set()
         self._load_library()
-        self._setup_all_bindings()
+        self._load_extension()
+        
+        available = self._load_manifest() if self.use_manifest else None
+        if available is not None:
+            # Known symbol set: never probe names the library does not export
+            self._missing = set(FUNCTION_SIGNATURES) - available
+        
+        if not self.lazy:
+            self._setup_all_bindings(available)
     
     def _load_library(self):
         """Load the MojoGUI library"""
+        if self.backend == 'headless':
+            self.lib = HeadlessLibrary(FUNCTION_SIGNATURES)
+            print("✅ Loaded MojoGUI headless backend")
+            return
+        
         lib_names = [
             './libmojoguiglfw.so',
             './libmojoguiglfw.dylib', 
@@ -29,6 +396,7 @@ class MojoGUIBindings:
             if os.path.exists(name):
                 try:
                     self.lib = ctypes.CDLL(name)
+                    self.lib_path = name
                     print(f"✅ Loaded MojoGUI library: {name}")
                     return
                 except Exception as e:
@@ -37,318 +405,285 @@ class MojoGUIBindings:
         
         raise RuntimeError("❌ Could not load MojoGUI library!")
     
-    def _setup_function(self, name, argtypes, restype):
-        """Set up a single function binding"""
-        if hasattr(self.lib, name):
-            func = getattr(self.lib, name)
-            func.argtypes = argtypes
-            func.restype = restype
-            self.functions[name] = func
-            return True
-        return False
+    def _extension_candidates(self):
+        """Paths the extension library is looked for at, in order"""
+        override = os.environ.get(EXTENSION_ENV_VAR, '').strip()
+        if override:
+            return [override]
+        return [os.path.join(directory, name)
+                for directory in ('.',) + EXTENSION_DIRS
+                for name in EXTENSION_LIBRARIES]
     
-    def _setup_all_bindings(self):
-        """Set up all function bindings"""
+    def _load_extension(self):
+        """Load the rendering extension library and route the groups the widget library lacks"""
+        if self.backend == 'headless':
+            return
+        groups = [group for group in EXTENSION_GROUPS
+                  if not all(hasattr(self.lib, name) for name in group)]
+        if not groups:
+            return
         
-        # =================================================================
-        # CORE WINDOW SYSTEM
-        # =================================================================
-        core_functions = {
-            'WinInit_impl': ([], ctypes.c_int),
-            'WinInit': ([], ctypes.c_int),
-            'WinSetSize_impl': ([ctypes.c_int, ctypes.c_int], ctypes.c_int),
-            'WinSetSize': ([ctypes.c_int, ctypes.c_int], ctypes.c_int),
-            'WinCreate_impl': ([], ctypes.c_int),
-            'WinCreate': ([], ctypes.c_int),
-            'WinDestroy_impl': ([ctypes.c_int], ctypes.c_int),
-            'WinDestroy': ([ctypes.c_int], ctypes.c_int),
-            'WinSetTitle_impl': ([ctypes.c_int], ctypes.c_int),
-            'WinSetTitle': ([ctypes.c_int], ctypes.c_int),
-            'FrameBegin_impl': ([], ctypes.c_int),
-            'FrameBegin': ([], ctypes.c_int),
-            'FrameEnd_impl': ([], ctypes.c_int),
-            'FrameEnd': ([], ctypes.c_int),
-            'EventPoll_impl': ([], ctypes.c_int),
-            'EventPoll': ([], ctypes.c_int),
-        }
+        for name in self._extension_candidates():
+            if not os.path.exists(name):
+                continue
+            try:
+                lib = ctypes.CDLL(name)
+            except OSError as e:
+                print(f"⚠️  Failed to load {name}: {e}")
+                continue
+            self.extension_lib = lib
+            self.extension_path = name
+            break
+        else:
+            return
         
-        # =================================================================
-        # STRING SYSTEM
-        # =================================================================
-        string_functions = {
-            'StringSet_impl': ([ctypes.c_int, ctypes.c_char_p], ctypes.c_int),
-            'StringSet': ([ctypes.c_int, ctypes.c_char_p], ctypes.c_int),
-            'AllocTempString': ([], ctypes.c_int),
-            'StrClear': ([ctypes.c_int], ctypes.c_int),
-            'StrRegister': ([ctypes.c_int, ctypes.c_int, ctypes.c_int], ctypes.c_int),
-            'StrFromInt': ([ctypes.c_int, ctypes.c_int], ctypes.c_int),
-            'StrFromFloat': ([ctypes.c_float, ctypes.c_int, ctypes.c_int], ctypes.c_int),
-            'StrConcat': ([ctypes.c_int, ctypes.c_int], ctypes.c_int),
-        }
-        
-        # =================================================================
-        # DRAWING SYSTEM
-        # =================================================================
-        drawing_functions = {
-            'DrawSetColor_impl': ([ctypes.c_float, ctypes.c_float, ctypes.c_float, ctypes.c_float], ctypes.c_int),
-            'DrawSetColor': ([ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int], ctypes.c_int),
-            'DrawSetPos_impl': ([ctypes.c_float, ctypes.c_float], ctypes.c_int),
-            'DrawSetPos': ([ctypes.c_int, ctypes.c_int], ctypes.c_int),
-            'DrawRect_impl': ([ctypes.c_float, ctypes.c_float], ctypes.c_int),
-            'DrawRect': ([ctypes.c_int, ctypes.c_int], ctypes.c_int),
-            'DrawRoundedRect_impl': ([ctypes.c_float, ctypes.c_float, ctypes.c_float], ctypes.c_int),
-            'DrawRoundedRect': ([ctypes.c_int, ctypes.c_int, ctypes.c_int], ctypes.c_int),
-            'DrawCircle_impl': ([ctypes.c_float, ctypes.c_int], ctypes.c_int),
-            'DrawCircle': ([ctypes.c_int, ctypes.c_int], ctypes.c_int),
-            'DrawGradientRect_impl': ([
-                ctypes.c_float, ctypes.c_float,  # width, height
-                ctypes.c_float, ctypes.c_float, ctypes.c_float, ctypes.c_float,  # color1
-                ctypes.c_float, ctypes.c_float, ctypes.c_float, ctypes.c_float   # color2
-            ], ctypes.c_int),
-            'DrawGradientRect': ([
-                ctypes.c_int, ctypes.c_int,  # width, height
-                ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int,  # color1
-                ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int   # color2
-            ], ctypes.c_int),
-            'DrawLine_impl': ([ctypes.c_float, ctypes.c_float, ctypes.c_float, ctypes.c_float], ctypes.c_int),
-            'DrawLine': ([ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int], ctypes.c_int),
-            'DrawShadow_impl': ([ctypes.c_float, ctypes.c_float, ctypes.c_float, ctypes.c_float, ctypes.c_float], ctypes.c_int),
-            'DrawTriangle_impl': ([ctypes.c_float, ctypes.c_float, ctypes.c_float, ctypes.c_float, ctypes.c_float, ctypes.c_float], ctypes.c_int),
-            'DrawRectOutline_impl': ([ctypes.c_float, ctypes.c_float, ctypes.c_float], ctypes.c_int),
-        }
-        
-        # =================================================================
-        # TEXT AND FONT SYSTEM
-        # =================================================================
-        text_functions = {
-            'FontLoadTTF_impl': ([ctypes.c_int, ctypes.c_int, ctypes.c_float], ctypes.c_int),
-            'FontLoadTTF': ([ctypes.c_int, ctypes.c_int, ctypes.c_float], ctypes.c_int),
-            'FontSetActive_impl': ([ctypes.c_int], ctypes.c_int),
-            'FontSetActive': ([ctypes.c_int], ctypes.c_int),
-            'FontSetColors_impl': ([ctypes.c_float, ctypes.c_float, ctypes.c_float, ctypes.c_float,
-                                   ctypes.c_float, ctypes.c_float, ctypes.c_float, ctypes.c_float], ctypes.c_int),
-            'TextDraw_impl': ([ctypes.c_int], ctypes.c_int),
-            'TextDraw': ([ctypes.c_int, ctypes.c_int], ctypes.c_int),
-            'TextDrawScaled_impl': ([ctypes.c_int, ctypes.c_float], ctypes.c_int),
-            'TextGetWidth_impl': ([ctypes.c_int, ctypes.c_int, ctypes.c_int], ctypes.c_int),
-            'TextGetHeight_impl': ([ctypes.c_int], ctypes.c_int),
-            'GetTextWidth_impl': ([ctypes.c_int, ctypes.c_int], ctypes.c_int),
-            'LoadDefaultFont': ([], ctypes.c_int),
-            'LoadTrueTypeFont': ([ctypes.c_char_p, ctypes.c_float], ctypes.c_int),
-            'TextGetLineHeight': ([], ctypes.c_int),
-            'TextGetCharWidth': ([ctypes.c_int], ctypes.c_int),
-        }
-        
-        # =================================================================
-        # BUTTON WIDGET SYSTEM
-        # =================================================================
-        button_functions = {
-            'ButtonCreate': ([ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_char_p], ctypes.c_int),
-            'ButtonDestroy': ([ctypes.c_int], ctypes.c_int),
-            'DrawButton': ([ctypes.c_int], ctypes.c_int),
-            'ButtonSetText': ([ctypes.c_int, ctypes.c_char_p], ctypes.c_int),
-            'ButtonSetTextStringId': ([ctypes.c_int, ctypes.c_int], ctypes.c_int),
-            'ButtonSetIcon': ([ctypes.c_int, ctypes.c_char_p, ctypes.c_int], ctypes.c_int),
-            'ButtonSetStyle': ([ctypes.c_int, ctypes.c_int], ctypes.c_int),
-            'ButtonSetSize': ([ctypes.c_int, ctypes.c_int], ctypes.c_int),
-            'ButtonSetEnabled': ([ctypes.c_int, ctypes.c_int], ctypes.c_int),
-            'ButtonSetVisible': ([ctypes.c_int, ctypes.c_int], ctypes.c_int),
-            'ButtonSetToggleMode': ([ctypes.c_int, ctypes.c_int], ctypes.c_int),
-            'ButtonSetToggled': ([ctypes.c_int, ctypes.c_int], ctypes.c_int),
-            'ButtonGetToggled': ([ctypes.c_int], ctypes.c_int),
-            'ButtonSetCornerRadius': ([ctypes.c_int, ctypes.c_float], ctypes.c_int),
-            'ButtonSetColors': ([ctypes.c_int] + [ctypes.c_int] * 8, ctypes.c_int),
-            'ButtonSetHoverColors': ([ctypes.c_int] + [ctypes.c_int] * 8, ctypes.c_int),
-            'ButtonSetPressedColors': ([ctypes.c_int] + [ctypes.c_int] * 8, ctypes.c_int),
-            'ButtonSetBorderColors': ([ctypes.c_int] + [ctypes.c_int] * 8, ctypes.c_int),
-            'ButtonSetPosition': ([ctypes.c_int, ctypes.c_int, ctypes.c_int], ctypes.c_int),
-            'ButtonSetDimensions': ([ctypes.c_int, ctypes.c_int, ctypes.c_int], ctypes.c_int),
-            'ButtonHandleClick': ([ctypes.c_int, ctypes.c_int, ctypes.c_int], ctypes.c_int),
-            'ButtonHandleHover': ([ctypes.c_int, ctypes.c_int, ctypes.c_int], ctypes.c_int),
-            'ButtonHandleMouseDown': ([ctypes.c_int, ctypes.c_int, ctypes.c_int], ctypes.c_int),
-            'ButtonHandleMouseUp': ([ctypes.c_int, ctypes.c_int, ctypes.c_int], ctypes.c_int),
-            'ButtonHandleKey': ([ctypes.c_int, ctypes.c_int], ctypes.c_int),
-            'ButtonSetFocus': ([ctypes.c_int, ctypes.c_int], ctypes.c_int),
-            'ButtonGetFocused': ([], ctypes.c_int),
-            'ButtonIsEnabled': ([ctypes.c_int], ctypes.c_int),
-            'ButtonIsVisible': ([ctypes.c_int], ctypes.c_int),
-            'ButtonIsHovered': ([ctypes.c_int], ctypes.c_int),
-            'ButtonIsPressed': ([ctypes.c_int], ctypes.c_int),
-            'ButtonUpdateAll': ([ctypes.c_int, ctypes.c_int], ctypes.c_int),
-        }
-        
-        # =================================================================
-        # CHECKBOX WIDGET SYSTEM
-        # =================================================================
-        checkbox_functions = {
-            'CheckBoxCreate': ([ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int], ctypes.c_int),
-            'EnhancedCheckBoxCreate': ([ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int], ctypes.c_int),
-            'DrawCheckBox': ([ctypes.c_int], ctypes.c_int),
-            'DrawEnhancedCheckBox': ([ctypes.c_int], ctypes.c_int),
-            'CheckBoxDestroy': ([ctypes.c_int], ctypes.c_int),
-            'CheckBoxSetState': ([ctypes.c_int, ctypes.c_int], ctypes.c_int),
-            'CheckBoxGetState': ([ctypes.c_int], ctypes.c_int),
-            'EnhancedCheckBoxSetState': ([ctypes.c_int, ctypes.c_int], ctypes.c_int),
-            'EnhancedCheckBoxGetState': ([ctypes.c_int], ctypes.c_int),
-            'CheckBoxSetLabel': ([ctypes.c_int, ctypes.c_char_p, ctypes.c_int], ctypes.c_int),
-            'EnhancedCheckBoxSetLabel': ([ctypes.c_int, ctypes.c_char_p, ctypes.c_int], ctypes.c_int),
-            'CheckBoxHandleClick': ([ctypes.c_int, ctypes.c_int, ctypes.c_int], ctypes.c_int),
-            'EnhancedCheckBoxHandleClick': ([ctypes.c_int, ctypes.c_int, ctypes.c_int], ctypes.c_int),
-            'CheckBoxHandleKey': ([ctypes.c_int, ctypes.c_int], ctypes.c_int),
-            'EnhancedCheckBoxHandleKey': ([ctypes.c_int, ctypes.c_int], ctypes.c_int),
-            'CheckBoxSetColors': ([ctypes.c_int] + [ctypes.c_int] * 9, ctypes.c_int),
-            'EnhancedCheckBoxSetColors': ([ctypes.c_int] + [ctypes.c_int] * 9, ctypes.c_int),
-            'CheckBoxSetSwitchColors': ([ctypes.c_int] + [ctypes.c_int] * 9, ctypes.c_int),
-            'EnhancedCheckBoxSetSwitchColors': ([ctypes.c_int] + [ctypes.c_int] * 9, ctypes.c_int),
-            'CheckBoxSetTriState': ([ctypes.c_int, ctypes.c_int], ctypes.c_int),
-            'EnhancedCheckBoxSetTriState': ([ctypes.c_int, ctypes.c_int], ctypes.c_int),
-            'CheckBoxToggle': ([ctypes.c_int], ctypes.c_int),
-            'EnhancedCheckBoxToggle': ([ctypes.c_int], ctypes.c_int),
-        }
-        
-        # =================================================================
-        # SLIDER WIDGET SYSTEM
-        # =================================================================
-        slider_functions = {
-            'SliderCreate': ([ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int], ctypes.c_int),
-            'DrawSlider': ([ctypes.c_int], ctypes.c_int),
-            'SliderDestroy': ([ctypes.c_int], ctypes.c_int),
-            'SliderSetRange': ([ctypes.c_int, ctypes.c_int, ctypes.c_int], ctypes.c_int),
-            'SliderSetValue': ([ctypes.c_int, ctypes.c_int], ctypes.c_int),
-            'SliderGetValue': ([ctypes.c_int], ctypes.c_int),
-            'SliderSetStep': ([ctypes.c_int, ctypes.c_int], ctypes.c_int),
-            'SliderSetColors': ([ctypes.c_int] + [ctypes.c_int] * 9, ctypes.c_int),
-            'SliderSetProperties': ([ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int], ctypes.c_int),
-            'SliderHandleClick': ([ctypes.c_int, ctypes.c_int, ctypes.c_int], ctypes.c_int),
-            'SliderHandleHover': ([ctypes.c_int, ctypes.c_int, ctypes.c_int], ctypes.c_int),
-            'SliderHandleDrag': ([ctypes.c_int, ctypes.c_int, ctypes.c_int], ctypes.c_int),
-            'SliderHandleRelease': ([ctypes.c_int], ctypes.c_int),
-            'SliderSetFocus': ([ctypes.c_int, ctypes.c_int], ctypes.c_int),
-            'SliderGetFocused': ([], ctypes.c_int),
-            'SliderHandleKey': ([ctypes.c_int, ctypes.c_int], ctypes.c_int),
-        }
-        
-        # =================================================================
-        # PROGRESS BAR SYSTEM
-        # =================================================================
-        progressbar_functions = {
-            'ProgressBarCreate': ([ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int], ctypes.c_int),
-            'DrawProgressBar': ([ctypes.c_int], ctypes.c_int),
-            'ProgressBarDestroy': ([ctypes.c_int], ctypes.c_int),
-            'ProgressBarSetValue': ([ctypes.c_int, ctypes.c_int], ctypes.c_int),
-            'ProgressBarGetValue': ([ctypes.c_int], ctypes.c_float),
-            'ProgressBarSetStyle': ([ctypes.c_int, ctypes.c_int], ctypes.c_int),
-            'ProgressBarSetLabel': ([ctypes.c_int, ctypes.c_char_p], ctypes.c_int),
-            'ProgressBarSetColors': ([ctypes.c_int] + [ctypes.c_int] * 8, ctypes.c_int),
+        for group in groups:
+            if all(hasattr(self.extension_lib, name) for name in group):
+                for name in group:
+                    self._routes[name] = self.extension_lib
+        print(f"✅ Loaded MojoGUI rendering extensions: {self.extension_path} "
+              f"({len(self._routes)} functions)")
+    
+    def _library_for(self, name):
+        """The loaded library a function is bound from"""
+        return self._routes.get(name, self.lib)
+    
+    @staticmethod
+    def _file_identity(path):
+        """Identify a library file by path, size and mtime"""
+        if not path:
+            return None
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return {
+            'path': os.path.realpath(path),
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
         }
+    
+    def _library_identity(self):
+        """Identify the loaded library files, so rebuilding either invalidates the manifest"""
+        identity = self._file_identity(self.lib_path)
+        if identity is not None and self.extension_path:
+            identity['extension'] = self._file_identity(self.extension_path)
+        return identity
+    
+    def _manifest_path(self):
+        """Path of the symbol manifest for the loaded library"""
+        return self.lib_path + MANIFEST_SUFFIX if self.lib_path else None
+    
+    def _load_manifest(self):
+        """Load the set of available symbols if the manifest matches the library"""
+        path = self._manifest_path()
+        identity = self._library_identity()
+        if path is None or identity is None:
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
         
-        # =================================================================
-        # LABEL WIDGET SYSTEM
-        # =================================================================
-        label_functions = {
-            'LabelCreate': ([ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_char_p], ctypes.c_int),
-            'DrawLabel': ([ctypes.c_int], ctypes.c_int),
-            'LabelDestroy': ([ctypes.c_int], ctypes.c_int),
-            'LabelSetText': ([ctypes.c_int, ctypes.c_char_p], ctypes.c_int),
-            'LabelSetTextStringId': ([ctypes.c_int, ctypes.c_int], ctypes.c_int),
-            'LabelSetStyle': ([ctypes.c_int, ctypes.c_int], ctypes.c_int),
-            'LabelSetVisible': ([ctypes.c_int, ctypes.c_int], ctypes.c_int),
-            'LabelIsVisible': ([ctypes.c_int], ctypes.c_int),
-        }
+        if (not isinstance(manifest, dict) or
+                manifest.get('version') != MANIFEST_VERSION or
+                manifest.get('library') != identity or
+                manifest.get('signature_hash') != signature_hash()):
+            return None
         
-        # =================================================================
-        # ADDITIONAL WIDGET SYSTEMS
-        # =================================================================
-        additional_functions = {
-            # StatusBar
-            'StatusBarCreate': ([ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int], ctypes.c_int),
-            'StatusBarAddPanel': ([ctypes.c_int, ctypes.c_int, ctypes.c_char_p, ctypes.c_int, ctypes.c_int], ctypes.c_int),
-            'StatusBarSetPanelText': ([ctypes.c_int, ctypes.c_int, ctypes.c_char_p], ctypes.c_int),
-            'DrawStatusBar': ([ctypes.c_int], ctypes.c_int),
-            
-            # ListView
-            'ListViewCreate': ([ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int], ctypes.c_int),
-            'ListViewAddItem': ([ctypes.c_int, ctypes.c_char_p, ctypes.c_int], ctypes.c_int),
-            'ListViewClear': ([ctypes.c_int], ctypes.c_int),
-            'DrawListView': ([ctypes.c_int], ctypes.c_int),
-            
-            # ContextMenu
-            'ContextMenuCreate': ([], ctypes.c_int),
-            'ContextMenuAddItem': ([ctypes.c_int, ctypes.c_char_p, ctypes.c_char_p, ctypes.c_char_p], ctypes.c_int),
-            'ContextMenuShow': ([ctypes.c_int, ctypes.c_int, ctypes.c_int], ctypes.c_int),
-            'DrawContextMenu': ([ctypes.c_int], ctypes.c_int),
-            
-            # Editor
-            'EditorCreate': ([ctypes.c_float, ctypes.c_float, ctypes.c_float, ctypes.c_float], ctypes.c_int),
-            'EditorLoadText': ([ctypes.c_int, ctypes.c_char_p], ctypes.c_int),
-            'EditorSetLanguage': ([ctypes.c_int, ctypes.c_int], ctypes.c_int),
-            'DrawEditor': ([ctypes.c_int], ctypes.c_int),
-            
-            # TabControl
-            'TabControlCreate': ([ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int], ctypes.c_int),
-            'TabControlAddTab': ([ctypes.c_int, ctypes.c_char_p], ctypes.c_int),
-            'DrawTabControl': ([ctypes.c_int], ctypes.c_int),
+        symbols = manifest.get('symbols')
+        if not isinstance(symbols, list):
+            return None
+        return set(symbols)
+    
+    def _write_manifest(self):
+        """Record the available symbols next to the library (best effort)"""
+        path = self._manifest_path()
+        identity = self._library_identity()
+        if path is None or identity is None:
+            return False
+        manifest = {
+            'version': MANIFEST_VERSION,
+            'library': identity,
+            'signature_hash': signature_hash(),
+            'symbols': sorted(self.functions),
         }
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, indent=1)
+            os.replace(tmp_path, path)
+            return True
+        except OSError:
+            # Read-only deployments simply keep probing on start
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return False
+    
+    def _store_function(self, name, func):
+        """Register a typed function, wrapped for instrumentation if enabled"""
+        if self.profiler is not None:
+            func = self.profiler.wrap(name, func)
+        self.functions[name] = func
+    
+    def _setup_function(self, name, argtypes, restype):
+        """Set up a single function binding"""
+        lib = self._library_for(name)
+        if hasattr(lib, name):
+            func = getattr(lib, name)
+            func.argtypes = argtypes
+            func.restype = restype
+            self._store_function(name, func)
+            return True
+        self._missing.add(name)
+        return False
+    
+    def _resolve_function(self, name):
+        """Resolve and type a single function from the signature table (lazy mode)"""
+        if name in self._missing:
+            return None
+        signature = FUNCTION_SIGNATURES.get(name)
+        if signature is None:
+            return None
+        argtypes, restype = signature
+        self._setup_function(name, argtypes, restype)
+        return self.functions.get(name)
+    
+    def _resolve_all(self):
+        """Resolve every function that has not been looked up yet"""
+        for name in FUNCTION_SIGNATURES:
+            if name not in self.functions and name not in self._missing:
+                self._resolve_function(name)
+    
+    def _bind_known_function(self, name, argtypes, restype):
+        """Bind a symbol the manifest lists as present, without probing"""
+        try:
+            func = getattr(self._library_for(name), name)
+        except AttributeError:
+            return False
+        func.argtypes = argtypes
+        func.restype = restype
+        self._store_function(name, func)
+        return True
+    
+    def _setup_all_bindings(self, available=None):
+        """Set up all function bindings
         
-        # Combine all function dictionaries
-        all_functions = {}
-        all_functions.update(core_functions)
-        all_functions.update(string_functions)
-        all_functions.update(drawing_functions)
-        all_functions.update(text_functions)
-        all_functions.update(button_functions)
-        all_functions.update(checkbox_functions)
-        all_functions.update(slider_functions)
-        all_functions.update(progressbar_functions)
-        all_functions.update(label_functions)
-        all_functions.update(additional_functions)
-        
-        # Set up all bindings
+        available is the symbol set from a valid manifest; when given, only
+        those names are bound and the rest are recorded as missing.
+        """
         bound_count = 0
         missing_count = 0
         
-        for func_name, (argtypes, restype) in all_functions.items():
-            if self._setup_function(func_name, argtypes, restype):
+        for func_name, (argtypes, restype) in FUNCTION_SIGNATURES.items():
+            if available is not None:
+                bound = (func_name in available and
+                         self._bind_known_function(func_name, argtypes, restype))
+            else:
+                bound = self._setup_function(func_name, argtypes, restype)
+            if bound:
                 bound_count += 1
             else:
+                self._missing.add(func_name)
                 missing_count += 1
         
+        if available is None and self.use_manifest:
+            self._write_manifest()
+        
         print(f"✅ Bound {bound_count} functions")
         print(f"⚠️  Missing {missing_count} functions")
-        print(f"📊 Total function signatures: {len(all_functions)}")
+        print(f"📊 Total function signatures: {len(FUNCTION_SIGNATURES)}")
     
     def get_function(self, name):
         """Get a bound function by name"""
-        return self.functions.get(name)
+        func = self.functions.get(name)
+        if func is None and self.lazy:
+            func = self._resolve_function(name)
+        return func
     
     def has_function(self, name):
         """Check if a function is available"""
-        return name in self.functions
+        return self.get_function(name) is not None
     
     def list_available_functions(self):
         """List all available functions"""
+        if self.lazy:
+            self._resolve_all()
         return list(self.functions.keys())
     
     def list_missing_functions(self, category=None):
         """List functions that are defined but not available in library"""
-        # This would compare against the full function list
-        pass
+        if self.lazy:
+            self._resolve_all()
+        missing = [name for name in FUNCTION_SIGNATURES if name in self._missing]
+        if category:
+            missing = [name for name in missing if category.lower() in name.lower()]
+        return missing
+    
+    # =================================================================
+    # INSTRUMENTATION
+    # =================================================================
+    
+    def get_call_stats(self, name=None):
+        """Per-function call statistics (requires instrument=True)
+        
+        Returns the summary for one function, or a dict of summaries for
+        every function called so far; None when instrumentation is off.
+        """
+        if self.profiler is None:
+            return None
+        return self.profiler.get_stats(name)
+    
+    def top_functions(self, n=10, key='total_time'):
+        """The n functions with the highest total_time, count, p99_time, ..."""
+        if self.profiler is None:
+            return []
+        return self.profiler.top(n, key)
+    
+    def dump_call_stats(self, path):
+        """Write call statistics to a JSON file"""
+        if self.profiler is None:
+            raise RuntimeError("Instrumentation is not enabled for these bindings")
+        return self.profiler.dump_json(path)
+    
+    def reset_call_stats(self):
+        """Zero all call statistics"""
+        if self.profiler is not None:
+            self.profiler.reset()
 
 # Global instance
 _bindings = None
 
-def get_bindings():
-    """Get the global bindings instance"""
+def get_bindings(lazy=None, backend=None, instrument=None):
+    """Get the global bindings instance
+    
+    lazy, backend and instrument only apply when the instance is first
+    created; when None they are taken from the MOJOGUI_LAZY_BINDINGS,
+    MOJOGUI_BACKEND and MOJOGUI_INSTRUMENT environment variables.
+    """
     global _bindings
     if _bindings is None:
-        _bindings = MojoGUIBindings()
+        if lazy is None:
+            lazy = _env_flag(LAZY_ENV_VAR)
+        if backend is None:
+            backend = os.environ.get(BACKEND_ENV_VAR, '').strip().lower() or 'native'
+        if instrument is None:
+            instrument = _env_flag(INSTRUMENT_ENV_VAR)
+        _bindings = MojoGUIBindings(lazy=lazy, backend=backend, instrument=instrument)
     return _bindings
 
-def reload_bindings():
-    """Reload the bindings (useful after library recompilation)"""
+def reload_bindings(lazy=None, backend=None, instrument=None):
+    """Reload the bindings (useful after library recompilation)
+    
+    A recompiled library has a new size/mtime, so its stale manifest is
+    ignored and rewritten.
+    """
     global _bindings
     _bindings = None
-    return get_bindings()
+    return get_bindings(lazy, backend, instrument)
 
 if __name__ == "__main__":
     print("🔗 MojoGUI Low-Level Bindings")
@@ -2,532 +2,227 @@
 """
 Mid-Level MojoGUI Wrappers
 Clean Python functions that call the low-level ctypes bindings
+
+The plain pass-through wrappers are generated from WRAPPER_SPECS and the
+low-level signature table: each generated method holds its resolved ctypes
+function directly and inlines the int()/float()/UTF-8 coercions, so a call
+costs one Python frame plus the FFI call.
+
+get_wrappers() is the checked instance every widget module shares. Hot
+drawing code that already passes ctypes-ready values can take the separate
+get_wrappers(unchecked=True) instance, whose wrappers skip the coercions.
 """
 
 import ctypes
 try:
-    from .low_level_bindings import get_bindings
+    from .low_level_bindings import get_bindings, FUNCTION_SIGNATURES
 except ImportError:
-    from low_level_bindings import get_bindings
+    from low_level_bindings import get_bindings, FUNCTION_SIGNATURES
 
-class MojoGUIWrappers:
-    """Mid-level wrapper functions for MojoGUI"""
-    
-    def __init__(self):
-        self.bindings = get_bindings()
-    
-    # =================================================================
+# =================================================================
+# GENERATED WRAPPER TABLE
+# method name: (C symbol, parameters, value returned when the symbol
+#               is missing, docstring)
+# =================================================================
+WRAPPER_SPECS = {
     # CORE WINDOW SYSTEM
-    # =================================================================
-    
-    def win_init(self):
-        """Initialize the window system"""
-        func = self.bindings.get_function('WinInit_impl')
-        if func:
-            return func()
-        return -1
-    
-    def win_set_size(self, width, height):
-        """Set window size"""
-        func = self.bindings.get_function('WinSetSize_impl')
-        if func:
-            return func(int(width), int(height))
-        return -1
-    
-    def win_create(self):
-        """Create a window"""
-        func = self.bindings.get_function('WinCreate_impl')
-        if func:
-            return func()
-        return -1
-    
-    def win_destroy(self, window_id=0):
-        """Destroy a window"""
-        func = self.bindings.get_function('WinDestroy_impl')
-        if func:
-            return func(int(window_id))
-        return -1
-    
-    def win_set_title(self, title_string_id):
-        """Set window title using string ID"""
-        func = self.bindings.get_function('WinSetTitle_impl')
-        if func:
-            return func(int(title_string_id))
-        return -1
-    
-    def frame_begin(self):
-        """Begin frame rendering"""
-        func = self.bindings.get_function('FrameBegin_impl')
-        if func:
-            return func()
-        return -1
-    
-    def frame_end(self):
-        """End frame rendering"""
-        func = self.bindings.get_function('FrameEnd_impl')
-        if func:
-            return func()
-        return -1
-    
-    def event_poll(self):
-        """Poll for events"""
-        func = self.bindings.get_function('EventPoll_impl')
-        if func:
-            return func()
-        return -1
-    
-    # =================================================================
+    'win_init': ('WinInit_impl', '', -1, 'Initialize the window system'),
+    'win_set_size': ('WinSetSize_impl', 'width, height', -1, 'Set window size'),
+    'win_create': ('WinCreate_impl', '', -1, 'Create a window'),
+    'win_destroy': ('WinDestroy_impl', 'window_id=0', -1, 'Destroy a window'),
+    'win_set_title': ('WinSetTitle_impl', 'title_string_id', -1, 'Set window title using string ID'),
+    'frame_begin': ('FrameBegin_impl', '', -1, 'Begin frame rendering'),
+    'frame_end': ('FrameEnd_impl', '', -1, 'End frame rendering'),
+    'event_poll': ('EventPoll_impl', '', -1, 'Poll for events'),
+    'wait_events': ('wait_events', 'timeout_ms=-1', -1, 'Block until events arrive; returns the number processed'),
+    'post_empty_event': ('post_empty_event', '', -1, 'Wake a blocked wait_events() from any thread'),
+    'set_swap_interval': ('set_swap_interval', 'interval', -1, 'Set the buffer swap interval (1 = vsync)'),
+
     # STRING SYSTEM
-    # =================================================================
-    
-    def string_set(self, string_id, text):
-        """Set string content"""
-        func = self.bindings.get_function('StringSet_impl')
-        if func:
-            text_bytes = text.encode('utf-8') if isinstance(text, str) else text
-            return func(int(string_id), text_bytes)
-        return -1
-    
-    def alloc_temp_string(self):
-        """Allocate temporary string"""
-        func = self.bindings.get_function('AllocTempString')
-        if func:
-            return func()
-        return -1
-    
-    def str_clear(self, string_id):
-        """Clear string"""
-        func = self.bindings.get_function('StrClear')
-        if func:
-            return func(int(string_id))
-        return -1
-    
-    def str_from_int(self, value, string_id):
-        """Convert integer to string"""
-        func = self.bindings.get_function('StrFromInt')
-        if func:
-            return func(int(value), int(string_id))
-        return -1
-    
-    def str_from_float(self, value, decimals, string_id):
-        """Convert float to string"""
-        func = self.bindings.get_function('StrFromFloat')
-        if func:
-            return func(float(value), int(decimals), int(string_id))
-        return -1
-    
-    # =================================================================
+    'string_set': ('StringSet_impl', 'string_id, text', -1, 'Set string content'),
+    'alloc_temp_string': ('AllocTempString', '', -1, 'Allocate temporary string'),
+    'str_clear': ('StrClear', 'string_id', -1, 'Clear string'),
+    'str_from_int': ('StrFromInt', 'value, string_id', -1, 'Convert integer to string'),
+    'str_from_float': ('StrFromFloat', 'value, decimals, string_id', -1, 'Convert float to string'),
+
     # DRAWING SYSTEM
-    # =================================================================
-    
-    def draw_set_color(self, r, g, b, a=1.0):
-        """Set drawing color (RGBA values 0.0-1.0)"""
-        func = self.bindings.get_function('DrawSetColor_impl')
-        if func:
-            return func(float(r), float(g), float(b), float(a))
-        return -1
-    
-    def draw_set_color_int(self, r, g, b, a=255):
-        """Set drawing color (RGBA values 0-255)"""
-        func = self.bindings.get_function('DrawSetColor')
-        if func:
-            return func(int(r), int(g), int(b), int(a))
-        return -1
-    
-    def draw_set_pos(self, x, y):
-        """Set drawing position"""
-        func = self.bindings.get_function('DrawSetPos_impl')
-        if func:
-            return func(float(x), float(y))
-        return -1
-    
-    def draw_rect(self, width, height):
-        """Draw rectangle at current position"""
-        func = self.bindings.get_function('DrawRect_impl')
-        if func:
-            return func(float(width), float(height))
-        return -1
-    
-    def draw_rounded_rect(self, width, height, radius):
-        """Draw rounded rectangle"""
-        func = self.bindings.get_function('DrawRoundedRect_impl')
-        if func:
-            return func(float(width), float(height), float(radius))
-        return -1
-    
-    def draw_circle(self, radius, segments=32):
-        """Draw circle at current position"""
-        func = self.bindings.get_function('DrawCircle_impl')
-        if func:
-            return func(float(radius), int(segments))
-        return -1
-    
-    def draw_gradient_rect(self, width, height, r1, g1, b1, a1, r2, g2, b2, a2):
-        """Draw gradient rectangle"""
-        func = self.bindings.get_function('DrawGradientRect_impl')
-        if func:
-            return func(float(width), float(height), 
-                       float(r1), float(g1), float(b1), float(a1),
-                       float(r2), float(g2), float(b2), float(a2))
-        return -1
-    
-    def draw_line(self, x1, y1, x2, y2):
-        """Draw line from (x1,y1) to (x2,y2)"""
-        func = self.bindings.get_function('DrawLine_impl')
-        if func:
-            return func(float(x1), float(y1), float(x2), float(y2))
-        return -1
-    
-    def draw_shadow(self, width, height, blur, offset_x, offset_y):
-        """Draw shadow effect"""
-        func = self.bindings.get_function('DrawShadow_impl')
-        if func:
-            return func(float(width), float(height), float(blur), 
-                       float(offset_x), float(offset_y))
-        return -1
-    
-    def draw_triangle(self, x1, y1, x2, y2, x3, y3):
-        """Draw triangle"""
-        func = self.bindings.get_function('DrawTriangle_impl')
-        if func:
-            return func(float(x1), float(y1), float(x2), float(y2), float(x3), float(y3))
-        return -1
-    
-    def draw_rect_outline(self, width, height, thickness):
-        """Draw rectangle outline"""
-        func = self.bindings.get_function('DrawRectOutline_impl')
-        if func:
-            return func(float(width), float(height), float(thickness))
-        return -1
-    
-    # =================================================================
+    'draw_set_color': ('DrawSetColor_impl', 'r, g, b, a=1.0', -1, 'Set drawing color (RGBA values 0.0-1.0)'),
+    'draw_set_color_int': ('DrawSetColor', 'r, g, b, a=255', -1, 'Set drawing color (RGBA values 0-255)'),
+    'draw_set_pos': ('DrawSetPos_impl', 'x, y', -1, 'Set drawing position'),
+    'draw_rect': ('DrawRect_impl', 'width, height', -1, 'Draw rectangle at current position'),
+    'draw_rounded_rect': ('DrawRoundedRect_impl', 'width, height, radius', -1, 'Draw rounded rectangle'),
+    'draw_circle': ('DrawCircle_impl', 'radius, segments=32', -1, 'Draw circle at current position'),
+    'draw_gradient_rect': ('DrawGradientRect_impl', 'width, height, r1, g1, b1, a1, r2, g2, b2, a2', -1, 'Draw gradient rectangle'),
+    'draw_line': ('DrawLine_impl', 'x1, y1, x2, y2', -1, 'Draw line from (x1,y1) to (x2,y2)'),
+    'draw_shadow': ('DrawShadow_impl', 'width, height, blur, offset_x, offset_y', -1, 'Draw shadow effect'),
+    'draw_triangle': ('DrawTriangle_impl', 'x1, y1, x2, y2, x3, y3', -1, 'Draw triangle'),
+    'draw_rect_outline': ('DrawRectOutline_impl', 'width, height, thickness', -1, 'Draw rectangle outline'),
+
+    # BATCH DRAWING SYSTEM
+    'draw_filled_rectangles': ('draw_filled_rectangles', 'xywh, colors, count', -1, 'Draw count filled rectangles from packed x, y, w, h rows'),
+    'draw_filled_circles': ('draw_filled_circles', 'xyr, colors, count, segments=16', -1, 'Draw count filled circles from packed x, y, radius rows'),
+    'draw_lines': ('draw_lines', 'xyxy, colors, count, thickness=1', -1, 'Draw count lines from packed x1, y1, x2, y2 rows'),
+    'draw_texts': ('draw_texts', 'texts, xy, colors, count, size=16', -1, 'Draw count NUL-separated strings at packed x, y rows'),
+
     # TEXT AND FONT SYSTEM
-    # =================================================================
-    
-    def font_load_ttf(self, font_data_id, font_size, scale=1.0):
-        """Load TrueType font"""
-        func = self.bindings.get_function('FontLoadTTF_impl')
-        if func:
-            return func(int(font_data_id), int(font_size), float(scale))
-        return -1
-    
-    def font_set_active(self, font_id):
-        """Set active font"""
-        func = self.bindings.get_function('FontSetActive_impl')
-        if func:
-            return func(int(font_id))
-        return -1
-    
-    def font_set_colors(self, text_r, text_g, text_b, text_a, shadow_r, shadow_g, shadow_b, shadow_a):
-        """Set font colors (text and shadow)"""
-        func = self.bindings.get_function('FontSetColors_impl')
-        if func:
-            return func(float(text_r), float(text_g), float(text_b), float(text_a),
-                       float(shadow_r), float(shadow_g), float(shadow_b), float(shadow_a))
-        return -1
-    
-    def text_draw(self, string_id):
-        """Draw text at current position"""
-        func = self.bindings.get_function('TextDraw_impl')
-        if func:
-            return func(int(string_id))
-        return -1
-    
-    def text_draw_scaled(self, string_id, scale):
-        """Draw scaled text"""
-        func = self.bindings.get_function('TextDrawScaled_impl')
-        if func:
-            return func(int(string_id), float(scale))
-        return -1
-    
-    def text_get_width(self, string_id, font_id, size):
-        """Get text width"""
-        func = self.bindings.get_function('TextGetWidth_impl')
-        if func:
-            return func(int(string_id), int(font_id), int(size))
-        return 0
-    
-    def text_get_height(self, font_id):
-        """Get text height"""
-        func = self.bindings.get_function('TextGetHeight_impl')
-        if func:
-            return func(int(font_id))
-        return 0
-    
-    def load_default_font(self):
-        """Load default system font"""
-        func = self.bindings.get_function('LoadDefaultFont')
-        if func:
-            return func()
-        return -1
-    
-    def load_truetype_font(self, font_path, size):
-        """Load TrueType font from file"""
-        func = self.bindings.get_function('LoadTrueTypeFont')
-        if func:
-            path_bytes = font_path.encode('utf-8') if isinstance(font_path, str) else font_path
-            return func(path_bytes, float(size))
-        return -1
-    
-    # =================================================================
+    'font_load_ttf': ('FontLoadTTF_impl', 'font_data_id, font_size, scale=1.0', -1, 'Load TrueType font'),
+    'font_set_active': ('FontSetActive_impl', 'font_id', -1, 'Set active font'),
+    'font_set_colors': ('FontSetColors_impl', 'text_r, text_g, text_b, text_a, shadow_r, shadow_g, shadow_b, shadow_a', -1, 'Set font colors (text and shadow)'),
+    'text_draw': ('TextDraw_impl', 'string_id', -1, 'Draw text at current position'),
+    'text_draw_scaled': ('TextDrawScaled_impl', 'string_id, scale', -1, 'Draw scaled text'),
+    'text_get_width': ('TextGetWidth_impl', 'string_id, font_id, size', 0, 'Get text width'),
+    'text_get_height': ('TextGetHeight_impl', 'font_id', 0, 'Get text height'),
+    'load_default_font': ('LoadDefaultFont', '', -1, 'Load default system font'),
+    'load_truetype_font': ('LoadTrueTypeFont', 'font_path, size', -1, 'Load TrueType font from file'),
+
     # BUTTON WIDGET SYSTEM
-    # =================================================================
-    
-    def button_create(self, x, y, width, height, text=""):
-        """Create a button widget"""
-        func = self.bindings.get_function('ButtonCreate')
-        if func:
-            text_bytes = text.encode('utf-8') if isinstance(text, str) else text
-            return func(int(x), int(y), int(width), int(height), text_bytes)
-        return -1
-    
-    def button_destroy(self, button_id):
-        """Destroy a button widget"""
-        func = self.bindings.get_function('ButtonDestroy')
-        if func:
-            return func(int(button_id))
-        return -1
-    
-    def draw_button(self, button_id):
-        """Draw a button widget"""
-        func = self.bindings.get_function('DrawButton')
-        if func:
-            return func(int(button_id))
-        return -1
-    
-    def button_set_text(self, button_id, text):
-        """Set button text"""
-        func = self.bindings.get_function('ButtonSetText')
-        if func:
-            text_bytes = text.encode('utf-8') if isinstance(text, str) else text
-            return func(int(button_id), text_bytes)
-        return -1
-    
-    def button_set_enabled(self, button_id, enabled):
-        """Enable/disable button"""
-        func = self.bindings.get_function('ButtonSetEnabled')
-        if func:
-            return func(int(button_id), int(bool(enabled)))
-        return -1
-    
-    def button_set_visible(self, button_id, visible):
-        """Show/hide button"""
-        func = self.bindings.get_function('ButtonSetVisible')
-        if func:
-            return func(int(button_id), int(bool(visible)))
-        return -1
-    
-    def button_handle_click(self, button_id, x, y):
-        """Handle button click"""
-        func = self.bindings.get_function('ButtonHandleClick')
-        if func:
-            return func(int(button_id), int(x), int(y))
-        return -1
-    
-    def button_is_clicked(self, button_id, x, y):
-        """Check if button was clicked at position"""
-        return self.button_handle_click(button_id, x, y) > 0
-    
-    # =================================================================
+    'button_create': ('ButtonCreate', "x, y, width, height, text=''", -1, 'Create a button widget'),
+    'button_destroy': ('ButtonDestroy', 'button_id', -1, 'Destroy a button widget'),
+    'draw_button': ('DrawButton', 'button_id', -1, 'Draw a button widget'),
+    'button_set_text': ('ButtonSetText', 'button_id, text', -1, 'Set button text'),
+    'button_set_text_string_id': ('ButtonSetTextStringId', 'button_id, string_id', -1, 'Set button text from a string ID'),
+    'button_set_enabled': ('ButtonSetEnabled', 'button_id, enabled', -1, 'Enable/disable button'),
+    'button_set_visible': ('ButtonSetVisible', 'button_id, visible', -1, 'Show/hide button'),
+    'button_set_position': ('ButtonSetPosition', 'button_id, x, y', -1, 'Move a button'),
+    'button_set_dimensions': ('ButtonSetDimensions', 'button_id, width, height', -1, 'Resize a button'),
+    'button_handle_click': ('ButtonHandleClick', 'button_id, x, y', -1, 'Handle button click'),
+    'button_get_toggled': ('ButtonGetToggled', 'button_id', 0, 'Get button toggled state'),
+    'button_is_hovered': ('ButtonIsHovered', 'button_id', 0, 'Check if the pointer is over a button'),
+    'button_is_pressed': ('ButtonIsPressed', 'button_id', 0, 'Check if a button is held down'),
+    'button_update_all': ('ButtonUpdateAll', 'mouse_x, mouse_y', -1, 'Update hover state of every button'),
+    'button_set_colors': ('ButtonSetColors', 'button_id, r1, g1, b1, a1, r2, g2, b2, a2', -1, 'Set button background and text colors'),
+    'button_set_hover_colors': ('ButtonSetHoverColors', 'button_id, r1, g1, b1, a1, r2, g2, b2, a2', -1, 'Set hovered button background and text colors'),
+    'button_set_pressed_colors': ('ButtonSetPressedColors', 'button_id, r1, g1, b1, a1, r2, g2, b2, a2', -1, 'Set pressed button background and text colors'),
+    'button_set_border_colors': ('ButtonSetBorderColors', 'button_id, r1, g1, b1, a1, r2, g2, b2, a2', -1, 'Set button border and focus border colors'),
+
     # CHECKBOX WIDGET SYSTEM
-    # =================================================================
-    
-    def checkbox_create(self, x, y, width, height):
-        """Create a checkbox widget"""
-        func = self.bindings.get_function('CheckBoxCreate')
-        if func:
-            return func(int(x), int(y), int(width), int(height))
-        return -1
-    
-    def enhanced_checkbox_create(self, x, y, width, height, style=0):
-        """Create an enhanced checkbox widget"""
-        func = self.bindings.get_function('EnhancedCheckBoxCreate')
-        if func:
-            return func(int(x), int(y), int(width), int(height), int(style))
-        return -1
-    
-    def draw_checkbox(self, checkbox_id):
-        """Draw a checkbox widget"""
-        func = self.bindings.get_function('DrawCheckBox')
-        if func:
-            return func(int(checkbox_id))
-        return -1
-    
-    def draw_enhanced_checkbox(self, checkbox_id):
-        """Draw an enhanced checkbox widget"""
-        func = self.bindings.get_function('DrawEnhancedCheckBox')
-        if func:
-            return func(int(checkbox_id))
-        return -1
-    
-    def checkbox_set_state(self, checkbox_id, checked):
-        """Set checkbox state"""
-        func = self.bindings.get_function('CheckBoxSetState')
-        if func:
-            return func(int(checkbox_id), int(bool(checked)))
-        return -1
-    
-    def checkbox_get_state(self, checkbox_id):
-        """Get checkbox state"""
-        func = self.bindings.get_function('CheckBoxGetState')
-        if func:
-            return bool(func(int(checkbox_id)))
-        return False
-    
-    def checkbox_handle_click(self, checkbox_id, x, y):
-        """Handle checkbox click"""
-        func = self.bindings.get_function('CheckBoxHandleClick')
-        if func:
-            return func(int(checkbox_id), int(x), int(y))
-        return -1
-    
-    # =================================================================
+    'checkbox_create': ('CheckBoxCreate', 'x, y, width, height', -1, 'Create a checkbox widget'),
+    'enhanced_checkbox_create': ('EnhancedCheckBoxCreate', 'x, y, width, height, style=0', -1, 'Create an enhanced checkbox widget'),
+    'checkbox_destroy': ('CheckBoxDestroy', 'checkbox_id', -1, 'Destroy a checkbox widget'),
+    'draw_checkbox': ('DrawCheckBox', 'checkbox_id', -1, 'Draw a checkbox widget'),
+    'draw_enhanced_checkbox': ('DrawEnhancedCheckBox', 'checkbox_id', -1, 'Draw an enhanced checkbox widget'),
+    'checkbox_set_state': ('CheckBoxSetState', 'checkbox_id, checked', -1, 'Set checkbox state'),
+    'checkbox_get_state': ('CheckBoxGetState', 'checkbox_id', False, 'Get checkbox state'),
+    'checkbox_set_state_value': ('CheckBoxSetState', 'checkbox_id, state', -1, 'Set checkbox state (0=unchecked, 1=checked, 2=indeterminate)'),
+    'checkbox_set_tri_state': ('CheckBoxSetTriState', 'checkbox_id, enabled', -1, 'Allow the indeterminate state'),
+    'enhanced_checkbox_set_tri_state': ('EnhancedCheckBoxSetTriState', 'checkbox_id, enabled', -1, 'Allow the indeterminate state on an enhanced checkbox'),
+    'checkbox_handle_click': ('CheckBoxHandleClick', 'checkbox_id, x, y', -1, 'Handle checkbox click'),
+    'checkbox_set_colors': ('CheckBoxSetColors', 'checkbox_id, r1, g1, b1, r2, g2, b2, r3, g3, b3', -1, 'Set checkbox border, fill and check colors'),
+    'checkbox_set_switch_colors': ('CheckBoxSetSwitchColors', 'checkbox_id, r1, g1, b1, r2, g2, b2, r3, g3, b3', -1, 'Set switch track off/on and thumb colors'),
+    'enhanced_checkbox_set_colors': ('EnhancedCheckBoxSetColors', 'checkbox_id, r1, g1, b1, r2, g2, b2, r3, g3, b3', -1, 'Set enhanced checkbox border, fill and check colors'),
+    'enhanced_checkbox_set_switch_colors': ('EnhancedCheckBoxSetSwitchColors', 'checkbox_id, r1, g1, b1, r2, g2, b2, r3, g3, b3', -1, 'Set enhanced switch track off/on and thumb colors'),
+
     # SLIDER WIDGET SYSTEM
-    # =================================================================
-    
-    def slider_create(self, x, y, width, height, orientation=0):
-        """Create a slider widget (0=horizontal, 1=vertical)"""
-        func = self.bindings.get_function('SliderCreate')
-        if func:
-            return func(int(x), int(y), int(width), int(height), int(orientation))
-        return -1
-    
-    def draw_slider(self, slider_id):
-        """Draw a slider widget"""
-        func = self.bindings.get_function('DrawSlider')
-        if func:
-            return func(int(slider_id))
-        return -1
-    
-    def slider_destroy(self, slider_id):
-        """Destroy a slider widget"""
-        func = self.bindings.get_function('SliderDestroy')
-        if func:
-            return func(int(slider_id))
-        return -1
-    
-    def slider_set_range(self, slider_id, min_val, max_val):
-        """Set slider range"""
-        func = self.bindings.get_function('SliderSetRange')
-        if func:
-            return func(int(slider_id), int(min_val), int(max_val))
-        return -1
-    
-    def slider_set_value(self, slider_id, value):
-        """Set slider value"""
-        func = self.bindings.get_function('SliderSetValue')
-        if func:
-            return func(int(slider_id), int(value))
-        return -1
-    
-    def slider_get_value(self, slider_id):
-        """Get slider value"""
-        func = self.bindings.get_function('SliderGetValue')
-        if func:
-            return func(int(slider_id))
-        return 0
-    
-    def slider_handle_click(self, slider_id, x, y):
-        """Handle slider click"""
-        func = self.bindings.get_function('SliderHandleClick')
-        if func:
-            return func(int(slider_id), int(x), int(y))
-        return -1
-    
-    def slider_handle_drag(self, slider_id, x, y):
-        """Handle slider drag"""
-        func = self.bindings.get_function('SliderHandleDrag')
-        if func:
-            return func(int(slider_id), int(x), int(y))
-        return -1
-    
-    # =================================================================
+    'slider_create': ('SliderCreate', 'x, y, width, height, orientation=0', -1, 'Create a slider widget (0=horizontal, 1=vertical)'),
+    'draw_slider': ('DrawSlider', 'slider_id', -1, 'Draw a slider widget'),
+    'slider_destroy': ('SliderDestroy', 'slider_id', -1, 'Destroy a slider widget'),
+    'slider_set_range': ('SliderSetRange', 'slider_id, min_val, max_val', -1, 'Set slider range'),
+    'slider_set_value': ('SliderSetValue', 'slider_id, value', -1, 'Set slider value'),
+    'slider_get_value': ('SliderGetValue', 'slider_id', 0, 'Get slider value'),
+    'slider_handle_click': ('SliderHandleClick', 'slider_id, x, y', -1, 'Handle slider click'),
+    'slider_handle_drag': ('SliderHandleDrag', 'slider_id, x, y', -1, 'Handle slider drag'),
+    'slider_set_colors': ('SliderSetColors', 'slider_id, r1, g1, b1, r2, g2, b2, r3, g3, b3', -1, 'Set slider track, active and thumb colors'),
+
     # PROGRESS BAR SYSTEM
-    # =================================================================
-    
-    def progressbar_create(self, x, y, width, height, style=0):
-        """Create a progress bar widget"""
-        func = self.bindings.get_function('ProgressBarCreate')
-        if func:
-            return func(int(x), int(y), int(width), int(height), int(style))
-        return -1
-    
-    def draw_progressbar(self, progressbar_id):
-        """Draw a progress bar widget"""
-        func = self.bindings.get_function('DrawProgressBar')
-        if func:
-            return func(int(progressbar_id))
-        return -1
-    
-    def progressbar_destroy(self, progressbar_id):
-        """Destroy a progress bar widget"""
-        func = self.bindings.get_function('ProgressBarDestroy')
-        if func:
-            return func(int(progressbar_id))
-        return -1
-    
-    def progressbar_set_value(self, progressbar_id, value):
-        """Set progress bar value (0-100)"""
-        func = self.bindings.get_function('ProgressBarSetValue')
-        if func:
-            return func(int(progressbar_id), int(value))
-        return -1
-    
-    def progressbar_get_value(self, progressbar_id):
-        """Get progress bar value"""
-        func = self.bindings.get_function('ProgressBarGetValue')
-        if func:
-            return func(int(progressbar_id))
-        return 0.0
-    
-    def progressbar_set_label(self, progressbar_id, text):
-        """Set progress bar label text"""
-        func = self.bindings.get_function('ProgressBarSetLabel')
-        if func:
-            text_bytes = text.encode('utf-8') if isinstance(text, str) else text
-            return func(int(progressbar_id), text_bytes)
-        return -1
-    
-    # =================================================================
+    'progressbar_create': ('ProgressBarCreate', 'x, y, width, height, style=0', -1, 'Create a progress bar widget'),
+    'draw_progressbar': ('DrawProgressBar', 'progressbar_id', -1, 'Draw a progress bar widget'),
+    'progressbar_destroy': ('ProgressBarDestroy', 'progressbar_id', -1, 'Destroy a progress bar widget'),
+    'progressbar_set_value': ('ProgressBarSetValue', 'progressbar_id, value', -1, 'Set progress bar value (0-100)'),
+    'progressbar_get_value': ('ProgressBarGetValue', 'progressbar_id', 0.0, 'Get progress bar value'),
+    'progressbar_set_label': ('ProgressBarSetLabel', 'progressbar_id, text', -1, 'Set progress bar label text'),
+    'progressbar_set_colors': ('ProgressBarSetColors', 'progressbar_id, r1, g1, b1, a1, r2, g2, b2, a2', -1, 'Set progress bar background and fill colors'),
+
     # LABEL WIDGET SYSTEM
-    # =================================================================
-    
-    def label_create(self, x, y, width, height, text=""):
-        """Create a label widget"""
-        func = self.bindings.get_function('LabelCreate')
-        if func:
-            text_bytes = text.encode('utf-8') if isinstance(text, str) else text
-            return func(int(x), int(y), int(width), int(height), text_bytes)
-        return -1
+    'label_create': ('LabelCreate', "x, y, width, height, text=''", -1, 'Create a label widget'),
+    'draw_label': ('DrawLabel', 'label_id', -1, 'Draw a label widget'),
+    'label_destroy': ('LabelDestroy', 'label_id', -1, 'Destroy a label widget'),
+    'label_set_text': ('LabelSetText', 'label_id, text', -1, 'Set label text'),
+    'label_set_text_string_id': ('LabelSetTextStringId', 'label_id, string_id', -1, 'Set label text from a string ID'),
+    'label_set_visible': ('LabelSetVisible', 'label_id, visible', -1, 'Show/hide label'),
+
+    # SYSTEM THEME
+    'get_system_dark_mode': ('get_system_dark_mode', '', -1, 'Cached system dark mode: 1=dark, 0=light, -1=unknown'),
+    'get_system_accent_color': ('get_system_accent_color', '', -1, 'Cached system accent color (0xRRGGBBAA)'),
+    'get_system_window_color': ('get_system_window_color', '', -1, 'Cached system window background color (0xRRGGBBAA)'),
+    'get_system_text_color': ('get_system_text_color', '', -1, 'Cached system text color (0xRRGGBBAA)'),
+    'system_theme_poll': ('system_theme_poll', '', 0, 'Re-detect the system theme if its settings files changed; 1 on change'),
+    'system_theme_refresh': ('system_theme_refresh', '', 0, 'Re-detect the system theme now; 1 on change'),
+}
+
+# Parameters passed to the C side as 0/1 flags
+BOOL_PARAMS = frozenset(['enabled', 'visible', 'checked'])
+
+# Wrappers whose integer result is returned as a Python bool
+BOOL_RESULTS = frozenset(['checkbox_get_state'])
+
+# Inline coercion per ctypes argument type; c_float/c_double parameters
+# already accept any int or float, so ctypes converts those itself
+_COERCIONS = {
+    ctypes.c_int: 'int({})',
+    ctypes.c_char_p: '_encode({})',
+}
+
+def _encode(text):
+    """Encode str arguments for c_char_p parameters"""
+    return text.encode('utf-8') if isinstance(text, str) else text
+
+def _generate_wrapper(name, func, unchecked=False):
+    """Build the fast-path function for one WRAPPER_SPECS entry"""
+    symbol, params, default, doc = WRAPPER_SPECS[name]
+    param_names = [p.split('=')[0].strip() for p in params.split(',') if p.strip()]
+    
+    if func is None:
+        body = f"return {default!r}"
+    else:
+        argtypes = FUNCTION_SIGNATURES[symbol][0]
+        if len(argtypes) != len(param_names):
+            raise ValueError(f"Wrapper {name} does not match signature of {symbol}")
+        args = []
+        for param, argtype in zip(param_names, argtypes):
+            if unchecked:
+                args.append(param)
+            elif param in BOOL_PARAMS:
+                args.append(f"int(bool({param}))")
+            else:
+                args.append(_COERCIONS.get(argtype, '{}').format(param))
+        if args == param_names and '=' not in params and name not in BOOL_RESULTS:
+            # Nothing to add on top of the ctypes function itself
+            return func
+        call = f"_func({', '.join(args)})"
+        body = f"return bool({call})" if name in BOOL_RESULTS else f"return {call}"
+    
+    source = f"def {name}({params}):\n    {body}\n"
+    namespace = {'_func': func, '_encode': _encode}
+    exec(compile(source, f"<mojogui wrapper {name}>", 'exec'), namespace)
+    wrapper = namespace[name]
+    wrapper.__doc__ = doc
+    return wrapper
+
+class MojoGUIWrappers:
+    """Mid-level wrapper functions for MojoGUI
     
-    def draw_label(self, label_id):
-        """Draw a label widget"""
-        func = self.bindings.get_function('DrawLabel')
-        if func:
-            return func(int(label_id))
-        return -1
+    Methods listed in WRAPPER_SPECS are generated on first access and cached
+    on the instance. With unchecked=True the coercions are skipped and the
+    caller must pass values ctypes accepts as-is (ints for int parameters,
+    bytes for strings).
+    """
     
-    def label_destroy(self, label_id):
-        """Destroy a label widget"""
-        func = self.bindings.get_function('LabelDestroy')
-        if func:
-            return func(int(label_id))
-        return -1
+    def __init__(self, unchecked=False):
+        self.bindings = get_bindings()
+        self.unchecked = unchecked
     
-    def label_set_text(self, label_id, text):
-        """Set label text"""
-        func = self.bindings.get_function('LabelSetText')
-        if func:
-            text_bytes = text.encode('utf-8') if isinstance(text, str) else text
-            return func(int(label_id), text_bytes)
-        return -1
+    def __getattr__(self, name):
+        """Generate a wrapper from WRAPPER_SPECS on first access"""
+        if name not in WRAPPER_SPECS:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+        func = self.bindings.get_function(WRAPPER_SPECS[name][0])
+        wrapper = _generate_wrapper(name, func, self.unchecked)
+        self.__dict__[name] = wrapper
+        return wrapper
     
-    def label_set_visible(self, label_id, visible):
-        """Show/hide label"""
-        func = self.bindings.get_function('LabelSetVisible')
-        if func:
-            return func(int(label_id), int(bool(visible)))
-        return -1
+    def button_is_clicked(self, button_id, x, y):
+        """Check if button was clicked at position"""
+        return self.button_handle_click(button_id, x, y) > 0
     
     # =================================================================
     # UTILITY FUNCTIONS
@@ -566,21 +261,33 @@ class MojoGUIWrappers:
             if funcs:
                 print(f"   {category}: {len(funcs)} functions")
 
-# Global instance
+# Global instances: the checked one shared by the widget layer, and the
+# unchecked one handed only to callers that ask for it
 _wrappers = None
+_unchecked_wrappers = None
 
-def get_wrappers():
-    """Get the global wrappers instance"""
-    global _wrappers
+def get_wrappers(unchecked=False):
+    """Get the global wrappers instance
+    
+    With unchecked=True, get a separate instance whose wrappers skip
+    argument coercion; the shared checked instance is unaffected, so the
+    widgets keep converting text and float coordinates.
+    """
+    global _wrappers, _unchecked_wrappers
+    if unchecked:
+        if _unchecked_wrappers is None or _unchecked_wrappers.bindings is not get_bindings():
+            _unchecked_wrappers = MojoGUIWrappers(unchecked=True)
+        return _unchecked_wrappers
     if _wrappers is None:
         _wrappers = MojoGUIWrappers()
     return _wrappers
 
-def reload_wrappers():
+def reload_wrappers(unchecked=False):
     """Reload the wrappers (useful after library recompilation)"""
-    global _wrappers
+    global _wrappers, _unchecked_wrappers
     _wrappers = None
-    return get_wrappers()
+    _unchecked_wrappers = None
+    return get_wrappers(unchecked)
 
 if __name__ == "__main__":
     print("🎯 MojoGUI Mid-Level Wrappers")
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Progress Feeds for MojoGUI Progress Bars
+Lock-free progress reporting from worker threads, applied once per frame
+
+Workers never touch the GUI: feed.update(), task.update() and
+feed.set_label() are plain attribute stores plus a dirty flag, safe from
+any thread at any rate. The UI thread (Application's frame loop, or an
+explicit ProgressBar.apply_feed()) takes the latest state once per frame
+and makes at most one native write for the value and one for the label.
+
+A feed is either driven directly with update(value) or split into
+sub-tasks with task(total, weight); with tasks the bar shows their
+weighted completion. Give each worker its own task: a task's counters
+are not meant to be shared between threads. Workers may create their
+tasks themselves; adding and dropping tasks takes a lock, reporting
+progress does not.
+
+The first change after a frame wakes the frame loop so an idle
+application still picks it up; further changes until the next frame
+cost nothing but the stores.
+"""
+
+import threading
+
+class ProgressTask:
+    """One sub-task of a ProgressFeed, updated by a single worker"""
+
+    __slots__ = ('feed', 'done', 'total', 'weight')
+
+    def __init__(self, feed, total, weight):
+        self.feed = feed
+        self.done = 0
+        self.total = total
+        self.weight = weight
+
+    def update(self, done, total=None):
+        """Report done units (and optionally a new total)"""
+        if total is not None:
+            self.total = total
+        self.done = done
+        self.feed._changed()
+
+    def advance(self, amount=1):
+        """Report amount more units done"""
+        self.done += amount
+        self.feed._changed()
+
+    def finish(self):
+        """Mark the task complete"""
+        self.done = self.total
+        self.feed._changed()
+
+    @property
+    def fraction(self):
+        total = self.total
+        if total <= 0:
+            return 1.0
+        return max(0.0, min(1.0, self.done / total))
+
+class ProgressFeed:
+    """Latest-value-wins progress channel from any thread to one ProgressBar"""
+
+    def __init__(self, wake=None):
+        self._wake = wake
+        self._value = 0.0
+        self._label = None
+        self._tasks = ()    # replaced, never mutated, so readers need no lock
+        self._tasks_lock = threading.Lock()
+        self._dirty = False
+        self.updates = 0    # reports received (approximate under contention)
+        self.applied = 0    # frames in which a change was applied
+
+    def update(self, value):
+        """Report overall progress (0-100); ignored while the feed has tasks"""
+        self._value = value
+        self._changed()
+
+    def set_label(self, text):
+        """Report a new label for the bar"""
+        self._label = text
+        self._changed()
+
+    def task(self, total=1.0, weight=1.0):
+        """Add a sub-task worth weight of the bar; returns its ProgressTask"""
+        task = ProgressTask(self, total, weight)
+        with self._tasks_lock:
+            self._tasks = self._tasks + (task,)
+        self._changed()
+        return task
+
+    def reset(self):
+        """Drop every task and go back to 0"""
+        with self._tasks_lock:
+            self._tasks = ()
+        self._value = 0.0
+        self._changed()
+
+    @property
+    def tasks(self):
+        return self._tasks
+
+    def value(self):
+        """Current progress (0-100), aggregated over the tasks if there are any"""
+        tasks = self._tasks
+        if not tasks:
+            return self._value
+        weights = sum(task.weight for task in tasks)
+        if weights <= 0:
+            return 100.0
+        return 100.0 * sum(task.fraction * task.weight for task in tasks) / weights
+
+    def _changed(self):
+        self.updates += 1
+        if not self._dirty:
+            self._dirty = True
+            wake = self._wake
+            if wake is not None:
+                wake()
+
+    def take(self):
+        """(value, label) if anything changed since the last take(), else None
+
+        Called on the UI thread. The flag is cleared before reading, so a
+        report racing with take() is seen now or marks the next frame.
+        """
+        if not self._dirty:
+            return None
+        self._dirty = False
+        self.applied += 1
+        return self.value(), self._label
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Property Batches for MojoGUI Widgets
+Collects native property writes and flushes them once, coalesced
+
+Inside `with app.batch():` (or `with widget.batch():`) widget setters
+update their Python state and damage immediately, but the native write
+(ButtonSetPosition, LabelSetText, ...) is queued. Writes to the same
+property of the same widget replace each other, so a relayout that moves
+a widget three times sends one position. On exit every queued write is
+sent in first-write order; writes that leave a property where the last
+flush left it are dropped. Properties the library can change on its own
+(checkbox state, slider value) are always sent.
+
+Queued writes are flushed even when the block raises, since the Python
+side of the widgets has already changed.
+"""
+
+from contextlib import contextmanager
+
+# Properties the native side changes itself (clicks, drags); never skipped
+VOLATILE_PROPS = frozenset(['checked', 'value'])
+
+class PropertyBatch:
+    """Pending native writes, keyed by (widget, property)"""
+
+    def __init__(self):
+        self.writes = {}    # (widget, prop) -> (setter, args)
+        self.moved = {}     # widgets whose bounds changed, in order
+        self.depth = 0
+        self.coalesced = 0  # writes replaced by a later one
+        self.skipped = 0    # writes dropped as unchanged
+        self.calls = 0      # native calls made by flush()
+
+    def __len__(self):
+        return len(self.writes)
+
+    def write(self, widget, prop, setter, args):
+        """Queue setter(*args) as the new value of widget's prop"""
+        key = (widget, prop)
+        if key in self.writes:
+            self.coalesced += 1
+        self.writes[key] = (setter, args)
+
+    def _send(self, widget, prop, setter, args):
+        if widget.widget_id < 0:
+            return True
+        if prop not in VOLATILE_PROPS:
+            sent = widget._sent
+            if sent.get(prop) == args:
+                self.skipped += 1
+                return True
+            sent[prop] = args
+        self.calls += 1
+        return setter(*args) == 0
+
+    def flush(self):
+        """Send every queued write; True if all succeeded"""
+        writes, self.writes = self.writes, {}
+        ok = True
+        for (widget, prop), (setter, args) in writes.items():
+            ok = self._send(widget, prop, setter, args) and ok
+        return ok
+
+    def flush_widget(self, widget):
+        """Send the queued writes of one widget now (before it is closed)"""
+        ok = True
+        for key in [key for key in self.writes if key[0] is widget]:
+            setter, args = self.writes.pop(key)
+            ok = self._send(widget, key[1], setter, args) and ok
+        return ok
+
+    def stats(self):
+        return {
+            'pending': len(self.writes),
+            'coalesced': self.coalesced,
+            'skipped': self.skipped,
+            'calls': self.calls,
+        }
+
+@contextmanager
+def batch_scope(owner):
+    """Open (or join) owner._batch and flush it when the outermost block exits"""
+    batch = owner._batch
+    if batch is None:
+        batch = owner._batch = PropertyBatch()
+    batch.depth += 1
+    try:
+        yield batch
+    finally:
+        batch.depth -= 1
+        if batch.depth == 0:
+            owner._batch = None
+            batch.flush()
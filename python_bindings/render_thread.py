@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Render Thread for MojoGUI Applications
+Dedicated thread that owns the GL context and the FrameBegin/FrameEnd cycle
+
+The render thread initializes the window, then loops: drain queued
+commands, poll events, update widgets, render. Everything that crosses
+the FFI boundary runs on it; the logic thread talks to it only through
+Application.submit() and Application.queue_draw(), and widget event
+handlers are handed back to the logic thread (see
+Application.process_callbacks()).
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+class RenderThread(threading.Thread):
+    """Render loop for one Application"""
+
+    def __init__(self, app, max_fps=60):
+        super().__init__(name="MojoGUI-render", daemon=True)
+        self.app = app
+        self.frame_interval = 1.0 / max_fps if max_fps else 0.0
+        self.commands = queue.SimpleQueue()
+        self.ready = threading.Event()
+        self.init_ok = False
+        self.error = None
+        self.frames = 0
+        self._stop_requested = threading.Event()
+
+    def submit(self, func, *args, **kwargs):
+        """Queue func to run on the render thread before the next frame"""
+        future = Future()
+        self.commands.put((future, func, args, kwargs))
+        return future
+
+    def stop(self):
+        """Ask the loop to exit after the current frame"""
+        self._stop_requested.set()
+
+    def _drain_commands(self):
+        """Run every queued command, completing its future"""
+        while True:
+            try:
+                future, func, args, kwargs = self.commands.get_nowait()
+            except queue.Empty:
+                return
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(func(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+
+    def _cancel_pending(self):
+        """Fail commands that arrive after the loop has ended"""
+        while True:
+            try:
+                future, _, _, _ = self.commands.get_nowait()
+            except queue.Empty:
+                return
+            future.cancel()
+
+    def run(self):
+        app = self.app
+        try:
+            self.init_ok = app.running or app.init()
+        except BaseException as e:
+            self.error = e
+            self.init_ok = False
+        finally:
+            self.ready.set()
+
+        if not self.init_ok:
+            return
+
+        try:
+            while app.running and not self._stop_requested.is_set():
+                frame_start = time.perf_counter()
+                self._drain_commands()
+                app.update()
+                app.render()
+                self.frames += 1
+
+                remaining = self.frame_interval - (time.perf_counter() - frame_start)
+                if remaining > 0:
+                    self._stop_requested.wait(remaining)
+            self._drain_commands()
+        except BaseException as e:
+            self.error = e
+        finally:
+            self._cancel_pending()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Spatial Index for MojoGUI Hit Testing
+Uniform grid over widget bounds so a pointer event only tests nearby widgets
+
+Each widget is registered with its z-order (higher draws on top) and
+filed under every grid cell its bounds overlap. query(x, y) reads the one
+cell under the point and returns the widgets whose bounds contain it,
+topmost first. Objects without bounds are kept in a separate list and
+returned for every point, so they behave as they did before indexing.
+"""
+
+# Grid cell edge in pixels; about the size of a typical widget
+DEFAULT_CELL_SIZE = 64
+
+class SpatialIndex:
+    """Uniform grid of widget bounds with z-ordered point queries"""
+
+    def __init__(self, cell_size=DEFAULT_CELL_SIZE):
+        self.cell_size = cell_size
+        self._cells = {}        # (cx, cy) -> {widget: z}
+        self._entries = {}      # widget -> (z, bounds, cell keys)
+        self._unbounded = {}    # widget -> z, tested at every point
+
+    def __len__(self):
+        return len(self._entries) + len(self._unbounded)
+
+    def __contains__(self, widget):
+        return widget in self._entries or widget in self._unbounded
+
+    @staticmethod
+    def _bounds(widget):
+        """(x0, y0, x1, y1) of a widget, or None if it has no usable bounds"""
+        try:
+            x, y = widget.x, widget.y
+            return (x, y, x + widget.width, y + widget.height)
+        except (AttributeError, TypeError):
+            return None
+
+    def _cell_keys(self, bounds):
+        size = self.cell_size
+        x0, y0, x1, y1 = bounds
+        return [(cx, cy)
+                for cx in range(int(x0 // size), int(x1 // size) + 1)
+                for cy in range(int(y0 // size), int(y1 // size) + 1)]
+
+    def insert(self, widget, z, bounded=True):
+        """Add a widget at z-order z; bounded=False tests it at every point"""
+        self.remove(widget)
+        bounds = self._bounds(widget) if bounded else None
+        if bounds is None:
+            self._unbounded[widget] = z
+            return
+        keys = self._cell_keys(bounds)
+        for key in keys:
+            cell = self._cells.get(key)
+            if cell is None:
+                cell = self._cells[key] = {}
+            cell[widget] = z
+        self._entries[widget] = (z, bounds, keys)
+
+    def update(self, widget):
+        """Re-file a widget after its position or size changed"""
+        entry = self._entries.get(widget)
+        if entry is None:
+            return
+        z, old_bounds, old_keys = entry
+        bounds = self._bounds(widget)
+        if bounds == old_bounds:
+            return
+        keys = self._cell_keys(bounds)
+        if keys != old_keys:
+            for key in old_keys:
+                cell = self._cells[key]
+                del cell[widget]
+                if not cell:
+                    del self._cells[key]
+            for key in keys:
+                cell = self._cells.get(key)
+                if cell is None:
+                    cell = self._cells[key] = {}
+                cell[widget] = z
+        self._entries[widget] = (z, bounds, keys)
+
+    def remove(self, widget):
+        """Drop a widget from the index"""
+        if self._unbounded.pop(widget, None) is not None:
+            return
+        entry = self._entries.pop(widget, None)
+        if entry is None:
+            return
+        for key in entry[2]:
+            cell = self._cells[key]
+            del cell[widget]
+            if not cell:
+                del self._cells[key]
+
+    def query(self, x, y):
+        """Widgets whose bounds contain (x, y), plus unbounded ones, topmost first"""
+        size = self.cell_size
+        cell = self._cells.get((int(x // size), int(y // size)))
+        hits = []
+        if cell:
+            entries = self._entries
+            for widget, z in cell.items():
+                x0, y0, x1, y1 = entries[widget][1]
+                if x0 <= x <= x1 and y0 <= y <= y1:
+                    hits.append((z, widget))
+        if self._unbounded:
+            hits.extend((z, widget) for widget, z in self._unbounded.items())
+        if len(hits) > 1:
+            hits.sort(key=lambda hit: hit[0], reverse=True)
+        return [widget for _, widget in hits]
+
+    def top(self, x, y):
+        """Topmost bounded widget containing (x, y), or None"""
+        for widget in self.query(x, y):
+            if widget in self._entries:
+                return widget
+        return None
+
+    def clear(self):
+        self._cells.clear()
+        self._entries.clear()
+        self._unbounded.clear()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Widget State Snapshots for MojoGUI Applications
+Native widget state read once and kept until something can change it
+
+Application keeps a StateSnapshot of its buttons, checkboxes and
+sliders. The first time a getter such as CheckBox.is_checked(),
+Slider.get_value() or Button.is_hovered() needs a column of a widget it
+queries the library and stores the answer; later reads, in this frame
+or any later one, are served from Python without crossing FFI.
+
+Native widget state only changes through calls Python makes: setters
+and XxxHandleClick/Drag mark the widget stale, and ButtonUpdateAll moves
+hover. refresh() runs on frames that render; it calls ButtonUpdateAll
+only when the pointer moved (or a widget moved under it) and drops the
+stored state of the widgets under the old and new pointer position. A
+frame therefore costs a constant number of native calls however many
+widgets are tracked, instead of one call per widget and column.
+
+A widget whose state Python has just changed is marked stale; until the
+next refresh its getters answer from the Python-side value and nothing
+is stored for it.
+"""
+
+# Widget kinds whose state is cached
+TRACKED_KINDS = ('button', 'checkbox', 'enhanced_checkbox', 'slider')
+
+# Cached columns of a widget
+HOVERED, PRESSED, STATE, VALUE = range(4)
+COLUMNS = 4
+
+class StateSnapshot:
+    """Cache of native widget state, one entry per tracked widget
+
+    index is the application's SpatialIndex, used to find the widgets
+    under the pointer; without one a pointer move drops every entry.
+    """
+
+    def __init__(self, wrappers, index=None):
+        self.wrappers = wrappers
+        self.index = index
+        self.update_hover = wrappers.is_function_available('ButtonUpdateAll')
+        self.widgets = set()
+        self.frame = 0          # refreshes so far
+        self._values = {}       # widget -> [value or None per column]
+        self._stale = set()
+        self._pointer = None    # pointer position last sent with ButtonUpdateAll
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.widgets)
+
+    def __contains__(self, widget):
+        return widget in self.widgets
+
+    def add(self, widget, kind):
+        """Track widget, a native widget of one of TRACKED_KINDS"""
+        if kind in TRACKED_KINDS:
+            self.widgets.add(widget)
+
+    def remove(self, widget):
+        """Stop tracking widget"""
+        self.widgets.discard(widget)
+        self._values.pop(widget, None)
+        self._stale.discard(widget)
+
+    def mark_stale(self, widget):
+        """Python has changed widget's state; drop its values until the next refresh"""
+        if widget in self.widgets:
+            self._stale.add(widget)
+            self._values.pop(widget, None)
+
+    def is_stale(self, widget):
+        """Whether widget is tracked but its native state predates a Python-side change"""
+        return widget in self._stale
+
+    def forget_at(self, x, y):
+        """Drop the stored state of the widgets at (x, y), e.g. after a press"""
+        if self.index is None:
+            self._values.clear()
+            return
+        for widget in self.index.query(x, y):
+            self._values.pop(widget, None)
+
+    def moved(self, widget):
+        """widget's bounds changed; re-send the pointer at the next refresh"""
+        self._values.pop(widget, None)
+        self._pointer = None
+
+    def refresh(self, mouse_x, mouse_y):
+        """Start a new rendered frame; returns the number of native calls"""
+        self._stale.clear()
+        self.frame += 1
+        pointer = (mouse_x, mouse_y)
+        if pointer == self._pointer:
+            return 0
+        previous, self._pointer = self._pointer, pointer
+        if previous is not None:
+            self.forget_at(*previous)
+        self.forget_at(mouse_x, mouse_y)
+        if self.update_hover:
+            self.wrappers.button_update_all(mouse_x, mouse_y)
+            return 1
+        return 0
+
+    def get(self, widget, column):
+        """Stored value of one column for widget, or None when it must be queried"""
+        values = self._values.get(widget)
+        value = values[column] if values is not None else None
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def store(self, widget, column, value):
+        """Keep a value just queried from the library until the widget changes"""
+        if widget not in self.widgets or widget in self._stale:
+            return
+        values = self._values.get(widget)
+        if values is None:
+            values = self._values[widget] = [None] * COLUMNS
+        values[column] = value
+
+    def stats(self):
+        return {
+            'widgets': len(self.widgets),
+            'cached': len(self._values),
+            'frames': self.frame,
+            'hits': self.hits,
+            'misses': self.misses,
+        }
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+String Pool for MojoGUI
+Interns text into the C string table so each distinct string crosses FFI once
+
+The C string system works on integer slots (AllocTempString, StringSet_impl,
+TextDraw_impl(string_id), ...). StringPool maps text to slots: holders take
+a reference with acquire() and drop it with release(); slots nobody holds
+stay cached in LRU order and the least recently used ones are recycled once
+more than max_idle of them accumulate.
+"""
+
+from collections import OrderedDict
+
+try:
+    from .mid_level_wrappers import get_wrappers
+except ImportError:
+    from mid_level_wrappers import get_wrappers
+
+# Unreferenced slots kept cached before the least recently used is recycled
+DEFAULT_MAX_IDLE = 256
+
+class StringPool:
+    """Reference-counted text -> string ID table with LRU reuse of idle slots"""
+
+    def __init__(self, wrappers=None, max_idle=DEFAULT_MAX_IDLE):
+        self.wrappers = wrappers or get_wrappers()
+        self.max_idle = max_idle
+        self._ids = {}              # text -> string ID
+        self._refs = {}             # text -> reference count (> 0)
+        self._idle = OrderedDict()  # text -> string ID, least recently used first
+        self._free_ids = []
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __contains__(self, text):
+        return text in self._ids
+
+    def _slot_for(self, text):
+        """String ID holding text, uploading it on a miss"""
+        string_id = self._ids.get(text)
+        if string_id is not None:
+            self.hits += 1
+            return string_id
+
+        self.misses += 1
+        string_id = self._free_ids.pop() if self._free_ids else self.wrappers.alloc_temp_string()
+        if string_id < 0:
+            return -1
+        if self.wrappers.string_set(string_id, text) != 0:
+            self._free_ids.append(string_id)
+            return -1
+        self._ids[text] = string_id
+        return string_id
+
+    def acquire(self, text):
+        """String ID for text, held until the matching release(); -1 on failure"""
+        string_id = self._slot_for(text)
+        if string_id >= 0:
+            self._idle.pop(text, None)
+            self._refs[text] = self._refs.get(text, 0) + 1
+        return string_id
+
+    def release(self, text):
+        """Drop one reference to text; unreferenced slots become idle"""
+        refs = self._refs.get(text)
+        if refs is None:
+            return
+        if refs > 1:
+            self._refs[text] = refs - 1
+            return
+        del self._refs[text]
+        self._idle[text] = self._ids[text]
+        self._trim()
+
+    def intern(self, text):
+        """String ID for one-off use (e.g. drawing this frame) without holding it"""
+        string_id = self._slot_for(text)
+        if string_id >= 0 and text not in self._refs:
+            self._idle[text] = string_id
+            self._idle.move_to_end(text)
+            self._trim()
+        return string_id
+
+    def _trim(self):
+        """Recycle least recently used idle slots beyond max_idle"""
+        while len(self._idle) > self.max_idle:
+            text, string_id = self._idle.popitem(last=False)
+            del self._ids[text]
+            self._free_ids.append(string_id)
+            self.evictions += 1
+
+    def clear_idle(self):
+        """Recycle every idle slot"""
+        for text, string_id in self._idle.items():
+            del self._ids[text]
+            self._free_ids.append(string_id)
+        self.evictions += len(self._idle)
+        self._idle.clear()
+
+    def stats(self):
+        """Counters for tuning max_idle"""
+        return {
+            'strings': len(self._ids),
+            'referenced': len(self._refs),
+            'idle': len(self._idle),
+            'free_slots': len(self._free_ids),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+# Global pool instance
+_pool = None
+
+def get_string_pool():
+    """Get global string pool instance
+
+    A new pool is started when the wrappers are reloaded, since the old
+    pool's slots belong to the previous library.
+    """
+    global _pool
+    wrappers = get_wrappers()
+    if _pool is None or _pool.wrappers is not wrappers:
+        _pool = StringPool(wrappers)
+    return _pool
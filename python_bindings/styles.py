@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Shared Styles for MojoGUI Widgets
+Palettes kept in Python and sent through the per-widget color setters
+
+A Style is a palette of packed 0xRRGGBBAA colors for one widget kind,
+shared by every widget that uses it. The library has no palette entry
+points of its own, so styles are a Python-side layer: a widget's colors
+are sent with its XxxSetColors calls, one call per color group.
+
+A theme switch therefore still costs one XxxSetColors call per changed
+color group of every styled widget, not one call for the whole theme.
+Each group goes through the widget's property writes, so a group whose
+colors did not change is not sent again, and inside Application.batch()
+(which Application.apply_theme() uses) repeated changes coalesce.
+
+A closed widget is put back on the base style of its kind before its
+native ID is pooled; the widget that recycles the ID adopts that style
+(see Widget._create_native), so pooled IDs never carry private colors.
+
+Per-widget colors are copy-on-write: Widget.override_style() derives a
+private style from the shared one on first use. A derived style keeps
+following its parent for the roles it does not override, so theme
+switches reach overridden widgets too.
+"""
+
+import weakref
+
+try:
+    from .bulk_drawing import pack_color
+    from .mid_level_wrappers import get_wrappers
+except ImportError:
+    from bulk_drawing import pack_color
+    from mid_level_wrappers import get_wrappers
+
+_CHECKBOX_ROLES = ('border', 'fill', 'check', 'track_off', 'track_on', 'thumb')
+
+# Palette slots per kind, in palette order
+ROLES = {
+    'button': ('background', 'text', 'hover_background', 'hover_text',
+               'pressed_background', 'pressed_text', 'border', 'focus_border'),
+    'checkbox': _CHECKBOX_ROLES,
+    'enhanced_checkbox': _CHECKBOX_ROLES,
+    'slider': ('track', 'active', 'thumb'),
+    'progressbar': ('background', 'fill'),
+}
+
+# kind: [(per-widget setter, roles it sets, components per color)]
+COLOR_SETTERS = {
+    'button': [('button_set_colors', ('background', 'text'), 4),
+               ('button_set_hover_colors', ('hover_background', 'hover_text'), 4),
+               ('button_set_pressed_colors', ('pressed_background', 'pressed_text'), 4),
+               ('button_set_border_colors', ('border', 'focus_border'), 4)],
+    'checkbox': [('checkbox_set_colors', ('border', 'fill', 'check'), 3),
+                 ('checkbox_set_switch_colors', ('track_off', 'track_on', 'thumb'), 3)],
+    'enhanced_checkbox': [('enhanced_checkbox_set_colors', ('border', 'fill', 'check'), 3),
+                          ('enhanced_checkbox_set_switch_colors', ('track_off', 'track_on', 'thumb'), 3)],
+    'slider': [('slider_set_colors', ('track', 'active', 'thumb'), 3)],
+    'progressbar': [('progressbar_set_colors', ('background', 'fill'), 4)],
+}
+
+# Themes: kind -> {role: packed color}
+LIGHT_THEME = {
+    'button': {
+        'background': pack_color(225, 225, 230), 'text': pack_color(20, 20, 25),
+        'hover_background': pack_color(205, 215, 235), 'hover_text': pack_color(20, 20, 25),
+        'pressed_background': pack_color(170, 185, 215), 'pressed_text': pack_color(10, 10, 15),
+        'border': pack_color(150, 150, 160), 'focus_border': pack_color(50, 110, 220),
+    },
+    'checkbox': {
+        'border': pack_color(120, 120, 130), 'fill': pack_color(255, 255, 255),
+        'check': pack_color(50, 110, 220), 'track_off': pack_color(200, 200, 205),
+        'track_on': pack_color(50, 110, 220), 'thumb': pack_color(255, 255, 255),
+    },
+    'slider': {
+        'track': pack_color(200, 200, 205), 'active': pack_color(50, 110, 220),
+        'thumb': pack_color(255, 255, 255),
+    },
+    'progressbar': {
+        'background': pack_color(220, 220, 225), 'fill': pack_color(50, 110, 220),
+    },
+}
+LIGHT_THEME['enhanced_checkbox'] = LIGHT_THEME['checkbox']
+
+DARK_THEME = {
+    'button': {
+        'background': pack_color(55, 55, 62), 'text': pack_color(230, 230, 235),
+        'hover_background': pack_color(70, 75, 90), 'hover_text': pack_color(240, 240, 245),
+        'pressed_background': pack_color(40, 60, 100), 'pressed_text': pack_color(255, 255, 255),
+        'border': pack_color(85, 85, 95), 'focus_border': pack_color(90, 150, 255),
+    },
+    'checkbox': {
+        'border': pack_color(110, 110, 120), 'fill': pack_color(40, 40, 45),
+        'check': pack_color(90, 150, 255), 'track_off': pack_color(70, 70, 78),
+        'track_on': pack_color(90, 150, 255), 'thumb': pack_color(230, 230, 235),
+    },
+    'slider': {
+        'track': pack_color(70, 70, 78), 'active': pack_color(90, 150, 255),
+        'thumb': pack_color(230, 230, 235),
+    },
+    'progressbar': {
+        'background': pack_color(50, 50, 56), 'fill': pack_color(90, 150, 255),
+    },
+}
+DARK_THEME['enhanced_checkbox'] = DARK_THEME['checkbox']
+
+def _check_roles(kind, colors):
+    unknown = set(colors) - set(ROLES[kind])
+    if unknown:
+        raise ValueError(f"Unknown {kind} style roles: {', '.join(sorted(unknown))}")
+
+class Style:
+    """Palette for one widget kind; derived styles inherit the roles they do not set"""
+
+    def __init__(self, sheet, kind, colors=None, parent=None, owner=None):
+        if kind not in ROLES:
+            raise ValueError(f"Widgets of kind {kind!r} cannot be styled")
+        colors = dict(colors or {})
+        _check_roles(kind, colors)
+        self.sheet = sheet
+        self.kind = kind
+        self.overrides = colors
+        self.parent = parent
+        self.owner = owner          # widget a copy-on-write style belongs to
+        self.children = weakref.WeakSet()
+        self.widgets = weakref.WeakSet()
+        if parent is not None:
+            parent.children.add(self)
+
+    def color(self, role):
+        """Packed color of a role, inherited from the parent when not set here"""
+        if role in self.overrides:
+            return self.overrides[role]
+        if self.parent is not None:
+            return self.parent.color(role)
+        return 0
+
+    def derive(self, owner=None, **colors):
+        """New style that follows this one except for colors"""
+        return Style(self.sheet, self.kind, colors, parent=self, owner=owner)
+
+    def update(self, **colors):
+        """Change some roles; every widget using this style or a derived one follows"""
+        _check_roles(self.kind, colors)
+        self.overrides.update(colors)
+        return self.sheet.push([self])
+
+    def descendants(self):
+        """This style and every style derived from it"""
+        styles = [self]
+        for child in list(self.children):
+            styles.extend(child.descendants())
+        return styles
+
+class StyleSheet:
+    """Base style per widget kind, the current theme, and the color writes of styled widgets"""
+
+    def __init__(self, wrappers=None, theme=None):
+        self.wrappers = wrappers or get_wrappers()
+        self.theme = theme or LIGHT_THEME
+        self._base = {}
+        self.calls = 0      # color groups written (sent or queued)
+        self.skipped = 0    # color groups left alone as unchanged
+
+    def style(self, kind):
+        """The shared base style of a kind, colored by the current theme"""
+        style = self._base.get(kind)
+        if style is None:
+            style = self._base[kind] = Style(self, kind, self.theme.get(kind))
+        return style
+
+    def create_style(self, kind, parent=None, **colors):
+        """New shared style, derived from the base style of its kind by default"""
+        if parent is None:
+            parent = self.style(kind)
+        return parent.derive(**colors)
+
+    def assign(self, widget, style):
+        """Point widget at style; True on success"""
+        if widget.widget_id < 0:
+            return False
+        previous = widget._style
+        if previous is not None and previous is not style:
+            previous.widgets.discard(widget)
+            if previous.owner is widget and previous is not style.parent:
+                self.release(previous)
+        style.widgets.add(widget)
+        widget._style = style
+        return self._send_colors(widget, style)
+
+    def unassign(self, widget):
+        """Put widget back on the base style of its kind and stop recoloring it
+
+        Called before its native ID is pooled, so the ID carries no
+        private colors to the next owner.
+        """
+        style = widget._style
+        if style is None:
+            return
+        base = self.style(style.kind)
+        if style is not base:
+            self._send_colors(widget, base)
+        widget._style = None
+        style.widgets.discard(widget)
+        if style.owner is widget:
+            self.release(style)
+
+    def release(self, style):
+        """Forget a style no widget uses any more"""
+        if style.parent is not None:
+            style.parent.children.discard(style)
+
+    def apply_theme(self, theme):
+        """Recolor every base style (and what derives from it) from theme
+
+        Each styled widget is sent the color groups that changed.
+        """
+        self.theme = theme
+        changed = []
+        for kind, colors in theme.items():
+            _check_roles(kind, colors)
+            style = self.style(kind)
+            style.overrides = dict(colors)
+            changed.append(style)
+        return self.push(changed)
+
+    def push(self, styles):
+        """Send the palettes of styles and of every style derived from them"""
+        seen = {}
+        for style in styles:
+            for descendant in style.descendants():
+                seen[id(descendant)] = descendant
+        ok = True
+        for style in seen.values():
+            for widget in list(style.widgets):
+                ok = self._send_colors(widget, style) and ok
+        return ok
+
+    def _send_colors(self, widget, style):
+        """Write widget's color groups from style, one XxxSetColors call per changed group"""
+        if widget.widget_id < 0:
+            return False
+        ok = True
+        unbatched = widget._active_batch() is None
+        for setter, roles, components in COLOR_SETTERS[style.kind]:
+            args = [widget.widget_id]
+            for role in roles:
+                color = style.color(role)
+                args.extend(((color >> 24) & 0xFF, (color >> 16) & 0xFF,
+                             (color >> 8) & 0xFF, color & 0xFF)[:components])
+            args = tuple(args)
+            # A batch skips unchanged writes itself when it flushes
+            if unbatched and widget._sent.get(setter) == args:
+                self.skipped += 1
+                continue
+            self.calls += 1
+            ok = widget._write(setter, getattr(self.wrappers, setter), *args) and ok
+        return ok
+
+def sent_colors(widget):
+    """{setter: arguments} of the color groups last sent to widget"""
+    sent = widget._sent
+    return {setter: sent[setter] for setter, _, _ in COLOR_SETTERS.get(widget._pool_kind, ())
+            if setter in sent}
+
+# Global instance
+_sheet = None
+
+def get_style_sheet():
+    """Get global style sheet instance
+
+    A new sheet is started when the wrappers are reloaded, since the
+    widgets it recolors belong to the previous library.
+    """
+    global _sheet
+    wrappers = get_wrappers()
+    if _sheet is None or _sheet.wrappers is not wrappers:
+        _sheet = StyleSheet(wrappers)
+    return _sheet
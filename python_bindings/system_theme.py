@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+System Theme Service for MojoGUI
+Cached desktop dark mode and colors, with change notifications
+
+The library detects the system theme once (the detection may run
+gsettings) and caches it. SystemTheme mirrors those values in Python,
+so reading them costs nothing, and poll() asks the library to re-detect
+only when the desktop's settings files changed on disk, which is a stat,
+not a subprocess. Subscribers are called with the SystemTheme after
+every change.
+
+Libraries built before the cache existed lack system_theme_poll(); the
+settings files are then watched from Python and the getters are only
+called again after one of them changed.
+
+The getters return C ints. dark_mode and accent_color use -1 for
+unknown; the window and text getters always return a color, and opaque
+white (0xFFFFFFFF) comes back from them as -1, so their values are
+masked back to unsigned 0xRRGGBBAA.
+"""
+
+import itertools
+import os
+
+try:
+    from .mid_level_wrappers import get_wrappers
+except ImportError:
+    from mid_level_wrappers import get_wrappers
+
+# Seconds between polls when an Application follows the system theme
+DEFAULT_POLL_INTERVAL = 1.0
+
+# Value of dark_mode and accent_color when the library could not detect it
+UNKNOWN = -1
+
+COLOR_MASK = 0xFFFFFFFF
+
+# Files desktop theme settings are stored in (GTK settings, dconf database)
+WATCHED_FILES = (
+    os.path.join('~', '.config', 'gtk-3.0', 'settings.ini'),
+    os.path.join('~', '.config', 'dconf', 'user'),
+)
+
+def _file_stamps():
+    """(mtime_ns, inode) per watched file; (0, 0) when missing"""
+    stamps = []
+    for path in WATCHED_FILES:
+        try:
+            info = os.stat(os.path.expanduser(path))
+        except OSError:
+            stamps.append((0, 0))
+        else:
+            stamps.append((info.st_mtime_ns, info.st_ino))
+    return tuple(stamps)
+
+class SystemTheme:
+    """System theme values, cached, with change subscribers"""
+
+    def __init__(self, wrappers=None):
+        self.wrappers = wrappers or get_wrappers()
+        self.native_poll = self.wrappers.is_function_available('system_theme_poll')
+        self._stamps = None if self.native_poll else _file_stamps()
+        self._subscribers = {}
+        self._tokens = itertools.count(1)
+        self.dark_mode = UNKNOWN
+        self.accent_color = UNKNOWN
+        self.window_color = UNKNOWN
+        self.text_color = UNKNOWN
+        self.changes = 0
+        self._load()
+
+    @property
+    def is_dark(self):
+        return self.dark_mode == 1
+
+    def values(self):
+        return {
+            'dark_mode': self.dark_mode,
+            'accent_color': self.accent_color,
+            'window_color': self.window_color,
+            'text_color': self.text_color,
+        }
+
+    def _load(self):
+        """Read the library's cached values; True if any differ from ours"""
+        wrappers = self.wrappers
+        accent = wrappers.get_system_accent_color()
+        values = (wrappers.get_system_dark_mode(),
+                  accent if accent == UNKNOWN else accent & COLOR_MASK,
+                  wrappers.get_system_window_color() & COLOR_MASK,
+                  wrappers.get_system_text_color() & COLOR_MASK)
+        if values == (self.dark_mode, self.accent_color, self.window_color, self.text_color):
+            return False
+        self.dark_mode, self.accent_color, self.window_color, self.text_color = values
+        return True
+
+    def subscribe(self, callback):
+        """Call callback(theme) after every change; returns a token for unsubscribe()"""
+        token = next(self._tokens)
+        self._subscribers[token] = callback
+        return token
+
+    def unsubscribe(self, token):
+        """Stop notifying a subscriber; returns False if the token was unknown"""
+        return self._subscribers.pop(token, None) is not None
+
+    def poll(self):
+        """Pick up a changed system theme; True (after notifying) if it changed"""
+        if self.native_poll:
+            if self.wrappers.system_theme_poll() <= 0:
+                return False
+        else:
+            stamps = _file_stamps()
+            if stamps == self._stamps:
+                return False
+            self._stamps = stamps
+        return self._changed()
+
+    def refresh(self):
+        """Re-detect now, whatever the settings files say (may run a subprocess)"""
+        self.wrappers.system_theme_refresh()
+        if not self.native_poll:
+            self._stamps = _file_stamps()
+        return self._changed()
+
+    def _changed(self):
+        if not self._load():
+            return False
+        self.changes += 1
+        for callback in list(self._subscribers.values()):
+            callback(self)
+        return True
+
+# Global instance
+_theme = None
+
+def get_system_theme():
+    """Get global system theme service
+
+    A new service is started when the wrappers are reloaded.
+    """
+    global _theme
+    wrappers = get_wrappers()
+    if _theme is None or _theme.wrappers is not wrappers:
+        _theme = SystemTheme(wrappers)
+    return _theme
@@ -324,6 +324,1476 @@ def test_integration_demo():
         print(f"❌ Integration demo failed: {e}")
         return False
 
+def test_headless_backend():
+    """Test the headless recording backend with the high-level API"""
+    print("\n🖥️  Testing Headless Backend")
+    print("===========================")
+    
+    import low_level_bindings
+    import mid_level_wrappers
+    
+    try:
+        bindings = low_level_bindings.reload_bindings(backend='headless')
+        mid_level_wrappers.reload_wrappers()
+        
+        from high_level_api import quick_demo
+        
+        app = quick_demo()
+        if not app:
+            print("❌ Failed to create demo application")
+            return False
+        
+        for i in range(3):
+            if not app.run_frame():
+                print(f"   Frame {i+1}: ❌")
+                return False
+        
+        checkbox = app.widgets[1]
+        app.handle_mouse_click(60, 110)
+        print(f"   CheckBox toggled: {checkbox.is_checked()}")
+        
+        stats = bindings.lib.stats()
+        print(f"   Frames recorded: {stats['frames']}")
+        print(f"   Calls recorded: {stats['total_calls']}")
+        print(f"   Avg frame time: {stats['avg_frame_time'] * 1000:.3f} ms")
+        
+        if stats['frames'] != 3 or not checkbox.is_checked():
+            print("❌ Headless backend recorded unexpected results")
+            return False
+        
+        print("✅ Headless backend working")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Headless backend failed: {e}")
+        return False
+    
+    finally:
+        low_level_bindings._bindings = None
+        mid_level_wrappers._wrappers = None
+
+def test_unchecked_wrappers():
+    """Test that the unchecked wrappers leave the widget layer checked"""
+    print("\n⚡ Testing Unchecked Wrappers")
+    print("============================")
+    
+    import low_level_bindings
+    import mid_level_wrappers
+    
+    try:
+        bindings = low_level_bindings.reload_bindings(backend='headless')
+        mid_level_wrappers.reload_wrappers()
+        
+        fast = mid_level_wrappers.get_wrappers(unchecked=True)
+        shared = mid_level_wrappers.get_wrappers()
+        if fast is shared or not fast.unchecked or shared.unchecked:
+            print("❌ Unchecked wrappers replaced the shared instance")
+            return False
+        
+        from high_level_api import create_app
+        
+        app = create_app("Unchecked Test", 800, 600)
+        button = app.create_button(10.5, 20, 80, 30, "Hi")
+        bar = app.create_progressbar(10, 60, 200, 20)
+        bar.set_value(33.5)
+        fast.draw_set_pos(5, 5)
+        
+        texts = [args[4] for _, args, _, _ in bindings.lib.calls('ButtonCreate')]
+        print(f"   Button text sent: {texts}")
+        
+        if button.widget_id < 0 or texts != [b"Hi"] \
+                or fast.draw_set_pos is not bindings.get_function('DrawSetPos_impl'):
+            print("❌ Widgets did not get coerced arguments")
+            return False
+        
+        print("✅ Unchecked wrappers working")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Unchecked wrappers failed: {e}")
+        return False
+    
+    finally:
+        low_level_bindings._bindings = None
+        mid_level_wrappers._wrappers = None
+        mid_level_wrappers._unchecked_wrappers = None
+
+def test_display_lists():
+    """Test cached display lists on the headless backend"""
+    print("\n🎞️ Testing Display Lists")
+    print("=======================")
+    
+    import low_level_bindings
+    import mid_level_wrappers
+    
+    try:
+        bindings = low_level_bindings.reload_bindings(backend='headless')
+        mid_level_wrappers.reload_wrappers()
+        
+        from high_level_api import Application
+        
+        app = Application("Display List Test", 800, 600)
+        app.init()
+        canvas = app.canvas
+        runs = []
+        
+        def background(c):
+            runs.append(len(runs))
+            c.draw_rect(0, 0, 100, 100)
+        
+        def broken(c):
+            c.draw_rect(0, 0, 50, 50)
+            raise ValueError("draw failed")
+        
+        canvas.draw_cached('bg', 1, background)
+        canvas.draw_cached('bg', 1, background)
+        try:
+            canvas.draw_cached('bg', 2, broken)
+        except ValueError:
+            pass
+        canvas.draw_cached('bg', 2, background)
+        print(f"   Recordings: {len(runs)}")
+        
+        if len(runs) != 2:
+            print("❌ A failed recording was replayed as valid")
+            return False
+        
+        print("✅ Display lists working")
+        return True
+    
+    except Exception as e:
+        print(f"❌ Display lists failed: {e}")
+        return False
+    
+    finally:
+        low_level_bindings._bindings = None
+        mid_level_wrappers._wrappers = None
+
+def test_bulk_drawing():
+    """Test batched Canvas drawing on the headless backend"""
+    print("\n📊 Testing Bulk Drawing")
+    print("======================")
+    
+    from array import array
+    import low_level_bindings
+    import mid_level_wrappers
+    
+    try:
+        bindings = low_level_bindings.reload_bindings(backend='headless')
+        mid_level_wrappers.reload_wrappers()
+        
+        from high_level_api import Application
+        from bulk_drawing import pack_color
+        
+        app = Application("Bulk Test", 800, 600)
+        app.init()
+        canvas = app.canvas
+        
+        points = array('i', [(i * 7) % 800 for i in range(10000 * 3)])
+        colors = array('I', [pack_color(255, 128, 0)] * 10000)
+        ok = canvas.draw_circles(points, colors)
+        ok = canvas.draw_rects([(0, 0, 10, 10), (20, 20, 10, 10)], pack_color(0, 0, 255)) and ok
+        ok = canvas.draw_lines([(0, 0, 100, 100)]) and ok
+        ok = canvas.draw_texts([(10, 10), (10, 30)], ["one", "two"]) and ok
+        
+        primitives = bindings.lib.primitive_counts
+        print(f"   Circles drawn: {primitives['draw_filled_circles']}")
+        print(f"   FFI calls for circles: {bindings.lib.call_counts['draw_filled_circles']}")
+        
+        if not ok or primitives['draw_filled_circles'] != 10000 or \
+                bindings.lib.call_counts['DrawCircle_impl'] != 0:
+            print("❌ Bulk drawing did not use the batch entry points")
+            return False
+        
+        # Libraries without batch entry points draw one primitive at a time
+        canvas._native_batches['draw_filled_rectangles'] = False
+        canvas.draw_rects([(0, 0, 10, 10), (20, 20, 10, 10)])
+        if bindings.lib.call_counts['DrawRect_impl'] != 2:
+            print("❌ Bulk drawing fallback failed")
+            return False
+        
+        print("✅ Bulk drawing working")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Bulk drawing failed: {e}")
+        return False
+    
+    finally:
+        low_level_bindings._bindings = None
+        mid_level_wrappers._wrappers = None
+
+def test_string_pool():
+    """Test string interning and unchanged-text skipping on the headless backend"""
+    print("\n🔤 Testing String Pool")
+    print("=====================")
+    
+    import low_level_bindings
+    import mid_level_wrappers
+    
+    try:
+        bindings = low_level_bindings.reload_bindings(backend='headless')
+        mid_level_wrappers.reload_wrappers()
+        
+        from high_level_api import Label
+        from string_pool import get_string_pool, StringPool
+        
+        labels = [Label(10, 10 + i * 20, 100, 20, "Idle") for i in range(3)]
+        bindings.lib.reset()
+        for frame in range(10):
+            for label in labels:
+                label.set_text("Status: OK")
+        
+        counts = bindings.lib.call_counts
+        print(f"   Text uploads: {counts['StringSet_impl']}")
+        print(f"   Label updates: {counts['LabelSetTextStringId']}")
+        
+        if counts['StringSet_impl'] != 1 or counts['LabelSetTextStringId'] != 3:
+            print("❌ Unchanged text crossed the FFI boundary")
+            return False
+        
+        pool = StringPool(max_idle=2)
+        for text in ("a", "b", "c"):
+            pool.intern(text)
+        if "a" in pool or pool.stats()['evictions'] != 1:
+            print("❌ Idle strings were not evicted in LRU order")
+            return False
+        
+        print(f"   Pool stats: {get_string_pool().stats()}")
+        print("✅ String pool working")
+        return True
+        
+    except Exception as e:
+        print(f"❌ String pool failed: {e}")
+        return False
+    
+    finally:
+        low_level_bindings._bindings = None
+        mid_level_wrappers._wrappers = None
+
+def test_text_metrics():
+    """Test cached and batched text measurement on the headless backend"""
+    print("\n📏 Testing Text Metrics")
+    print("======================")
+    
+    import low_level_bindings
+    import mid_level_wrappers
+    
+    try:
+        bindings = low_level_bindings.reload_bindings(backend='headless')
+        mid_level_wrappers.reload_wrappers()
+        
+        from text_metrics import TextMetrics
+        
+        from string_pool import get_string_pool
+        
+        lib = bindings.lib
+        wrappers = mid_level_wrappers.get_wrappers()
+        metrics = TextMetrics()
+        cells = [f"Row {i} Col {i % 7}" for i in range(50000)]
+        lib.reset()
+        widths = metrics.measure_many(cells, size=20)
+        measured = lib.call_counts['TextGetWidth_impl']
+        
+        def library_width(text, font_id):
+            return wrappers.text_get_width(get_string_pool().intern(text), font_id, 20)
+        
+        expected = library_width("Row 1 Col 1", 0)
+        print(f"   Strings measured: {len(widths)}")
+        print(f"   Native measurements: {measured}")
+        print(f"   Width of 'Row 1 Col 1': {widths[1]} (library: {expected})")
+        
+        if measured != 95 or widths[1] != expected:
+            print("❌ Text metrics did not measure from the advance table")
+            return False
+        
+        # Widths follow the font asked for; a font the library measures as
+        # 0 (nothing loaded) gets no table and is measured per string
+        lib.font_scales[1] = 1.5
+        lib.font_scales[2] = 0.0
+        bold = metrics.measure("Row 1 Col 1", size=20, font_id=1)
+        expected = library_width("Row 1 Col 1", 1)
+        lib.reset()
+        empty = metrics.measure_many(["a", "b"], size=20, font_id=2)
+        if bold != expected or bold == widths[1] \
+                or empty != [0, 0] or lib.call_counts['TextGetWidth_impl'] != 95 + 2:
+            print("❌ Text metrics ignored the font")
+            return False
+        
+        metrics.measure(cells[-1], size=20)
+        if metrics.stats()['hits'] != 1:
+            print("❌ Text metrics cache missed")
+            return False
+        
+        print("✅ Text metrics working")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Text metrics failed: {e}")
+        return False
+    
+    finally:
+        low_level_bindings._bindings = None
+        mid_level_wrappers._wrappers = None
+
+def test_damage_tracking():
+    """Test idle-frame skipping on the headless backend"""
+    print("\n🩹 Testing Damage Tracking")
+    print("=========================")
+    
+    import low_level_bindings
+    import mid_level_wrappers
+    
+    try:
+        bindings = low_level_bindings.reload_bindings(backend='headless')
+        mid_level_wrappers.reload_wrappers()
+        
+        from high_level_api import create_app
+        
+        app = create_app("Damage Test", 400, 300, damage_tracking=True)
+        label = app.create_label(10, 10, 200, 20, "Idle")
+        progress = app.create_progressbar(10, 40, 200, 20)
+        
+        for i in range(10):
+            app.run_frame()
+        label.set_text("Idle")
+        app.run_frame()
+        idle_frames = bindings.lib.stats()['frames']
+        
+        progress.set_value(50)
+        region = app.damaged_region
+        app.run_frame()
+        
+        print(f"   Frames rendered while idle: {idle_frames}")
+        print(f"   Frames skipped: {app.frames_skipped}")
+        print(f"   Damaged region: {region}")
+        
+        if idle_frames != 1 or app.frames_rendered != 2 or region != (10, 40, 210, 60):
+            print("❌ Damage tracking rendered unexpected frames")
+            return False
+        
+        print("✅ Damage tracking working")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Damage tracking failed: {e}")
+        return False
+    
+    finally:
+        low_level_bindings._bindings = None
+        mid_level_wrappers._wrappers = None
+
+def test_spatial_index():
+    """Test grid-indexed hit testing on the headless backend"""
+    print("\n🗺️  Testing Spatial Index")
+    print("========================")
+    
+    import time
+    import low_level_bindings
+    import mid_level_wrappers
+    
+    try:
+        bindings = low_level_bindings.reload_bindings(backend='headless')
+        mid_level_wrappers.reload_wrappers()
+        
+        from high_level_api import Application
+        
+        app = Application("Index Test", 1600, 1200)
+        app.init()
+        for i in range(2000):
+            app.create_checkbox((i % 50) * 32, (i // 50) * 30, 20, 20)
+        overlay = app.create_checkbox(0, 0, 20, 20)
+        
+        bindings.lib.reset()
+        start = time.perf_counter()
+        for i in range(1000):
+            app.handle_mouse_click(5 + (i % 50) * 32, 5 + (i % 40) * 30)
+        elapsed = time.perf_counter() - start
+        hit_tests = bindings.lib.call_counts['CheckBoxHandleClick']
+        
+        print(f"   1000 clicks over 2001 widgets: {elapsed * 1000:.1f} ms")
+        print(f"   Native hit tests: {hit_tests}")
+        
+        if hit_tests != 1000 or app.widget_at(5, 5) is not overlay:
+            print("❌ Hit testing did not use the index or z-order")
+            return False
+        
+        overlay.set_position(600, 600)
+        app.remove_widget(app.widgets[0])
+        if app.widget_at(5, 5) is not None or app.widget_at(605, 605) is not overlay:
+            print("❌ Index not updated after move/remove")
+            return False
+        
+        print("✅ Spatial index working")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Spatial index failed: {e}")
+        return False
+    
+    finally:
+        low_level_bindings._bindings = None
+        mid_level_wrappers._wrappers = None
+
+def test_event_dispatch():
+    """Test capability-based event dispatch on the headless backend"""
+    print("\n🎯 Testing Event Dispatch")
+    print("========================")
+    
+    import low_level_bindings
+    import mid_level_wrappers
+    
+    try:
+        bindings = low_level_bindings.reload_bindings(backend='headless')
+        mid_level_wrappers.reload_wrappers()
+        
+        from high_level_api import Application
+        
+        app = Application("Dispatch Test", 800, 600)
+        app.init()
+        sliders = [app.create_slider(10, 10 + i * 25, 200, 20) for i in range(500)]
+        for i in range(500):
+            app.create_label(300, i * 12, 100, 10, "Label")
+        
+        bindings.lib.reset()
+        app.handle_mouse_click(50, 40)
+        for x in range(50, 150, 10):
+            app.handle_mouse_drag(x, 40)
+        app.handle_mouse_release(150, 40)
+        
+        drags = bindings.lib.call_counts['SliderHandleDrag']
+        print(f"   Drag calls across 500 sliders: {drags}")
+        print(f"   Final value: {sliders[1].value}")
+        
+        if drags != 1 or app.captured is not None or sliders[1].dragging or sliders[1].value != 65:
+            print("❌ Drag was not routed to the captured widget only")
+            return False
+        
+        print("✅ Event dispatch working")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Event dispatch failed: {e}")
+        return False
+    
+    finally:
+        low_level_bindings._bindings = None
+        mid_level_wrappers._wrappers = None
+
+def test_event_loop():
+    """Test the event-driven main loop on the headless backend"""
+    print("\n⏱️  Testing Event Loop")
+    print("=====================")
+    
+    import threading
+    import time
+    import low_level_bindings
+    import mid_level_wrappers
+    
+    try:
+        bindings = low_level_bindings.reload_bindings(backend='headless')
+        mid_level_wrappers.reload_wrappers()
+        
+        from high_level_api import create_app
+        
+        app = create_app("Loop Test", 400, 300)
+        label = app.create_label(10, 10, 100, 20, "0")
+        ticks = []
+        
+        def tick(app):
+            ticks.append(time.perf_counter())
+            label.set_text(str(len(ticks)))
+        
+        ticker = app.add_timer(0.05, tick)
+        app.add_timer(0.3, lambda app: app.quit(), repeat=False)
+        threading.Timer(0.12, bindings.lib.post_input).start()
+        profiler = app.enable_profiler()
+        
+        cpu_start = time.process_time()
+        ok = app.run(max_fps=60, vsync=False)
+        cpu = time.process_time() - cpu_start
+        
+        print(f"   Frames rendered: {app.frames_rendered}")
+        print(f"   Timer ticks: {len(ticks)}")
+        print(f"   CPU time for 0.3 s: {cpu * 1000:.1f} ms")
+        
+        # One initial frame and one per tick; input no widget sees redraws nothing
+        if not ok or len(ticks) < 4 or app.frames_rendered > len(ticks) + 1 \
+                or bindings.lib.swap_interval != 0:
+            print("❌ Event loop rendered unexpected frames")
+            return False
+        if profiler.phases['poll_events'].count < len(ticks):
+            print("❌ Event loop waits were not profiled")
+            return False
+        
+        # Without wait_events() the loop sleeps and polls; an idle poll redraws nothing
+        del bindings.functions['wait_events']
+        bindings._missing.add('wait_events')
+        app.cancel_timer(ticker)
+        frames = app.frames_rendered
+        app.add_timer(0.3, lambda app: app.quit(), repeat=False)
+        app.run(max_fps=60)
+        print(f"   Frames rendered by the polling fallback: {app.frames_rendered - frames}")
+        if app.gui.wait_events(0) != 0 or app.frames_rendered - frames > 1:
+            print("❌ Polling fallback redrew while idle")
+            return False
+        
+        print("✅ Event loop working")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Event loop failed: {e}")
+        return False
+    
+    finally:
+        low_level_bindings._bindings = None
+        mid_level_wrappers._wrappers = None
+
+def test_async_loop():
+    """Test run_async() and awaitable widget events on the headless backend"""
+    print("\n🔀 Testing Async Loop")
+    print("====================")
+    
+    import asyncio
+    import low_level_bindings
+    import mid_level_wrappers
+    
+    try:
+        low_level_bindings.reload_bindings(backend='headless')
+        mid_level_wrappers.reload_wrappers()
+        
+        from high_level_api import create_app
+        
+        app = create_app("Async Test", 400, 300)
+        button = app.create_button(10, 10, 100, 30, "Go")
+        other_work = []
+        
+        async def main():
+            async def click_later():
+                for _ in range(5):
+                    other_work.append(1)
+                    await asyncio.sleep(0.01)
+                app.handle_mouse_click(20, 20)
+            
+            async def wait_then_quit():
+                clicked = await button.wait_clicked()
+                app.quit()
+                return clicked
+            
+            waiter = asyncio.ensure_future(wait_then_quit())
+            asyncio.ensure_future(click_later())
+            ok = await app.run_async(max_fps=60)
+            return ok, await waiter
+        
+        ok, clicked = asyncio.run(main())
+        
+        print(f"   Frames rendered: {app.frames_rendered}")
+        print(f"   Other task steps: {len(other_work)}")
+        
+        if not ok or clicked is not button or len(other_work) != 5 or app.frames_rendered > 3:
+            print("❌ Async loop did not interleave with other tasks")
+            return False
+        
+        print("✅ Async loop working")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Async loop failed: {e}")
+        return False
+    
+    finally:
+        low_level_bindings._bindings = None
+        mid_level_wrappers._wrappers = None
+
+def test_frame_profiler():
+    """Test per-phase and per-widget frame timing on the headless backend"""
+    print("\n📈 Testing Frame Profiler")
+    print("========================")
+    
+    import time
+    import low_level_bindings
+    import mid_level_wrappers
+    
+    try:
+        bindings = low_level_bindings.reload_bindings(backend='headless')
+        mid_level_wrappers.reload_wrappers()
+        
+        from high_level_api import create_app, Label
+        
+        class SlowLabel(Label):
+            def draw(self):
+                time.sleep(0.002)
+                return super().draw()
+        
+        app = create_app("Profiler Test", 400, 300)
+        app.create_label(10, 10, 100, 20, "Fast")
+        slow = app.add_widget(SlowLabel(10, 40, 100, 20, "Slow"))
+        button = app.create_button(10, 70, 100, 30, "Click")
+        button.set_click_handler(lambda b: time.sleep(0.001))
+        
+        profiler = app.enable_profiler(capacity=8, overlay=True)
+        for i in range(12):
+            app.run_frame()
+        app.handle_mouse_click(20, 80)
+        
+        report = profiler.report()
+        slowest = profiler.slowest_widgets(1)
+        print(profiler.format_report())
+        
+        if report['frame']['count'] != 8 or report['callback']['count'] != 1 \
+                or report['draw']['p50'] < 2.0 or not slowest \
+                or not slowest[0][0].startswith("SlowLabel 'Slow'"):
+            print("❌ Profiler report is wrong")
+            return False
+        if bindings.lib.primitive_counts['draw_texts'] == 0:
+            print("❌ Profiler overlay was not drawn")
+            return False
+        
+        print("✅ Frame profiler working")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Frame profiler failed: {e}")
+        return False
+    
+    finally:
+        low_level_bindings._bindings = None
+        mid_level_wrappers._wrappers = None
+
+def test_widget_registry():
+    """Test packed widget storage and bulk operations on the headless backend"""
+    print("\n🗃️  Testing Widget Registry")
+    print("==========================")
+    
+    import sys
+    import low_level_bindings
+    import mid_level_wrappers
+    
+    try:
+        bindings = low_level_bindings.reload_bindings(backend='headless')
+        mid_level_wrappers.reload_wrappers()
+        
+        from high_level_api import create_app
+        
+        app = create_app("Registry Test", 1600, 1200)
+        registry = app.registry
+        buttons = [registry.create_button((i % 100) * 16, (i // 100) * 12, 14, 10, "B")
+                   for i in range(20000)]
+        clicked = []
+        registry.set_click_handler('button', clicked.append)
+        
+        table = registry.table('button')
+        table.set_visible(False, range(0, 20000, 2))
+        table.move_by(0, 5, range(1, 20000, 2))
+        
+        bindings.lib.reset()
+        app.run_frame()
+        draws = bindings.lib.call_counts['DrawButton']
+        app.handle_mouse_click(16 + 5, 12 + 8)
+        
+        print(f"   Widgets: {len(registry)}, packed bytes: {table.nbytes()}")
+        print(f"   Handle size: {sys.getsizeof(buttons[0])} bytes")
+        print(f"   Buttons drawn: {draws}")
+        
+        if draws != 10000 or clicked != [buttons[101]] or hasattr(buttons[0], '__dict__'):
+            print("❌ Registry bulk operations gave unexpected results")
+            return False
+        
+        # Moves reach the native widget, which hit-tests clicks at its own bounds
+        lib = bindings.lib
+        moved = buttons[3]
+        moved.set_position(1500, 1100)
+        clicked.clear()
+        app.handle_mouse_click(1505, 1105)
+        box = registry.create_checkbox(0, 1150, 10, 10)
+        try:
+            box.set_position(5, 5)
+            refused = False
+        except TypeError:
+            refused = True
+        if clicked != [moved] or lib.widgets[('Button', moved.widget_id)]['bounds'] != (1500, 1100, 14, 10) \
+                or lib.widgets[('Button', buttons[101].widget_id)]['bounds'][1] != 17 \
+                or not refused or box.x != 0:
+            print("❌ Registry moves did not reach the native widgets")
+            return False
+        
+        buttons[101].release()
+        replacement = registry.create_label(0, 0, 10, 10, "L")
+        reused = registry.create_button(0, 0, 10, 10, "Again")
+        if buttons[101].alive or reused.row != 101 or reused == buttons[101] \
+                or replacement.kind != 'label':
+            print("❌ Released rows were not recycled safely")
+            return False
+        
+        # A recycled low row still stacks above the widgets created before it
+        replacement.release()
+        older = registry.create_button(2, 2, 10, 10, "Older")
+        reused.release()
+        newer = registry.create_button(4, 4, 10, 10, "Newer")
+        clicked.clear()
+        app.handle_mouse_click(8, 8)
+        if newer.row != 101 or registry.hit_test(8, 8) != newer or clicked != [newer]:
+            print("❌ A recycled row was stacked below older widgets")
+            return False
+        
+        print("✅ Widget registry working")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Widget registry failed: {e}")
+        return False
+    
+    finally:
+        low_level_bindings._bindings = None
+        mid_level_wrappers._wrappers = None
+
+def test_widget_pool():
+    """Test native widget ID recycling and close() on the headless backend"""
+    print("\n♻️  Testing Widget Pool")
+    print("======================")
+    
+    import gc
+    import low_level_bindings
+    import mid_level_wrappers
+    
+    try:
+        bindings = low_level_bindings.reload_bindings(backend='headless')
+        mid_level_wrappers.reload_wrappers()
+        
+        from high_level_api import create_app, CheckBox
+        
+        app = create_app("Pool Test", 400, 600)
+        rows = []
+        for rebuild in range(10):
+            for row in rows:
+                row.close()
+            rows = [app.create_label(10, 10 + i * 20, 200, 18, f"Row {i}") for i in range(20)]
+            rows += [app.create_checkbox(220, 10 + i * 20, 18, 18) for i in range(20)]
+            if rebuild == 0:
+                bindings.lib.reset()
+            rows[20].set_checked(True)
+        
+        counts = bindings.lib.call_counts
+        creates = counts['LabelCreate'] + counts['CheckBoxCreate']
+        destroys = counts['LabelDestroy'] + counts['CheckBoxDestroy']
+        print(f"   Native creates/destroys over 9 rebuilds: {creates}/{destroys}")
+        print(f"   Text updates: {counts['LabelSetText']}")
+        
+        if creates or destroys or counts['LabelSetText'] or len(app.widgets) != 40:
+            print("❌ Rebuilt rows did not reuse pooled native IDs")
+            return False
+        
+        with app.create_button(10, 500, 80, 30, "Temp"):
+            pass
+        moved = app.create_button(100, 520, 60, 20, "Moved")
+        CheckBox(300, 300, 18, 18).set_checked(True)
+        gc.collect()
+        report = app.widget_report()
+        print(f"   Report: {report}")
+        
+        if report['button']['reused'] != 1 or report['checkbox']['leaked'] != 1 \
+                or bindings.lib.widgets[('Button', moved.widget_id)]['bounds'] != (100, 520, 60, 20):
+            print("❌ Pool report or reused button bounds are wrong")
+            return False
+        
+        app.close()
+        report = app.widget_report()
+        if any(kind['in_use'] or kind['pooled'] for kind in report.values()):
+            print("❌ close() left native widgets behind")
+            return False
+        
+        # A widget whose constructor failed is still collected quietly
+        import sys
+        import high_level_api
+        unraisable = []
+        hook, sys.unraisablehook = sys.unraisablehook, unraisable.append
+        real_get_wrappers = high_level_api.get_wrappers
+        def broken_get_wrappers():
+            raise RuntimeError("library not loaded")
+        high_level_api.get_wrappers = broken_get_wrappers
+        try:
+            CheckBox(0, 0, 18, 18)
+        except RuntimeError:
+            pass
+        finally:
+            high_level_api.get_wrappers = real_get_wrappers
+            gc.collect()
+            sys.unraisablehook = hook
+        if unraisable:
+            print(f"❌ Collecting a half-built widget raised: {unraisable[0].exc_value!r}")
+            return False
+        
+        print("✅ Widget pool working")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Widget pool failed: {e}")
+        return False
+    
+    finally:
+        low_level_bindings._bindings = None
+        mid_level_wrappers._wrappers = None
+
+def test_property_batch():
+    """Test coalesced native property writes on the headless backend"""
+    print("\n📦 Testing Property Batch")
+    print("========================")
+    
+    import low_level_bindings
+    import mid_level_wrappers
+    
+    try:
+        bindings = low_level_bindings.reload_bindings(backend='headless')
+        mid_level_wrappers.reload_wrappers()
+        
+        from high_level_api import create_app
+        
+        app = create_app("Batch Test", 800, 600)
+        buttons = [app.create_button(10, 10 + i * 5, 80, 4, "Idle") for i in range(100)]
+        
+        def relayout(width):
+            for i, button in enumerate(buttons):
+                button.set_position(width - 90, 10 + i * 5)
+                button.set_size(80, 4)
+                button.set_text("Busy")
+                button.set_text("Ready")
+        
+        bindings.lib.reset()
+        relayout(700)
+        unbatched = sum(bindings.lib.call_counts.values())
+        
+        bindings.lib.reset()
+        with app.batch() as batch:
+            for width in (600, 650, 700):
+                relayout(width)
+            if sum(bindings.lib.call_counts.values()):
+                print("❌ Writes crossed FFI inside the batch")
+                return False
+        batched = sum(bindings.lib.call_counts.values())
+        
+        print(f"   Native calls without batch: {unbatched}")
+        print(f"   Native calls for 3 batched relayouts: {batched}")
+        print(f"   Batch stats: {batch.stats()}")
+        
+        if batched != 0 or app.widget_at(615, 12) is not buttons[0]:
+            print("❌ Unchanged properties were re-sent or the index is stale")
+            return False
+        
+        bindings.lib.reset()
+        with app.batch():
+            relayout(500)
+            relayout(400)
+        if sum(bindings.lib.call_counts.values()) != 100 or app.widget_at(315, 12) is not buttons[0]:
+            print("❌ Batched relayout did not send one position per widget")
+            return False
+        
+        bindings.lib.reset()
+        
+        with buttons[0].batch():
+            buttons[0].set_position(0, 0)
+            buttons[0].set_position(5, 5)
+        if bindings.lib.call_counts['ButtonSetPosition'] != 1 or \
+                bindings.lib.widgets[('Button', buttons[0].widget_id)]['bounds'][:2] != (5, 5):
+            print("❌ Widget batch did not coalesce writes")
+            return False
+        
+        print("✅ Property batch working")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Property batch failed: {e}")
+        return False
+    
+    finally:
+        low_level_bindings._bindings = None
+        mid_level_wrappers._wrappers = None
+
+def test_slider_notifications():
+    """Test coalesced slider drags and rate-limited change handlers"""
+    print("\n🎚️ Testing Slider Notifications")
+    print("==============================")
+    
+    import low_level_bindings
+    import mid_level_wrappers
+    
+    try:
+        bindings = low_level_bindings.reload_bindings(backend='headless')
+        mid_level_wrappers.reload_wrappers()
+        
+        from high_level_api import create_app
+        from change_notifier import ChangeNotifier
+        
+        emitted = []
+        notifier = ChangeNotifier(emitted.append, 'throttle', 0.1)
+        notifier.notify(1, now=0.0)
+        notifier.notify(2, now=0.01)
+        deadline = notifier.notify(3, now=0.02)
+        if emitted != [1] or deadline != 0.1 or notifier.poll(0.05) != 0.1:
+            print("❌ Throttle did not hold back the burst")
+            return False
+        notifier.poll(0.1)
+        if emitted != [1, 3] or notifier.pending:
+            print("❌ Throttle did not deliver the last value of the burst")
+            return False
+        
+        app = create_app("Slider Test", 800, 600)
+        slider = app.create_slider(10, 10, 200, 20)
+        changes = []
+        commits = []
+        slider.set_change_handler(lambda s, value: changes.append(value), 'debounce', 10.0)
+        slider.set_commit_handler(lambda s, value: commits.append(value))
+        
+        bindings.lib.reset()
+        app.handle_mouse_click(50, 20)
+        for x in range(50, 150, 2):
+            app.handle_mouse_drag(x, 20)
+        app.render()
+        drags = bindings.lib.call_counts['SliderHandleDrag']
+        print(f"   Drag calls for 50 motion events in one frame: {drags}")
+        print(f"   Changes before release: {changes}")
+        
+        if drags != 1 or changes or slider.value != 69 or app._next_timer_deadline() is None:
+            print("❌ Drags were not coalesced or the change was not debounced")
+            return False
+        
+        app.handle_mouse_drag(160, 20)
+        app.handle_mouse_release(160, 20)
+        print(f"   Changes / commits after release: {changes} / {commits}")
+        
+        if changes != [75] or commits != [75] or slider.dragging:
+            print("❌ Release did not flush the change and commit the final value")
+            return False
+        
+        app.update()
+        if app._notifiers or app._next_timer_deadline() is not None:
+            print("❌ Delivered notifier was still scheduled")
+            return False
+        
+        print("✅ Slider notifications working")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Slider notifications failed: {e}")
+        return False
+    
+    finally:
+        low_level_bindings._bindings = None
+        mid_level_wrappers._wrappers = None
+
+def test_progress_feed():
+    """Test thread-safe progress feeds on the headless backend"""
+    print("\n📶 Testing Progress Feed")
+    print("=======================")
+    
+    import threading
+    import low_level_bindings
+    import mid_level_wrappers
+    
+    try:
+        bindings = low_level_bindings.reload_bindings(backend='headless')
+        mid_level_wrappers.reload_wrappers()
+        
+        from high_level_api import create_app
+        
+        app = create_app("Feed Test", 800, 600)
+        bar = app.create_progressbar(10, 10, 300, 20)
+        feed = bar.feed()
+        
+        def worker(task):
+            for _ in range(2000):
+                task.advance()
+        
+        tasks = [feed.task(total=2000) for _ in range(4)]
+        tasks.append(feed.task(total=10, weight=4))
+        bindings.lib.reset()
+        threads = [threading.Thread(target=worker, args=(task,)) for task in tasks[:4]]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        if bindings.lib.call_counts['ProgressBarSetValue']:
+            print("❌ Worker updates crossed FFI")
+            return False
+        
+        app.update()
+        print(f"   Updates reported: {feed.updates}")
+        print(f"   Native writes after one frame: {bindings.lib.call_counts['ProgressBarSetValue']}")
+        print(f"   Aggregated value: {bar.value}")
+        
+        if bindings.lib.call_counts['ProgressBarSetValue'] != 1 or bar.value != 50.0:
+            print("❌ Sub-tasks were not aggregated into one write")
+            return False
+        
+        tasks[4].update(10)
+        feed.set_label("Done")
+        app.update()
+        app.update()
+        if bindings.lib.call_counts['ProgressBarSetValue'] != 2 or bar.value != 100.0 \
+                or bar.label_text != "Done":
+            print("❌ Latest feed state was not applied exactly once")
+            return False
+        
+        app.remove_widget(bar)
+        feed.reset()
+        app.update()
+        if bar.value != 100.0 or app._fed:
+            print("❌ Removed bar was still fed")
+            return False
+        
+        print("✅ Progress feed working")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Progress feed failed: {e}")
+        return False
+    
+    finally:
+        low_level_bindings._bindings = None
+        mid_level_wrappers._wrappers = None
+
+def test_state_snapshot():
+    """Test the per-frame widget state cache on the headless backend"""
+    print("\n🗂️ Testing State Snapshot")
+    print("========================")
+    
+    import low_level_bindings
+    import mid_level_wrappers
+    
+    try:
+        bindings = low_level_bindings.reload_bindings(backend='headless')
+        mid_level_wrappers.reload_wrappers()
+        
+        from high_level_api import create_app
+        
+        app = create_app("Snapshot Test", 800, 600)
+        boxes = [app.create_checkbox(10, 10 + i * 20, 18, 18) for i in range(100)]
+        sliders = [app.create_slider(100, 10 + i * 20, 200, 18) for i in range(100)]
+        buttons = [app.create_button(400, 10 + i * 20, 80, 18, "B") for i in range(100)]
+        
+        app.handle_mouse_click(12, 52)
+        app.handle_mouse_release(12, 52)
+        app.handle_mouse_move(420, 70)
+        
+        bindings.lib.reset()
+        app.update()
+        frame_calls = bindings.lib.call_counts['ButtonUpdateAll']
+        bindings.lib.reset()
+        for _ in range(3):
+            checked = [box.is_checked() for box in boxes]
+            values = [slider.get_value() for slider in sliders]
+            hovered = [button.is_hovered() for button in buttons]
+        calls = sum(bindings.lib.call_counts.values())
+        
+        print(f"   Widgets in snapshot: {len(app.snapshot)}")
+        print(f"   Native calls for one frame of 900 getters: {calls}")
+        
+        if frame_calls != 1 or calls != 300 or checked.count(True) != 1 or not checked[2] \
+                or hovered.count(True) != 1 or not hovered[3] or any(values):
+            print("❌ Getters did not read each widget once")
+            return False
+        
+        # Later frames reuse the stored state; a pointer move re-reads only
+        # the buttons under its old and new position
+        app.update()
+        app.handle_mouse_move(420, 90)
+        app.update()
+        bindings.lib.reset()
+        checked = [box.is_checked() for box in boxes]
+        values = [slider.get_value() for slider in sliders]
+        hovered = [button.is_hovered() for button in buttons]
+        calls = sum(bindings.lib.call_counts.values())
+        print(f"   Native calls for 300 getters after a pointer move: {calls}")
+        
+        if calls != 2 or hovered.count(True) != 1 or not hovered[4] or not checked[2]:
+            print("❌ Frame cost grew with the number of widgets")
+            return False
+        
+        bindings.lib.reset()
+        boxes[5].set_checked(True)
+        sliders[7].set_value(40)
+        if not boxes[5].is_checked() or sliders[7].get_value() != 40 \
+                or bindings.lib.call_counts['CheckBoxGetState'] or bindings.lib.call_counts['SliderGetValue']:
+            print("❌ Python-side changes were not visible before the next frame")
+            return False
+        
+        app.remove_widget(boxes[0])
+        app.update()
+        if not boxes[2].is_checked() or not boxes[5].is_checked() or boxes[99].is_checked() \
+                or sliders[7].get_value() != 40 or len(app.snapshot) != 299:
+            print("❌ Snapshot rows were mixed up after a removal")
+            return False
+        
+        # Idle wake-ups of the event loop render nothing and refresh nothing
+        refreshes = app.snapshot.frame
+        rendered = app.frames_rendered
+        app.add_timer(0.15, lambda app: app.quit(), repeat=False)
+        app.run(idle_timeout=0.01)
+        if app.snapshot.frame - refreshes > app.frames_rendered - rendered:
+            print("❌ Idle wake-ups refreshed the snapshot")
+            return False
+        
+        print("✅ State snapshot working")
+        return True
+        
+    except Exception as e:
+        print(f"❌ State snapshot failed: {e}")
+        return False
+    
+    finally:
+        low_level_bindings._bindings = None
+        mid_level_wrappers._wrappers = None
+
+def test_shared_styles():
+    """Test shared styles and theme switching on the headless backend"""
+    print("\n🎨 Testing Shared Styles")
+    print("=======================")
+    
+    import low_level_bindings
+    import mid_level_wrappers
+    
+    try:
+        bindings = low_level_bindings.reload_bindings(backend='headless')
+        mid_level_wrappers.reload_wrappers()
+        
+        from high_level_api import create_app
+        from styles import StyleSheet, LIGHT_THEME, DARK_THEME
+        from bulk_drawing import pack_color
+        
+        app = create_app("Style Test", 800, 600)
+        buttons = [app.create_button(10, i, 80, 1, "B") for i in range(500)]
+        boxes = [app.create_checkbox(100, i, 1, 1) for i in range(200)]
+        for widget in buttons + boxes:
+            widget.set_style()
+        
+        red = pack_color(200, 0, 0)
+        buttons[0].override_style(background=red)
+        buttons[0].override_style(text=red)
+        
+        lib = bindings.lib
+        lib.reset()
+        app.apply_theme(DARK_THEME)
+        calls = sum(lib.call_counts.values())
+        print(f"   Styled widgets: {len(buttons) + len(boxes)}")
+        print(f"   Native calls for a theme switch: {calls}")
+        
+        # Every color group changes between the two themes, except the
+        # overridden button's background/text group
+        if calls != 4 * len(buttons) + 2 * len(boxes) - 1 \
+                or lib.call_counts['ButtonSetColors'] != len(buttons) - 1:
+            print("❌ Theme switch did not send one call per widget color group")
+            return False
+        
+        shared = buttons[1]._sent['button_set_colors'][1:]
+        private = buttons[0]._sent['button_set_colors'][1:]
+        hover = buttons[0]._sent['button_set_hover_colors'][1:]
+        if shared[:4] != (55, 55, 62, 255) or private != (200, 0, 0, 255) * 2 \
+                or hover[:4] != (70, 75, 90, 255) \
+                or buttons[1].style is not buttons[2].style:
+            print("❌ Copy-on-write override lost the override or the theme")
+            return False
+        
+        lib.reset()
+        app.apply_theme(DARK_THEME)
+        buttons[0].override_style(text=red)
+        if sum(lib.call_counts.values()):
+            print("❌ Unchanged color groups were sent again")
+            return False
+        
+        private = buttons[0].style
+        private_id = buttons[0].widget_id
+        buttons[0].close()
+        if private in buttons[1].style.children or buttons[0].style is not None:
+            print("❌ Closing a widget did not release its private style")
+            return False
+        
+        reused = app.create_button(10, 0, 80, 1, "B")
+        if reused.widget_id != private_id or reused.style is not buttons[1].style \
+                or reused._sent['button_set_colors'][1:] != buttons[1]._sent['button_set_colors'][1:]:
+            print("❌ A recycled ID kept the previous owner's colors")
+            return False
+        
+        sheet = StyleSheet(theme=LIGHT_THEME)
+        widget = buttons[3]
+        widget._style = None
+        lib.reset()
+        sheet.assign(widget, sheet.style('button'))
+        sheet.apply_theme(DARK_THEME)
+        if lib.call_counts['ButtonSetColors'] != 2 or lib.call_counts['ButtonSetBorderColors'] != 2:
+            print("❌ Standalone style sheet did not send the theme colors")
+            return False
+        
+        print("✅ Shared styles working")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Shared styles failed: {e}")
+        return False
+    
+    finally:
+        low_level_bindings._bindings = None
+        mid_level_wrappers._wrappers = None
+
+def test_system_theme():
+    """Test the cached, change-notified system theme on the headless backend"""
+    print("\n🌗 Testing System Theme")
+    print("======================")
+    
+    import low_level_bindings
+    import mid_level_wrappers
+    
+    try:
+        bindings = low_level_bindings.reload_bindings(backend='headless')
+        mid_level_wrappers.reload_wrappers()
+        
+        from high_level_api import create_app
+        from styles import DARK_THEME
+        
+        app = create_app("Theme Test", 800, 600)
+        button = app.create_button(10, 10, 80, 20, "B")
+        button.set_style()
+        system = app.follow_system_theme()
+        lib = bindings.lib
+        
+        seen = []
+        system.subscribe(lambda theme: seen.append(theme.dark_mode))
+        
+        lib.reset()
+        for _ in range(100):
+            system.dark_mode, system.text_color
+            system.poll()
+        reads = sum(count for name, count in lib.call_counts.items() if name.startswith('get_system_'))
+        print(f"   Getter calls for 100 polls without a change: {reads}")
+        
+        if reads or seen or system.is_dark:
+            print("❌ Unchanged theme was re-read")
+            return False
+        
+        lib.set_system_theme(dark_mode=1, text_color=0xFFFFFFFF)
+        lib.reset()
+        system.poll()
+        system.poll()
+        colors = lib.calls('ButtonSetColors')
+        print(f"   Notifications after a change: {seen}")
+        
+        if seen != [1] or not system.is_dark or system.text_color != 0xFFFFFFFF \
+                or lib.call_counts['get_system_dark_mode'] != 1 \
+                or len(colors) != 1 or colors[0][1][1:4] != (55, 55, 62):
+            print("❌ Theme change was not picked up once and applied")
+            return False
+        
+        # The getters return C ints: -1 is an unknown accent, not a color
+        lib.set_system_theme(accent_color=-1)
+        system.poll()
+        if system.accent_color != -1 or system.text_color != 0xFFFFFFFF:
+            print("❌ Unknown theme values were not recognised")
+            return False
+        
+        timer_id = app._theme_follow[2]
+        app.close()
+        if app._theme_follow is not None or timer_id in app._timers or len(system._subscribers) != 1:
+            print("❌ Closing the app did not stop following the theme")
+            return False
+        
+        print("✅ System theme working")
+        return True
+        
+    except Exception as e:
+        print(f"❌ System theme failed: {e}")
+        return False
+    
+    finally:
+        low_level_bindings._bindings = None
+        mid_level_wrappers._wrappers = None
+
+def test_checkbox_group():
+    """Test the lazily stamped checkbox group model on the headless backend"""
+    print("\n☑️ Testing CheckBox Group")
+    print("========================")
+    
+    import random
+    import low_level_bindings
+    import mid_level_wrappers
+    
+    try:
+        bindings = low_level_bindings.reload_bindings(backend='headless')
+        mid_level_wrappers.reload_wrappers()
+        
+        from high_level_api import create_app
+        from checkbox_group import CheckBoxGroup, UNCHECKED, CHECKED, INDETERMINATE
+        
+        group = CheckBoxGroup()
+        roots = [group.add() for _ in range(10)]
+        leaves = [group.add(root) for root in roots for _ in range(300)]
+        
+        group.set(leaves[0], True)
+        if group.state(roots[0]) != INDETERMINATE or group.state(roots[1]) != UNCHECKED:
+            print("❌ Leaf change did not make its parent indeterminate")
+            return False
+        
+        group.set_all(True)
+        group.set(leaves[5], False)
+        group.set(roots[2], False)
+        print(f"   Items: {len(group)}, checked leaves: {group.count_checked()}")
+        
+        if group.count_checked() != 2699 or group.state(roots[0]) != INDETERMINATE \
+                or group.state(roots[2]) != UNCHECKED or group.state(roots[3]) != CHECKED \
+                or leaves[5] in group.checked() or sum(group.as_array()) != 2699:
+            print("❌ Set-all, subtree and query results disagree")
+            return False
+        
+        # Random operations, interleaved with adds, against a brute-force model
+        rng = random.Random(7)
+        tree = CheckBoxGroup()
+        parents = []
+        model = {}      # leaf -> checked
+        
+        def subtree_leaves(item):
+            leaves = []
+            for leaf in model:
+                node = leaf
+                while node >= 0 and node != item:
+                    node = parents[node]
+                if node == item:
+                    leaves.append(leaf)
+            return leaves
+        
+        for step in range(600):
+            op = rng.random()
+            if op < 0.35 or not parents:
+                parent = rng.randrange(-1, len(parents)) if parents else -1
+                checked = rng.random() < 0.5
+                tree.add(parent, checked)
+                model.pop(parent, None)
+                model[len(parents)] = checked
+                parents.append(parent)
+            elif op < 0.4:
+                value = rng.random() < 0.5
+                tree.set_all(value)
+                model = dict.fromkeys(model, value)
+            else:
+                item = rng.randrange(len(parents))
+                value = rng.random() < 0.5
+                tree.set(item, value)
+                for leaf in subtree_leaves(item):
+                    model[leaf] = value
+        expected_checked = sorted(leaf for leaf, value in model.items() if value)
+        if tree.checked() != expected_checked or tree.count_checked() != len(expected_checked):
+            print("❌ Checked leaves disagree with the brute-force model")
+            return False
+        for item in range(len(tree)):
+            subtree = subtree_leaves(item)
+            count = sum(model[leaf] for leaf in subtree)
+            expected = UNCHECKED if count == 0 else CHECKED if count == len(subtree) else INDETERMINATE
+            if tree.state(item) != expected:
+                print(f"❌ Item {item} state {tree.state(item)} != recount {expected}")
+                return False
+        
+        app = create_app("Group Test", 800, 600)
+        rows = [app.create_checkbox(10, 10 + i * 20, 18, 18) for i in range(3)]
+        group.bind(roots[0], rows[0])
+        group.bind(leaves[0], rows[1])
+        group.bind(leaves[5], rows[2])
+        
+        lib = bindings.lib
+        if lib.widgets[('CheckBox', rows[0].widget_id)].get('State') != INDETERMINATE \
+                or not lib.widgets[('CheckBox', rows[0].widget_id)].get('TriState'):
+            print("❌ Bound parent was not shown indeterminate")
+            return False
+        
+        lib.reset()
+        group.clear_all()
+        group.set(leaves[1], True)
+        if lib.call_counts['CheckBoxSetState']:
+            print("❌ Model changes were pushed before the frame")
+            return False
+        app.update()
+        print(f"   State writes for one synced frame: {lib.call_counts['CheckBoxSetState']}")
+        if lib.call_counts['CheckBoxSetState'] != 1 or rows[1].checked:
+            print("❌ Sync did not push only the changed bound checkbox")
+            return False
+        
+        app.handle_mouse_click(12, 12)
+        app.handle_mouse_release(12, 12)
+        if group.state(roots[0]) != CHECKED or not rows[0].checked or not rows[1].checked \
+                or rows[0].indeterminate:
+            print("❌ Clicking an indeterminate parent did not check its subtree")
+            return False
+        
+        print("✅ CheckBox group working")
+        return True
+        
+    except Exception as e:
+        print(f"❌ CheckBox group failed: {e}")
+        return False
+    
+    finally:
+        low_level_bindings._bindings = None
+        mid_level_wrappers._wrappers = None
+
+def test_render_thread():
+    """Test threaded rendering on the headless backend"""
+    print("\n🧵 Testing Render Thread")
+    print("=======================")
+    
+    import threading
+    import low_level_bindings
+    import mid_level_wrappers
+    
+    try:
+        low_level_bindings.reload_bindings(backend='headless')
+        mid_level_wrappers.reload_wrappers()
+        
+        from high_level_api import Application
+        
+        app = Application("Threaded Test", 400, 300)
+        if not app.start_render_thread(max_fps=240):
+            print("❌ Render thread failed to initialize")
+            return False
+        
+        button = app.submit(app.create_button, 10, 10, 100, 30, "Threaded").result(timeout=2)
+        handled = []
+        button.set_click_handler(lambda b: handled.append(threading.current_thread()))
+        
+        app.handle_mouse_click(20, 20).result(timeout=2)
+        app.process_callbacks(timeout=2)
+        
+        # Setters called on this thread make their FFI calls on the render thread
+        wrappers = mid_level_wrappers.get_wrappers()
+        writers = []
+        for name in ('button_set_text', 'button_set_text_string_id', 'button_set_position'):
+            def record(*args, _setter=getattr(wrappers, name)):
+                writers.append(threading.current_thread())
+                return _setter(*args)
+            setattr(wrappers, name, record)
+        button.set_text("Changed")
+        button.set_position(50, 50)
+        app.submit(lambda: None).result(timeout=2)
+        render_thread = app._render_thread
+        frames = render_thread.frames
+        app.stop_render_thread(timeout=2)
+        
+        print(f"   Frames rendered: {frames}")
+        print(f"   Handler ran on main thread: {handled == [threading.current_thread()]}")
+        
+        if handled != [threading.current_thread()] or app.threaded:
+            print("❌ Render thread delivered unexpected results")
+            return False
+        if writers != [render_thread, render_thread] or app.widget_at(60, 60) is not button:
+            print("❌ Widget setters made FFI calls off the render thread")
+            return False
+        
+        print("✅ Render thread working")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Render thread failed: {e}")
+        return False
+    
+    finally:
+        low_level_bindings._bindings = None
+        mid_level_wrappers._wrappers = None
+
 def main():
     """Main test function"""
     print("🧪 MojoGUI Complete System Test")
@@ -338,6 +1808,28 @@ def main():
         ("Widget Modules", test_widget_modules),
         ("Convenience Functions", test_convenience_functions),
         ("Integration Demo", test_integration_demo),
+        ("Headless Backend", test_headless_backend),
+        ("Unchecked Wrappers", test_unchecked_wrappers),
+        ("Display Lists", test_display_lists),
+        ("Render Thread", test_render_thread),
+        ("Bulk Drawing", test_bulk_drawing),
+        ("String Pool", test_string_pool),
+        ("Text Metrics", test_text_metrics),
+        ("Damage Tracking", test_damage_tracking),
+        ("Spatial Index", test_spatial_index),
+        ("Event Dispatch", test_event_dispatch),
+        ("Event Loop", test_event_loop),
+        ("Async Loop", test_async_loop),
+        ("Frame Profiler", test_frame_profiler),
+        ("Widget Registry", test_widget_registry),
+        ("Widget Pool", test_widget_pool),
+        ("Property Batch", test_property_batch),
+        ("Slider Notifications", test_slider_notifications),
+        ("Progress Feed", test_progress_feed),
+        ("State Snapshot", test_state_snapshot),
+        ("Shared Styles", test_shared_styles),
+        ("System Theme", test_system_theme),
+        ("CheckBox Group", test_checkbox_group),
     ]
     
     results = []
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Text Metrics for MojoGUI
+Measures strings in Python from a per-(font, size) glyph advance table
+
+The C side measures a string by walking every character through the font
+on each call. TextMetrics builds the advance table of the printable ASCII
+range once per (font, size) from the widget library, which owns the fonts
+loaded by LoadDefaultFont()/FontLoadTTF(): each glyph is measured once with
+TextGetWidth(string, font_id, size), repeated GLYPH_REPEAT times so the
+integer result gives sub-pixel advances. Strings are then measured by
+summing advances locally; results are kept in an LRU cache keyed by
+(text, font, size). Other strings are measured by the library one string
+at a time (still cached).
+
+Building a table costs one FFI call per printable glyph, so it pays for
+itself once a (font, size) measures more than about a hundred strings.
+"""
+
+from collections import OrderedDict
+
+try:
+    from .mid_level_wrappers import get_wrappers
+    from .string_pool import get_string_pool
+except ImportError:
+    from mid_level_wrappers import get_wrappers
+    from string_pool import get_string_pool
+
+# Codepoints covered by the advance table (printable ASCII)
+TABLE_FIRST = 32
+TABLE_LAST = 126
+
+# Copies of a glyph measured together when building the table
+GLYPH_REPEAT = 32
+
+DEFAULT_CACHE_SIZE = 8192
+
+class TextMetrics:
+    """Cached text measurement for one bindings instance"""
+
+    def __init__(self, wrappers=None, cache_size=DEFAULT_CACHE_SIZE):
+        self.wrappers = wrappers or get_wrappers()
+        self.cache_size = cache_size
+        self._cache = OrderedDict()   # (text, font_id, size) -> width
+        self._tables = {}             # (font_id, size) -> advance tuple, or None
+        self._scratch = -1
+        self.hits = 0
+        self.misses = 0
+        self.native_calls = 0
+
+    def _advance_table(self, font_id, size):
+        """Advances indexed by codepoint (printable ASCII only) for (font, size); None if unavailable"""
+        key = (font_id, size)
+        if key in self._tables:
+            return self._tables[key]
+        table = None
+        if self.wrappers.is_function_available('TextGetWidth_impl') and self._scratch_slot() >= 0:
+            wrappers, slot = self.wrappers, self._scratch
+            advances = [0.0] * (TABLE_LAST + 1)
+            for code in range(TABLE_FIRST, TABLE_LAST + 1):
+                wrappers.string_set(slot, chr(code) * GLYPH_REPEAT)
+                width = wrappers.text_get_width(slot, font_id, size)
+                self.native_calls += 2
+                if width < 0:
+                    break
+                advances[code] = width / GLYPH_REPEAT
+            else:
+                # A library without the font loaded measures everything as 0
+                if any(advances):
+                    table = tuple(advances)
+        self._tables[key] = table
+        return table
+
+    def _scratch_slot(self):
+        """String ID reused for the glyph runs measured while building tables"""
+        if self._scratch < 0:
+            self._scratch = self.wrappers.alloc_temp_string()
+            self.native_calls += 1
+        return self._scratch
+
+    def _measure_native(self, text, font_id, size):
+        """One FFI call, in the font and at the size asked for"""
+        self.native_calls += 1
+        return self.wrappers.text_get_width(get_string_pool().intern(text), font_id, size)
+
+    def _measure_uncached(self, text, font_id, size, table):
+        if table is not None and text.isascii() and text.isprintable():
+            return int(sum(map(table.__getitem__, text.encode('ascii'))) + 0.5)
+        return self._measure_native(text, font_id, size)
+
+    def measure(self, text, size=16, font_id=0):
+        """Width of text in pixels"""
+        key = (text, font_id, size)
+        cache = self._cache
+        width = cache.get(key)
+        if width is not None:
+            self.hits += 1
+            cache.move_to_end(key)
+            return width
+        self.misses += 1
+        width = self._measure_uncached(text, font_id, size, self._advance_table(font_id, size))
+        cache[key] = width
+        if len(cache) > self.cache_size:
+            cache.popitem(last=False)
+        return width
+
+    def measure_many(self, strings, size=16, font_id=0):
+        """Widths of many strings at one size, e.g. for table layout"""
+        table = self._advance_table(font_id, size)
+        cache = self._cache
+        widths = []
+        for text in strings:
+            key = (text, font_id, size)
+            width = cache.get(key)
+            if width is None:
+                self.misses += 1
+                width = self._measure_uncached(text, font_id, size, table)
+                cache[key] = width
+            else:
+                self.hits += 1
+                cache.move_to_end(key)
+            widths.append(width)
+        while len(cache) > self.cache_size:
+            cache.popitem(last=False)
+        return widths
+
+    def invalidate(self, font_id=None):
+        """Forget tables and widths (all fonts, or one) after fonts are reloaded"""
+        if font_id is None:
+            self._tables.clear()
+            self._cache.clear()
+            return
+        for key in [k for k in self._tables if k[0] == font_id]:
+            del self._tables[key]
+        for key in [k for k in self._cache if k[1] == font_id]:
+            del self._cache[key]
+
+    def stats(self):
+        """Cache counters"""
+        return {
+            'cached': len(self._cache),
+            'tables': len(self._tables),
+            'hits': self.hits,
+            'misses': self.misses,
+            'native_calls': self.native_calls,
+        }
+
+# Global metrics instance
+_metrics = None
+
+def get_text_metrics():
+    """Get global text metrics instance (restarted when the wrappers are reloaded)"""
+    global _metrics
+    wrappers = get_wrappers()
+    if _metrics is None or _metrics.wrappers is not wrappers:
+        _metrics = TextMetrics(wrappers)
+    return _metrics
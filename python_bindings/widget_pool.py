@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Widget Pool for MojoGUI
+Recycles native widget IDs instead of destroying and re-creating them
+
+Widget.close() hands its native ID back to the pool; the next widget of
+the same kind (and the same creation arguments, such as slider
+orientation) takes it over instead of calling XxxCreate. An ID is reused
+at exactly the same bounds when one is pooled there, so rebuilding a list
+of rows usually costs no FFI calls at all; kinds the library can move
+(buttons) also take any pooled ID and are moved into place. Text is only
+re-sent when it differs. At most max_pooled IDs are kept per kind; the
+rest are destroyed on release.
+
+An ID released with colors (a styled widget, reset to the base style of
+its kind) hands them to its next owner, which adopts that style instead
+of believing it shows the library's own colors.
+
+Widgets that are garbage-collected without close() are reported as
+leaked. Their IDs are not touched from __del__ (no FFI at GC time); they
+are destroyed at the next acquire(), release() or drain() instead.
+"""
+
+from collections import Counter
+
+try:
+    from .mid_level_wrappers import get_wrappers
+except ImportError:
+    from mid_level_wrappers import get_wrappers
+
+# Released IDs kept per kind before further releases are destroyed
+DEFAULT_MAX_POOLED = 64
+
+# kind: (create wrapper, destroy wrapper, position setter, size setter, text setter)
+POOL_SPECS = {
+    'button': ('button_create', 'button_destroy', 'button_set_position', 'button_set_dimensions',
+               'button_set_text'),
+    'checkbox': ('checkbox_create', 'checkbox_destroy', None, None, None),
+    'enhanced_checkbox': ('enhanced_checkbox_create', None, None, None, None),
+    'slider': ('slider_create', 'slider_destroy', None, None, None),
+    'progressbar': ('progressbar_create', 'progressbar_destroy', None, None, None),
+    'label': ('label_create', 'label_destroy', None, None, 'label_set_text'),
+}
+
+class WidgetPool:
+    """Free-lists of released native widget IDs, per kind and creation arguments
+
+    Kinds without a destroy function (enhanced checkboxes) are always
+    pooled, since recycling is the only way their IDs get reused.
+    """
+
+    def __init__(self, wrappers=None, max_pooled=DEFAULT_MAX_POOLED):
+        self.wrappers = wrappers or get_wrappers()
+        self.max_pooled = max_pooled
+        self._free = {}         # (kind, extra args) -> [[widget_id, bounds, text, colors], ...]
+        self._orphans = []      # (kind, widget_id) of widgets collected without close()
+        self.in_use = Counter()
+        self.created = Counter()
+        self.reused = Counter()
+        self.destroyed = Counter()
+        self.leaked = Counter()
+
+    def _pooled(self, kind):
+        return sum(len(entries) for (k, _), entries in self._free.items() if k == kind)
+
+    def acquire(self, kind, x, y, width, height, *extra, text=None):
+        """Native ID for a new widget: (widget_id, reused, colors), widget_id < 0 on failure
+
+        extra are the creation arguments after the bounds other than
+        text (e.g. slider orientation); only IDs created with the same
+        ones are reused. text is passed to XxxCreate for kinds that take it.
+        colors are the color writes a recycled ID still shows, or None.
+        """
+        if self._orphans:
+            self._collect()
+        create, _, set_position, set_size, set_text = POOL_SPECS[kind]
+        bounds = (x, y, width, height)
+        entries = self._free.get((kind, extra))
+        entry = None
+        if entries:
+            for index in range(len(entries) - 1, -1, -1):
+                if entries[index][1] == bounds:
+                    entry = entries.pop(index)
+                    break
+            else:
+                if set_position is not None:
+                    entry = entries.pop()
+
+        if entry is None:
+            args = extra if text is None else (text,) + extra
+            widget_id = getattr(self.wrappers, create)(x, y, width, height, *args)
+            if widget_id >= 0:
+                self.created[kind] += 1
+                self.in_use[kind] += 1
+            return widget_id, False, None
+
+        widget_id, old_bounds, old_text, colors = entry
+        if old_bounds != bounds:
+            if old_bounds[:2] != bounds[:2]:
+                getattr(self.wrappers, set_position)(widget_id, x, y)
+            if old_bounds[2:] != bounds[2:]:
+                getattr(self.wrappers, set_size)(widget_id, width, height)
+        if set_text is not None and text is not None and text != old_text:
+            getattr(self.wrappers, set_text)(widget_id, text)
+        self.reused[kind] += 1
+        self.in_use[kind] += 1
+        return widget_id, True, colors
+
+    def release(self, kind, widget_id, bounds, *extra, text=None, colors=None):
+        """Take back a closed widget's ID, pooling or destroying it
+
+        The caller resets any state the next owner would not expect
+        (hidden, disabled, checked, ...) before releasing; colors are the
+        color writes left on the ID (see styles.sent_colors).
+        """
+        if self._orphans:
+            self._collect()
+        self.in_use[kind] -= 1
+        destroy = POOL_SPECS[kind][1]
+        if destroy is not None and self._pooled(kind) >= self.max_pooled:
+            getattr(self.wrappers, destroy)(widget_id)
+            self.destroyed[kind] += 1
+            return False
+        self._free.setdefault((kind, extra), []).append([widget_id, tuple(bounds), text, colors])
+        return True
+
+    def reclaim(self, kind, widget_id):
+        """Note a widget collected without close(); its ID is destroyed later
+
+        Safe to call from __del__: makes no FFI calls.
+        """
+        self.in_use[kind] -= 1
+        self.leaked[kind] += 1
+        self._orphans.append((kind, widget_id))
+
+    def _collect(self):
+        """Destroy the IDs of leaked widgets"""
+        orphans, self._orphans = self._orphans, []
+        for kind, widget_id in orphans:
+            destroy = POOL_SPECS[kind][1]
+            if destroy is not None:
+                getattr(self.wrappers, destroy)(widget_id)
+                self.destroyed[kind] += 1
+
+    def drain(self, kind=None):
+        """Destroy pooled IDs (of one kind, or all) and leaked ones; returns the count"""
+        self._collect()
+        count = 0
+        for key in list(self._free):
+            if kind is not None and key[0] != kind:
+                continue
+            destroy = POOL_SPECS[key[0]][1]
+            if destroy is None:
+                continue
+            entries = self._free.pop(key)
+            for widget_id, _, _, _ in entries:
+                getattr(self.wrappers, destroy)(widget_id)
+            self.destroyed[key[0]] += len(entries)
+            count += len(entries)
+        return count
+
+    def report(self):
+        """{kind: in_use/pooled/leaked/created/reused/destroyed} for every kind seen"""
+        kinds = set(self.created) | set(self.in_use) | {key[0] for key in self._free}
+        return {kind: {
+            'in_use': self.in_use[kind],
+            'pooled': self._pooled(kind),
+            'leaked': self.leaked[kind],
+            'created': self.created[kind],
+            'reused': self.reused[kind],
+            'destroyed': self.destroyed[kind],
+        } for kind in sorted(kinds)}
+
+# Global pool instance
+_pool = None
+
+def get_widget_pool():
+    """Get global widget pool instance
+
+    A new pool is started when the wrappers are reloaded, since pooled
+    IDs belong to the previous library.
+    """
+    global _pool
+    wrappers = get_wrappers()
+    if _pool is None or _pool.wrappers is not wrappers:
+        _pool = WidgetPool(wrappers)
+    return _pool
@@ -0,0 +1,530 @@
+#!/usr/bin/env python3
+"""
+Widget Registry for MojoGUI
+Struct-of-arrays storage for large numbers of simple widgets
+
+Every widget kind gets a WidgetTable holding geometry, state flags and
+native IDs in packed typed arrays, one row per widget: about 33 bytes a
+widget instead of a full Widget object with its own __dict__. The user
+holds WidgetHandle objects, which are two-slot (table, row) references
+plus a generation number that catches rows recycled after release().
+Recycled rows are handed to later widgets, so a table stacks its rows
+(for drawing and hit testing) by creation sequence, not by row index.
+
+Tables also work on many rows at once (show/hide, move, hit testing,
+drawing). NumPy is used for those when it is installed; otherwise the
+same loops run over the arrays in Python.
+
+Visibility and enabled state live only in the flags: draw() skips hidden
+rows and clicks skip disabled ones, so neither crosses the FFI boundary.
+Geometry is kept for hit testing and damage, like Widget.x / Widget.y,
+and moves are sent to the native widget, which draws and hit-tests at its
+own bounds. Only kinds the library can move (buttons) can be moved or
+resized; the others raise TypeError.
+"""
+
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from .mid_level_wrappers import get_wrappers
+except ImportError:
+    from mid_level_wrappers import get_wrappers
+
+# Row flags
+FLAG_LIVE = 0x01
+FLAG_VISIBLE = 0x02
+FLAG_ENABLED = 0x04
+
+# Flags of a freshly created row
+DEFAULT_FLAGS = FLAG_LIVE | FLAG_VISIBLE | FLAG_ENABLED
+
+# kind: (create wrapper, draw wrapper, destroy wrapper, click wrapper, takes text)
+KIND_SPECS = {
+    'button': ('button_create', 'draw_button', 'button_destroy', 'button_handle_click', True),
+    'checkbox': ('checkbox_create', 'draw_checkbox', 'checkbox_destroy', 'checkbox_handle_click', False),
+    'slider': ('slider_create', 'draw_slider', 'slider_destroy', 'slider_handle_click', False),
+    'progressbar': ('progressbar_create', 'draw_progressbar', 'progressbar_destroy', None, False),
+    'label': ('label_create', 'draw_label', 'label_destroy', None, True),
+}
+
+# kind: (position setter, size setter) for the kinds the library can move
+MOVE_SPECS = {
+    'button': ('button_set_position', 'button_set_dimensions'),
+}
+
+class WidgetHandle:
+    """Lightweight reference to one row of a WidgetTable
+
+    Handles compare equal when they refer to the same live row. Using a
+    handle after its widget was released raises ReferenceError.
+    """
+
+    __slots__ = ('table', 'row', 'generation')
+
+    def __init__(self, table, row, generation):
+        self.table = table
+        self.row = row
+        self.generation = generation
+
+    def __eq__(self, other):
+        return (isinstance(other, WidgetHandle) and self.table is other.table
+                and self.row == other.row and self.generation == other.generation)
+
+    def __hash__(self):
+        return hash((id(self.table), self.row, self.generation))
+
+    def __repr__(self):
+        if not self.alive:
+            return f"<{self.table.kind} handle (released)>"
+        return f"<{self.table.kind} handle #{self.row} @{self.x},{self.y}>"
+
+    def _check(self):
+        """Row index of a live handle"""
+        if self.table.generations[self.row] != self.generation:
+            raise ReferenceError(f"{self.table.kind} widget was released")
+        return self.row
+
+    @property
+    def alive(self):
+        return self.table.generations[self.row] == self.generation
+
+    @property
+    def kind(self):
+        return self.table.kind
+
+    @property
+    def widget_id(self):
+        return self.table.native_ids[self._check()]
+
+    @property
+    def x(self):
+        return self.table.xs[self._check()]
+
+    @property
+    def y(self):
+        return self.table.ys[self._check()]
+
+    @property
+    def width(self):
+        return self.table.widths[self._check()]
+
+    @property
+    def height(self):
+        return self.table.heights[self._check()]
+
+    @property
+    def visible(self):
+        return bool(self.table.flags[self._check()] & FLAG_VISIBLE)
+
+    @property
+    def enabled(self):
+        return bool(self.table.flags[self._check()] & FLAG_ENABLED)
+
+    @property
+    def text(self):
+        texts = self.table.texts
+        row = self._check()
+        return texts[row] if texts is not None else None
+
+    def set_position(self, x, y):
+        """Move the widget"""
+        return self.table.set_bounds(self._check(), x, y, self.width, self.height)
+
+    def set_size(self, width, height):
+        """Resize the widget"""
+        return self.table.set_bounds(self._check(), self.x, self.y, width, height)
+
+    def set_visible(self, visible):
+        """Show or hide the widget"""
+        self.table.set_visible(visible, [self._check()])
+
+    def set_enabled(self, enabled):
+        """Enable or disable clicks on the widget"""
+        self.table.set_enabled(enabled, [self._check()])
+
+    def set_text(self, text):
+        """Set button/label text (no FFI call when the text is unchanged)"""
+        return self.table.set_text(self._check(), text)
+
+    def is_point_inside(self, x, y):
+        """Check if point is inside widget bounds"""
+        table, row = self.table, self._check()
+        x0, y0 = table.xs[row], table.ys[row]
+        return x0 <= x <= x0 + table.widths[row] and y0 <= y <= y0 + table.heights[row]
+
+    def release(self):
+        """Destroy the native widget and free the row"""
+        if self.alive:
+            self.table.release(self.row)
+
+class WidgetTable:
+    """Packed columns for every widget of one kind"""
+
+    def __init__(self, registry, kind):
+        if kind not in KIND_SPECS:
+            raise ValueError(f"Unknown widget kind: {kind!r}")
+        self.registry = registry
+        self.kind = kind
+        create, draw, destroy, click, takes_text = KIND_SPECS[kind]
+        self._create = getattr(registry.wrappers, create)
+        self._draw = getattr(registry.wrappers, draw)
+        self._destroy = getattr(registry.wrappers, destroy) if destroy else None
+        self._click = getattr(registry.wrappers, click) if click else None
+        self._set_text = getattr(registry.wrappers, f"{kind}_set_text") if takes_text else None
+        set_position, set_size = MOVE_SPECS.get(kind, (None, None))
+        self._set_position = getattr(registry.wrappers, set_position) if set_position else None
+        self._set_size = getattr(registry.wrappers, set_size) if set_size else None
+        self.xs = array('i')
+        self.ys = array('i')
+        self.widths = array('i')
+        self.heights = array('i')
+        self.flags = array('B')
+        self.native_ids = array('i')
+        self.generations = array('I')
+        self.sequence = array('Q')      # creation order; rows stack by it
+        self.texts = [] if takes_text else None
+        self.on_click = None
+        self._free = []
+        self._next_sequence = 0
+        self.live = 0
+
+    def __len__(self):
+        return self.live
+
+    # =================================================================
+    # ROWS
+    # =================================================================
+
+    def create(self, x, y, width, height, *args):
+        """Create a native widget and return its handle (None on failure)"""
+        native_id = self._create(x, y, width, height, *args)
+        if native_id < 0:
+            return None
+        text = args[0] if self.texts is not None and args else ''
+        if self._free:
+            row = self._free.pop()
+            self.xs[row], self.ys[row] = x, y
+            self.widths[row], self.heights[row] = width, height
+            self.flags[row] = DEFAULT_FLAGS
+            self.native_ids[row] = native_id
+            self.sequence[row] = self._next_sequence
+            if self.texts is not None:
+                self.texts[row] = text
+        else:
+            row = len(self.flags)
+            self.xs.append(x)
+            self.ys.append(y)
+            self.widths.append(width)
+            self.heights.append(height)
+            self.flags.append(DEFAULT_FLAGS)
+            self.native_ids.append(native_id)
+            self.generations.append(0)
+            self.sequence.append(self._next_sequence)
+            if self.texts is not None:
+                self.texts.append(text)
+        self._next_sequence += 1
+        self.live += 1
+        self.registry._damage(x, y, width, height)
+        return WidgetHandle(self, row, self.generations[row])
+
+    def handle(self, row):
+        """Handle for a live row"""
+        if not self.flags[row] & FLAG_LIVE:
+            raise ReferenceError(f"{self.kind} row {row} is not in use")
+        return WidgetHandle(self, row, self.generations[row])
+
+    def release(self, row):
+        """Destroy a row's native widget and put the row on the free list"""
+        if not self.flags[row] & FLAG_LIVE:
+            return False
+        if self._destroy is not None:
+            self._destroy(self.native_ids[row])
+        self.registry._damage(self.xs[row], self.ys[row], self.widths[row], self.heights[row])
+        self.flags[row] = 0
+        self.native_ids[row] = -1
+        self.generations[row] = (self.generations[row] + 1) & 0xFFFFFFFF
+        if self.texts is not None:
+            self.texts[row] = None
+        self._free.append(row)
+        self.live -= 1
+        return True
+
+    def rows(self, mask=FLAG_LIVE):
+        """Indices of rows that have every flag in mask"""
+        if not self.flags:
+            return []
+        if np is not None:
+            flags = np.frombuffer(self.flags, dtype=np.uint8)
+            return np.flatnonzero((flags & mask) == mask).tolist()
+        return [row for row, flags in enumerate(self.flags) if flags & mask == mask]
+
+    def stacked_rows(self, mask=FLAG_LIVE):
+        """rows(mask) in creation order, bottom to top
+
+        Released rows are reused by later widgets, so row order is not
+        creation order once anything has been released.
+        """
+        rows = self.rows(mask)
+        if not self._free:
+            return rows
+        return sorted(rows, key=self.sequence.__getitem__)
+
+    # =================================================================
+    # SINGLE-ROW UPDATES
+    # =================================================================
+
+    @property
+    def movable(self):
+        """Whether the library can move and resize widgets of this kind"""
+        return self._set_position is not None
+
+    def _check_movable(self):
+        if self._set_position is None:
+            raise TypeError(f"The library cannot move or resize {self.kind} widgets")
+
+    def set_bounds(self, row, x, y, width, height):
+        """Move/resize one row and its native widget, damaging the old and new bounds"""
+        old = (self.xs[row], self.ys[row], self.widths[row], self.heights[row])
+        if old == (x, y, width, height):
+            return True
+        self._check_movable()
+        damage = self.registry._damage
+        damage(*old)
+        self.xs[row], self.ys[row] = x, y
+        self.widths[row], self.heights[row] = width, height
+        damage(x, y, width, height)
+        native_id = self.native_ids[row]
+        ok = True
+        if old[:2] != (x, y):
+            ok = self._set_position(native_id, x, y) == 0
+        if old[2:] != (width, height):
+            ok = self._set_size(native_id, width, height) == 0 and ok
+        return ok
+
+    def set_text(self, row, text):
+        """Set one row's text (no FFI call when the text is unchanged)"""
+        if self.texts is None:
+            raise TypeError(f"{self.kind} widgets have no text")
+        if self.texts[row] == text:
+            return True
+        self.texts[row] = text
+        self.registry._damage(self.xs[row], self.ys[row], self.widths[row], self.heights[row])
+        return self._set_text(self.native_ids[row], text) == 0
+
+    # =================================================================
+    # BULK OPERATIONS
+    # =================================================================
+
+    def _set_flag(self, flag, on, rows):
+        if rows is None:
+            rows = self.rows()
+        if len(rows) == 0:
+            return
+        if np is not None:
+            flags = np.frombuffer(self.flags, dtype=np.uint8)
+            index = np.asarray(rows, dtype=np.intp)
+            if on:
+                flags[index] |= flag
+            else:
+                flags[index] &= ~flag & 0xFF
+            del flags
+        else:
+            flags = self.flags
+            for row in rows:
+                flags[row] = flags[row] | flag if on else flags[row] & ~flag
+        self._damage_rows(rows)
+
+    def set_visible(self, visible, rows=None):
+        """Show or hide rows (default every live row) without FFI calls"""
+        self._set_flag(FLAG_VISIBLE, visible, rows)
+
+    def set_enabled(self, enabled, rows=None):
+        """Enable or disable clicks on rows (default every live row)"""
+        self._set_flag(FLAG_ENABLED, enabled, rows)
+
+    def move_by(self, dx, dy, rows=None):
+        """Offset rows (default every live row) by dx, dy
+
+        The arrays are updated in bulk; each native widget still needs
+        its own position call.
+        """
+        if rows is None:
+            rows = self.rows()
+        if len(rows) == 0 or (dx == 0 and dy == 0):
+            return True
+        self._check_movable()
+        self._damage_rows(rows)
+        if np is not None:
+            index = np.asarray(rows, dtype=np.intp)
+            xs = np.frombuffer(self.xs, dtype=np.intc)
+            ys = np.frombuffer(self.ys, dtype=np.intc)
+            xs[index] += dx
+            ys[index] += dy
+            del xs, ys
+        else:
+            xs, ys = self.xs, self.ys
+            for row in rows:
+                xs[row] += dx
+                ys[row] += dy
+        self._damage_rows(rows)
+        set_position, xs, ys, native_ids = self._set_position, self.xs, self.ys, self.native_ids
+        ok = True
+        for row in rows:
+            ok = set_position(native_ids[row], xs[row], ys[row]) == 0 and ok
+        return ok
+
+    def _damage_rows(self, rows):
+        """Damage the union of the rows' bounds"""
+        if len(rows) == 0:
+            return
+        if np is not None:
+            index = np.asarray(rows, dtype=np.intp)
+            xs = np.frombuffer(self.xs, dtype=np.intc)[index]
+            ys = np.frombuffer(self.ys, dtype=np.intc)[index]
+            x1 = xs + np.frombuffer(self.widths, dtype=np.intc)[index]
+            y1 = ys + np.frombuffer(self.heights, dtype=np.intc)[index]
+            x0, y0 = int(xs.min()), int(ys.min())
+            self.registry._damage(x0, y0, int(x1.max()) - x0, int(y1.max()) - y0)
+            return
+        xs, ys, widths, heights = self.xs, self.ys, self.widths, self.heights
+        x0 = min(xs[row] for row in rows)
+        y0 = min(ys[row] for row in rows)
+        x1 = max(xs[row] + widths[row] for row in rows)
+        y1 = max(ys[row] + heights[row] for row in rows)
+        self.registry._damage(x0, y0, x1 - x0, y1 - y0)
+
+    def hit_test(self, x, y, mask=FLAG_LIVE | FLAG_VISIBLE):
+        """Topmost (latest created) row with every flag in mask containing (x, y), or -1"""
+        count = len(self.flags)
+        if not count:
+            return -1
+        if np is not None:
+            xs = np.frombuffer(self.xs, dtype=np.intc)
+            ys = np.frombuffer(self.ys, dtype=np.intc)
+            inside = ((xs <= x) & (x <= xs + np.frombuffer(self.widths, dtype=np.intc)) &
+                      (ys <= y) & (y <= ys + np.frombuffer(self.heights, dtype=np.intc)) &
+                      ((np.frombuffer(self.flags, dtype=np.uint8) & mask) == mask))
+            del xs, ys
+            hits = np.flatnonzero(inside)
+            if not len(hits):
+                return -1
+            sequence = np.frombuffer(self.sequence, dtype=np.uint64)
+            return int(hits[np.argmax(sequence[hits])])
+        xs, ys, widths, heights, flags = self.xs, self.ys, self.widths, self.heights, self.flags
+        sequence = self.sequence
+        best = -1
+        for row in range(count):
+            if (flags[row] & mask == mask and xs[row] <= x <= xs[row] + widths[row]
+                    and ys[row] <= y <= ys[row] + heights[row]
+                    and (best < 0 or sequence[row] > sequence[best])):
+                best = row
+        return best
+
+    def click(self, row, x, y):
+        """Send a click to one row's native widget; True if it accepted"""
+        if self._click is None or not self.flags[row] & FLAG_ENABLED:
+            return False
+        if self._click(self.native_ids[row], x, y) <= 0:
+            return False
+        self.registry._damage(self.xs[row], self.ys[row], self.widths[row], self.heights[row])
+        return True
+
+    def draw(self):
+        """Draw every visible row, bottom to top"""
+        draw, native_ids = self._draw, self.native_ids
+        ok = True
+        for row in self.stacked_rows(FLAG_LIVE | FLAG_VISIBLE):
+            ok = draw(native_ids[row]) == 0 and ok
+        return ok
+
+    def nbytes(self):
+        """Bytes held by the packed columns"""
+        return sum(column.itemsize * len(column) for column in
+                   (self.xs, self.ys, self.widths, self.heights, self.flags,
+                    self.native_ids, self.generations, self.sequence))
+
+class WidgetRegistry:
+    """Per-kind WidgetTables; kinds are drawn (and stacked) in creation order"""
+
+    def __init__(self, wrappers=None):
+        self.wrappers = wrappers or get_wrappers()
+        self.tables = {}
+        self.app = None
+
+    def __len__(self):
+        return sum(table.live for table in self.tables.values())
+
+    def __bool__(self):
+        return any(table.live for table in self.tables.values())
+
+    def table(self, kind):
+        """The WidgetTable for kind, created on first use"""
+        table = self.tables.get(kind)
+        if table is None:
+            table = self.tables[kind] = WidgetTable(self, kind)
+        return table
+
+    def _damage(self, x, y, width, height):
+        if self.app is not None:
+            self.app.damage(x, y, width, height)
+
+    def create_button(self, x, y, width, height, text="Button"):
+        return self.table('button').create(x, y, width, height, text)
+
+    def create_checkbox(self, x, y, width, height):
+        return self.table('checkbox').create(x, y, width, height)
+
+    def create_slider(self, x, y, width, height, orientation=0):
+        return self.table('slider').create(x, y, width, height, orientation)
+
+    def create_progressbar(self, x, y, width, height, style=0):
+        return self.table('progressbar').create(x, y, width, height, style)
+
+    def create_label(self, x, y, width, height, text="Label"):
+        return self.table('label').create(x, y, width, height, text)
+
+    def set_click_handler(self, kind, handler):
+        """Call handler(handle) when a widget of kind accepts a click"""
+        self.table(kind).on_click = handler
+
+    def clear(self):
+        """Release every widget in every table"""
+        for table in self.tables.values():
+            for row in table.rows():
+                table.release(row)
+
+    def hit_test(self, x, y):
+        """Handle of the topmost visible widget containing (x, y), or None"""
+        for table in reversed(list(self.tables.values())):
+            row = table.hit_test(x, y)
+            if row >= 0:
+                return table.handle(row)
+        return None
+
+    def click(self, x, y):
+        """Deliver a click to the topmost widget under (x, y)
+
+        Returns the handle that accepted it (its table's on_click handler
+        is returned alongside so the caller can fire it), or (None, None).
+        """
+        handle = self.hit_test(x, y)
+        if handle is None or not handle.table.click(handle.row, x, y):
+            return None, None
+        return handle, handle.table.on_click
+
+    def draw(self):
+        """Draw every visible widget, kind by kind"""
+        ok = True
+        for table in self.tables.values():
+            ok = table.draw() and ok
+        return ok
+
+    def stats(self):
+        """Live/free rows and packed bytes per kind"""
+        return {kind: {'live': table.live, 'free': len(table._free), 'bytes': table.nbytes()}
+                for kind, table in self.tables.items()}